@@ -0,0 +1,96 @@
+"""
+gzip/brotli negotiation for API responses (see ``CompressionMiddleware``).
+
+Views that serve cached content tag the response with a content version key
+(``set_compression_key``). The compressed bytes of such a response are cached
+under that key per encoding, so each representation is compressed once per
+content version, at the highest level, instead of on every request.
+"""
+
+import gzip
+from typing import Optional
+
+from django.core.cache import cache
+
+from monitoring.timing import record_cache
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+# Smaller bodies are not worth the CPU or the header overhead
+MIN_COMPRESS_SIZE = 200
+
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "application/xml", "text/")
+
+COMPRESSED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# (live, cached) levels: per-request compression must be cheap, cached
+# representations are compressed once so they get the best ratio
+GZIP_LEVELS = (6, 9)
+BROTLI_QUALITIES = (5, 11)
+
+
+def supported_encodings() -> list:
+    """Encodings we can produce, in server preference order."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str, available: Optional[list] = None) -> Optional[str]:
+    """
+    Pick the encoding for an ``Accept-Encoding`` header, or None for identity.
+
+    Args:
+        accept_encoding: The raw request header.
+        available: Candidate encodings in preference order (default: all supported).
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available or supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITIES[best])
+    return gzip.compress(content, compresslevel=GZIP_LEVELS[best], mtime=0)
+
+
+def set_compression_key(response, key: str):
+    """Mark a response whose bytes only change when ``key`` changes."""
+    response.compression_cache_key = key
+    return response
+
+
+def compressed_content(response, encoding: str) -> bytes:
+    """Compressed body of a response, cached when it carries a compression key."""
+    key = getattr(response, "compression_cache_key", None)
+    if key is None:
+        return compress(response.content, encoding)
+
+    cache_key = f"compressed:{encoding}:{key}"
+    content = cache.get(cache_key)
+    record_cache(hit=content is not None)
+    if content is None:
+        content = compress(response.content, encoding, best=True)
+        cache.set(cache_key, content, COMPRESSED_CACHE_TIMEOUT)
+    return content
@@ -0,0 +1,205 @@
+"""
+Database configuration helpers for the backend project.
+
+Settings build their ``DATABASES`` entries through these helpers so that the
+SQLite tuning (WAL journaling, mmap, page cache, busy timeout) is applied
+consistently to every connection Django opens, and so that a primary plus
+any number of read replicas can be described entirely through env vars.
+"""
+
+import os
+from pathlib import Path
+
+
+# Applied to every new SQLite connection, in this order. ``journal_mode`` is
+# persisted in the database file, the others are per-connection.
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,          # milliseconds
+    "cache_size": -64000,          # negative = KiB, so ~64 MB page cache
+    "mmap_size": 268435456,        # 256 MB
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer from the environment, falling back to ``default``."""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def sqlite_pragmas_from_env() -> dict:
+    """Return the SQLite pragmas, with optional overrides from the environment."""
+    pragmas = dict(DEFAULT_SQLITE_PRAGMAS)
+    pragmas["journal_mode"] = os.getenv("DJANGO_SQLITE_JOURNAL_MODE", pragmas["journal_mode"])
+    pragmas["synchronous"] = os.getenv("DJANGO_SQLITE_SYNCHRONOUS", pragmas["synchronous"])
+    pragmas["busy_timeout"] = env_int("DJANGO_SQLITE_BUSY_TIMEOUT", pragmas["busy_timeout"])
+    pragmas["cache_size"] = env_int("DJANGO_SQLITE_CACHE_SIZE", pragmas["cache_size"])
+    pragmas["mmap_size"] = env_int("DJANGO_SQLITE_MMAP_SIZE", pragmas["mmap_size"])
+    return pragmas
+
+
+def sqlite_database(name, pragmas: dict = None) -> dict:
+    """
+    Build a ``DATABASES`` entry for a tuned SQLite file.
+
+    Args:
+        name: Path to the SQLite database file.
+        pragmas: Pragmas to apply on connect (defaults to ``sqlite_pragmas_from_env()``).
+
+    Returns:
+        A settings dict suitable for ``DATABASES["<alias>"]``.
+    """
+    pragmas = pragmas if pragmas is not None else sqlite_pragmas_from_env()
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        # Keep connections open between requests instead of reopening the file
+        "CONN_MAX_AGE": env_int("DJANGO_DB_CONN_MAX_AGE", 60),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Seconds the python driver waits on a locked database
+            "timeout": max(pragmas.get("busy_timeout", 5000) / 1000, 1),
+            # Take the write lock up front so WAL readers never deadlock a writer
+            "transaction_mode": "IMMEDIATE",
+        },
+        # Read by configure_sqlite_connection(); Django ignores unknown keys
+        "PRAGMAS": pragmas,
+    }
+
+
+def apply_sqlite_pragmas(cursor, pragmas: dict) -> None:
+    """Execute ``PRAGMA key=value`` for each pragma on a DB-API cursor."""
+    for key, value in pragmas.items():
+        cursor.execute(f"PRAGMA {key}={value}")
+
+
+def configure_sqlite_connection(sender, connection, **kwargs) -> None:
+    """
+    ``connection_created`` receiver that tunes every new SQLite connection.
+
+    Connected from ``CoreConfig.ready()``.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    pragmas = connection.settings_dict.get("PRAGMAS")
+    if not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, pragmas)
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """Read a true/false flag from the environment."""
+    value = os.getenv(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+def postgres_pool_options() -> dict:
+    """
+    Return psycopg connection pool options from the environment.
+
+    Requires ``psycopg[pool]`` with psycopg-pool 3.2+ (Django 5.1+ native
+    pooling). Each worker process keeps between ``min_size`` and ``max_size``
+    open connections.
+    """
+    from psycopg_pool import ConnectionPool
+
+    return {
+        "min_size": env_int("DJANGO_DB_POOL_MIN_SIZE", 2),
+        "max_size": env_int("DJANGO_DB_POOL_MAX_SIZE", 10),
+        # Seconds a request waits for a free connection before failing
+        "timeout": env_int("DJANGO_DB_POOL_TIMEOUT", 10),
+        "max_idle": env_int("DJANGO_DB_POOL_MAX_IDLE", 300),
+        "max_lifetime": env_int("DJANGO_DB_POOL_MAX_LIFETIME", 1800),
+        # Health check run when a connection is handed out
+        "check": ConnectionPool.check_connection,
+    }
+
+
+def postgres_database(name: str, user: str, password: str, host: str, port: str) -> dict:
+    """
+    Build a ``DATABASES`` entry for a PostgreSQL server.
+
+    With ``DJANGO_DB_POOL=true`` connections come from a psycopg pool (persistent
+    connections must then be off). With ``DJANGO_DB_PGBOUNCER=true`` the entry is
+    safe behind PgBouncer in transaction mode: no server-side cursors and no
+    prepared statements, which do not survive a server connection switch.
+    """
+    database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": name,
+        "USER": user,
+        "PASSWORD": password,
+        "HOST": host,
+        "PORT": port,
+        "CONN_MAX_AGE": env_int("DJANGO_DB_CONN_MAX_AGE", 60),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
+    }
+
+    if env_bool("DJANGO_DB_POOL"):
+        database["OPTIONS"]["pool"] = postgres_pool_options()
+        database["CONN_MAX_AGE"] = 0
+        database["CONN_HEALTH_CHECKS"] = False
+
+    if env_bool("DJANGO_DB_PGBOUNCER"):
+        database["DISABLE_SERVER_SIDE_CURSORS"] = True
+        database["OPTIONS"]["prepare_threshold"] = None
+
+    return database
+
+
+def databases_from_env(base_dir: Path) -> dict:
+    """
+    Build ``DATABASES`` from the environment: one primary plus N read replicas.
+
+    Env vars:
+        DJANGO_DB_ENGINE: ``sqlite`` (default) or ``postgres``.
+        DJANGO_DB_NAME: SQLite file path or PostgreSQL database name.
+        DJANGO_DB_USER / DJANGO_DB_PASSWORD / DJANGO_DB_HOST / DJANGO_DB_PORT: PostgreSQL only.
+        DJANGO_DB_REPLICAS: Comma-separated replicas. SQLite file paths, or
+            PostgreSQL ``host[:port]`` entries sharing the primary's credentials.
+
+    The primary is always ``default``; replicas are ``replica_1``, ``replica_2``...
+    """
+    engine = os.getenv("DJANGO_DB_ENGINE", "sqlite").strip().lower()
+    raw_replicas = os.getenv("DJANGO_DB_REPLICAS", "")
+    replicas = [r.strip() for r in raw_replicas.split(",") if r.strip()]
+
+    if engine in ("postgres", "postgresql"):
+        name = os.getenv("DJANGO_DB_NAME", "travelacrosseu")
+        user = os.getenv("DJANGO_DB_USER", "")
+        password = os.getenv("DJANGO_DB_PASSWORD", "")
+        port = os.getenv("DJANGO_DB_PORT", "5432")
+        databases = {
+            "default": postgres_database(name, user, password, os.getenv("DJANGO_DB_HOST", "localhost"), port),
+        }
+        for index, replica in enumerate(replicas, 1):
+            host, _, replica_port = replica.partition(":")
+            databases[f"replica_{index}"] = postgres_database(name, user, password, host, replica_port or port)
+    else:
+        databases = {
+            "default": sqlite_database(os.getenv("DJANGO_DB_NAME") or base_dir / "db.sqlite3"),
+        }
+        for index, replica in enumerate(replicas, 1):
+            path = Path(replica)
+            databases[f"replica_{index}"] = sqlite_database(path if path.is_absolute() else base_dir / path)
+
+    for alias in databases:
+        if alias != "default":
+            # Tests run against the primary only
+            databases[alias]["TEST"] = {"MIRROR": "default"}
+
+    return databases
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence
+
+from backend.compression import (
+    COMPRESSIBLE_CONTENT_TYPES, MIN_COMPRESS_SIZE, compressed_content, negotiate_encoding,
+)
+from backend.routers import pin_to_primary, replica_aliases, use_replicas
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Set after a write so the same client keeps reading from the primary
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Serve safe requests to the public cms views from read replicas.
+
+    Any unsafe request (admin save, JSON import, AI generation) pins the client
+    to the primary for ``DATABASE_REPLICA_STICKY_SECONDS`` through a cookie, so
+    the next reads see the data that was just written.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not replica_aliases():
+            return None
+
+        if request.method not in SAFE_METHODS or request.COOKIES.get(PRIMARY_PIN_COOKIE):
+            return None
+
+        view_class = getattr(view_func, "cls", None) or view_func
+        replica_modules = getattr(settings, "DATABASE_REPLICA_VIEW_MODULES", [])
+        if view_class.__module__ in replica_modules:
+            use_replicas()
+            request._reads_from_replica = True
+        return None
+
+    def process_response(self, request, response):
+        if getattr(request, "_reads_from_replica", False):
+            # Worker threads are reused, so never leak replica reads into the next request
+            pin_to_primary()
+
+        if replica_aliases() and request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    gzip/brotli compression for responses under ``COMPRESSION_PATH_PREFIXES``.
+
+    Responses tagged with ``backend.compression.set_compression_key`` reuse
+    cached compressed bytes; streamed responses are gzipped on the fly.
+    """
+
+    def process_response(self, request, response):
+        prefixes = tuple(getattr(settings, "COMPRESSION_PATH_PREFIXES", ["/api/"]))
+        if not request.path.startswith(prefixes) or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+        if not response.streaming and len(response.content) < MIN_COMPRESS_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+
+        if response.streaming:
+            encoding = negotiate_encoding(accept_encoding, available=["gzip"])
+            if encoding is None:
+                return response
+            response.streaming_content = compress_sequence(response.streaming_content)
+            del response["Content-Length"]
+        else:
+            encoding = negotiate_encoding(accept_encoding)
+            if encoding is None:
+                return response
+            content = compressed_content(response, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        # The compressed body is a different representation of the same resource
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,56 @@
+"""
+orjson-backed drop-in replacement for DRF's ``JSONRenderer``.
+
+Enable it with ``DJANGO_JSON_RENDERER=orjson`` (``pip install orjson``). The
+output is byte-for-byte what the stock renderer produces for the same data:
+datetimes, dates, times, Decimal, lazy translation strings and every other
+non-native type are handed to DRF's own encoder, and anything orjson cannot
+encode (integers beyond 64 bits, indented output for the browsable API)
+falls back to the stock renderer.
+
+The one difference is float formatting outside the plain decimal range:
+orjson writes ``1e16`` where ``json`` writes ``1e+16``, and NaN/Infinity as
+``null`` instead of raising. No model here has a float field.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+_drf_default = JSONEncoder().default
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        # Let DRF format these so "+00:00" -> "Z" and microseconds match exactly
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes with orjson when the output allows it."""
+
+    def _can_use_orjson(self, accepted_media_type, renderer_context):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return False
+        return self.get_indent(accepted_media_type, renderer_context or {}) is None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self._can_use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as the stock renderer so the output is valid JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
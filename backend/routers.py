@@ -0,0 +1,81 @@
+"""
+Primary/replica database routing.
+
+Reads are sent to a replica only while ``replica_reads()`` is active, which
+``backend.middleware.ReplicaRoutingMiddleware`` does for safe requests to the
+public cms views. Everything else (admin, imports, AI endpoints, management
+commands, shell) reads and writes the primary.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+PRIMARY_DB = "default"
+
+# "replica" while the current request may read from replicas, "primary" otherwise
+_read_target: ContextVar[str] = ContextVar("read_target", default="primary")
+
+
+def replica_aliases() -> list:
+    """Return the configured replica aliases (``replica_1``, ``replica_2``...)."""
+    return [alias for alias in settings.DATABASES if alias != PRIMARY_DB]
+
+
+def use_replicas() -> None:
+    """Allow further ORM reads in the current context to be served by a replica."""
+    _read_target.set("replica")
+
+
+@contextmanager
+def replica_reads():
+    """Allow ORM reads inside the block to be served by a replica."""
+    token = _read_target.set("replica")
+    try:
+        yield
+    finally:
+        _read_target.reset(token)
+
+
+def pin_to_primary() -> None:
+    """Send every further read in the current context to the primary."""
+    _read_target.set("primary")
+
+
+def reading_from_replicas() -> bool:
+    return _read_target.get() == "replica"
+
+
+class PrimaryReplicaRouter:
+    """Route reads to a random replica when allowed, all writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or not reading_from_replicas():
+            return PRIMARY_DB
+
+        # Keep related lookups on the database the instance was loaded from
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db in replicas:
+            return instance._state.db
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes within the same request
+        pin_to_primary()
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = set(settings.DATABASES)
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas of a real cluster are read-only and never migrated directly;
+        # local SQLite replica files can still be created with --database.
+        return None
@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
+
+from backend.database import databases_from_env
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -73,10 +76,17 @@ INSTALLED_APPS = [
     'corsheaders',
     'core',
     'cms',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the whole stack
+    'monitoring.middleware.RequestTimingMiddleware',
+    # Opt-in, see MONITORING_PROFILE_* below
+    'monitoring.middleware.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'backend.middleware.CompressionMiddleware',
+    'backend.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -87,6 +97,60 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Responses under these paths are gzip/brotli compressed (brotli needs `pip install brotli`)
+COMPRESSION_PATH_PREFIXES = ['/api/']
+
+# Request timings (monitoring app): Server-Timing header on every response (it
+# exposes DB time and query counts, so only by default in DEBUG), and how often
+# each process adds its per-endpoint totals to the database (0 = never)
+MONITORING_SERVER_TIMING = os.getenv("DJANGO_SERVER_TIMING", str(DEBUG)).lower() == "true"
+MONITORING_FLUSH_SECONDS = float(os.getenv("DJANGO_MONITORING_FLUSH_SECONDS", "30"))
+
+# /metrics (monitoring.metrics): with several worker processes each writes its
+# values to this directory so the endpoint can add them up; optional bearer token
+MONITORING_METRICS_DIR = os.getenv("DJANGO_METRICS_DIR") or None
+MONITORING_METRICS_TOKEN = os.getenv("DJANGO_METRICS_TOKEN", "")
+
+# Request profiles (monitoring.middleware.ProfilingMiddleware): stack-sample 1 in
+# N requests (0 = none) and keep those slower than the threshold, or any request
+# sending "X-Profile: <token>"; the sampling interval is in milliseconds
+MONITORING_PROFILE_SAMPLE_RATE = int(os.getenv("DJANGO_PROFILE_SAMPLE_RATE", "0"))
+MONITORING_PROFILE_THRESHOLD_MS = float(os.getenv("DJANGO_PROFILE_THRESHOLD_MS", "500"))
+MONITORING_PROFILE_TOKEN = os.getenv("DJANGO_PROFILE_TOKEN", "")
+MONITORING_PROFILE_INTERVAL_MS = float(os.getenv("DJANGO_PROFILE_INTERVAL_MS", "5"))
+
+# Slow-query log (monitoring.slow_queries): queries at least this slow (0 = off)
+# are logged with their view and serializer field, and the last N are kept per
+# process for /admin/slow-queries/. Parameters (user input) and the EXPLAIN plan
+# (run with them) are only recorded when enabled, by default under DEBUG
+MONITORING_SLOW_QUERY_MS = float(os.getenv("DJANGO_SLOW_QUERY_MS", "100"))
+MONITORING_SLOW_QUERY_PARAMS = os.getenv("DJANGO_SLOW_QUERY_PARAMS", str(DEBUG)).lower() == "true"
+MONITORING_SLOW_QUERY_EXPLAIN = os.getenv("DJANGO_SLOW_QUERY_EXPLAIN", str(DEBUG)).lower() == "true"
+MONITORING_SLOW_QUERY_BUFFER = int(os.getenv("DJANGO_SLOW_QUERY_BUFFER", "100"))
+
+# One JSON line per request on the "monitoring.requests" logger (logged at DEBUG,
+# so DJANGO_REQUEST_LOG_LEVEL=DEBUG turns them on), and one per slow query on
+# "monitoring.slow_queries"
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'monitoring.requests': {
+            'handlers': ['console'],
+            'level': os.getenv("DJANGO_REQUEST_LOG_LEVEL", "INFO"),
+            'propagate': False,
+        },
+        'monitoring.slow_queries': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -107,17 +171,47 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'backend.wsgi.application'
 
+# Route the hot cms read views to their async variants (cms/async_views.py);
+# backend/asgi.py turns this on by default
+CMS_ASYNC_VIEWS = os.getenv("DJANGO_ASYNC_VIEWS", "false").lower() == "true"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# Primary + optional read replicas from the environment, see backend/database.py
+# (DJANGO_DB_ENGINE, DJANGO_DB_REPLICAS, DJANGO_DB_CONN_MAX_AGE, DJANGO_SQLITE_*)
+DATABASES = databases_from_env(BASE_DIR)
 
+# Public cms reads go to replicas, everything else (admin, imports, AI) to the primary
+DATABASE_ROUTERS = ['backend.routers.PrimaryReplicaRouter']
+
+# Views whose safe (GET/HEAD) requests may be served from a replica
+DATABASE_REPLICA_VIEW_MODULES = ['cms.views', 'cms.async_views', 'cms.sitemaps']
+
+# After a write, the client reads from the primary for this many seconds
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv("DJANGO_DB_REPLICA_STICKY_SECONDS", "10"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The API fragment cache is invalidated through version keys, so deployments
+# with several workers need a shared backend (set DJANGO_REDIS_URL).
+
+if os.getenv("DJANGO_REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv("DJANGO_REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'travelacrosseu',
+        }
+    }
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -173,14 +267,31 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Absolute origin for media URLs in API responses (e.g. a CDN); when empty
+# they are built from the request host, see cms/media.py
+MEDIA_BASE_URL = os.getenv("DJANGO_MEDIA_BASE_URL", "")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# DJANGO_JSON_RENDERER=orjson switches to the faster, byte-compatible
+# backend.renderers.ORJSONRenderer (requires `pip install orjson`).
+JSON_RENDERERS = {
+    "json": "rest_framework.renderers.JSONRenderer",
+    "orjson": "backend.renderers.ORJSONRenderer",
+}
+_json_renderer = os.getenv("DJANGO_JSON_RENDERER", "json").lower()
+if _json_renderer not in JSON_RENDERERS:
+    raise ImproperlyConfigured(
+        f"DJANGO_JSON_RENDERER={_json_renderer!r} is not one of: {', '.join(JSON_RENDERERS)}"
+    )
+JSON_RENDERER = JSON_RENDERERS[_json_renderer]
+
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        JSON_RENDERER,
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
@@ -30,6 +30,8 @@ from core.views import (
 )
 from cms.admin_dashboard import admin_dashboard
 from cms.admin_urls import MediaLibraryView
+from monitoring.admin_views import endpoint_performance, slow_query_log
+from monitoring.views import metrics_view
 
 router = routers.DefaultRouter()
 router.register(r"countries", CountryViewSet, basename="country")
@@ -40,11 +42,14 @@ router.register(r"pages", TravelPageViewSet, basename="travelpage")
 urlpatterns = [
     path('admin/dashboard/', admin_dashboard, name='admin-dashboard'),
     path('admin/media-library/', MediaLibraryView.as_view(), name='media_library'),
+    path('admin/performance/', endpoint_performance, name='admin-performance'),
+    path('admin/slow-queries/', slow_query_log, name='admin-slow-queries'),
     path('admin/', admin.site.urls),
     path('api/', api_root, name='api-root'),
     path('api/', include(router.urls)),
     path('api/ai/generate-page/', ai_generate_travel_page, name='ai-generate-page'),
     path('api/cms/', include('cms.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Serve media files during development
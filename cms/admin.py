@@ -6,16 +6,19 @@ from django.db import transaction
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 import json
+import time
 
 from cms.models import (
     Page, PageTranslation, PageSection, PageHeroSlide,
     Country, City, Destination, DestinationTranslation, DestinationSection, DestinationHeroSlide,
     BlogCategory, BlogPost, BlogPostTranslation, BlogPostSection, BlogPostHeroSlide,
     MediaFile, NavigationMenuItem, FooterBlock, FooterLink,
-    HomepageCategory, HomepageCategoryTranslation
+    HomepageCategory, HomepageCategoryTranslation, ContentSnapshot
 )
 from cms.utils import get_frontend_url
 from cms.admin_forms import JSONImportForm
+from cms.search import search_media
+from monitoring.metrics import IMPORT_DURATION, IMPORT_ITEMS
 
 
 class JsonImportAdminMixin:
@@ -63,6 +66,7 @@ class JsonImportAdminMixin:
         updated_count = 0
         skipped_count = 0
         errors = []
+        started = time.perf_counter()
         
         try:
             with transaction.atomic():
@@ -112,6 +116,14 @@ class JsonImportAdminMixin:
         
         except Exception as e:
             messages.error(request, f"❌ Import failed with database error: {str(e)}")
+        else:
+            model_name = self.opts.model_name
+            IMPORT_ITEMS.inc(model_name, "created", amount=created_count)
+            IMPORT_ITEMS.inc(model_name, "updated", amount=updated_count)
+            IMPORT_ITEMS.inc(model_name, "skipped", amount=skipped_count - len(errors))
+            IMPORT_ITEMS.inc(model_name, "error", amount=len(errors))
+        finally:
+            IMPORT_DURATION.observe(time.perf_counter() - started, self.opts.model_name)
         
         # Redirect back to changelist
         return redirect(f'admin:{self.opts.app_label}_{self.opts.model_name}_changelist')
@@ -869,15 +881,24 @@ class MediaFileAdmin(admin.ModelAdmin):
     list_display = ("thumbnail_preview", "name", "file_name", "get_file_size_display", "uploaded_at", "copy_url_action")
     list_filter = ("uploaded_at",)
     search_fields = ("name", "file")
-    readonly_fields = ("uploaded_at", "file_size", "thumbnail_preview", "file_url")
+    readonly_fields = (
+        "uploaded_at", "file_size", "thumbnail_preview", "file_url",
+        "image_width", "image_height", "image_format", "dominant_color", "blurhash",
+    )
     ordering = ("-uploaded_at",)
     
+    def get_search_results(self, request, queryset, search_term):
+        """Search the token index instead of name/file icontains scans (see cms.search)."""
+        if not search_term.strip():
+            return queryset, False
+        return search_media(queryset, search_term), False
+    
     fieldsets = (
         ("Media Information", {
             "fields": ("name", "file", "thumbnail_preview", "file_url")
         }),
         ("Metadata", {
-            "fields": ("uploaded_at", "file_size"),
+            "fields": ("uploaded_at", "file_size", "image_width", "image_height", "image_format", "dominant_color", "blurhash"),
             "classes": ("collapse",)
         }),
     )
@@ -1137,3 +1158,24 @@ class HomepageCategoryTranslationAdmin(admin.ModelAdmin):
             return format_html('<img src="{}" style="max-height: 200px; border-radius: 8px;" />', obj.image.url)
         return "No image uploaded"
     image_preview_large.short_description = "Image Preview"
+
+
+
+@admin.register(ContentSnapshot)
+class ContentSnapshotAdmin(admin.ModelAdmin):
+    """Read-only view of the pre-rendered API payloads (rebuilt automatically)."""
+    list_display = ("key", "content_type", "locale", "payload_size", "built_at")
+    list_filter = ("content_type", "locale")
+    search_fields = ("key",)
+    readonly_fields = ("key", "content_type", "object_id", "locale", "payload", "built_at")
+
+    def payload_size(self, obj):
+        """Display the payload size in bytes."""
+        return len(obj.payload)
+    payload_size.short_description = "Size (chars)"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
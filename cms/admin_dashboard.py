@@ -1,11 +1,12 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render
 from django.db.models import Count
+from cms.media_folders import library_totals
 from cms.models import (
     Page, PageTranslation, PageSection,
     Country, City, Destination, DestinationTranslation, DestinationSection,
     BlogCategory, BlogPost, BlogPostTranslation, BlogPostSection,
-    MediaFile, NavigationMenuItem, FooterBlock,
+    NavigationMenuItem, FooterBlock,
     SUPPORTED_LOCALES
 )
 
@@ -16,6 +17,8 @@ def admin_dashboard(request):
     Custom admin dashboard with content overview and translation status
     """
     
+    media_totals = library_totals()
+    
     # Content Statistics
     content_stats = {
         'pages': {
@@ -42,9 +45,10 @@ def admin_dashboard(request):
             'translations': BlogPostTranslation.objects.count(),
             'sections': BlogPostSection.objects.count(),
         },
+        # Precomputed per folder (cms.media_folders); total_size is in bytes
         'media': {
-            'total_files': MediaFile.objects.count(),
-            'total_size': MediaFile.objects.aggregate(total=Count('file_size'))['total'] or 0,
+            'total_files': media_totals['files'],
+            'total_size': media_totals['bytes'],
         },
         'navigation': {
             'menu_items': NavigationMenuItem.objects.count(),
@@ -1,12 +1,14 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum
 from django.shortcuts import render
 from django.urls import path
 from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
 from django.views.generic import ListView
 
 from cms.models import MediaFile
+from cms.media_folders import folder_tree, library_totals
+from cms.search import filter_folder, search_media
 
 
 @method_decorator(staff_member_required, name='dispatch')
@@ -18,15 +20,16 @@ class MediaLibraryView(ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        """Filter media files based on search query."""
+        """Filter media files by search query and folder (both indexed, see cms.search)."""
         queryset = MediaFile.objects.all()
         search_query = self.request.GET.get('q', '').strip()
         
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(file__icontains=search_query)
-            )
+            queryset = search_media(queryset, search_query)
+        
+        folder_filter = self.request.GET.get('folder', '').strip()
+        if folder_filter:
+            queryset = filter_folder(queryset, folder_filter)
         
         return queryset.order_by('-uploaded_at')
     
@@ -34,13 +37,16 @@ class MediaLibraryView(ListView):
         """Add additional context for the template."""
         context = super().get_context_data(**kwargs)
         
-        # Calculate total file size
-        total_size = MediaFile.objects.aggregate(
-            total=Sum('file_size')
-        )['total'] or 0
+        # Library totals and the current folder's subfolders, precomputed (cms.media_folders)
+        totals = library_totals()
+        context['total_files'] = totals['files']
+        context['total_size_display'] = self._format_file_size(totals['bytes'])
         
-        # Convert to human-readable format
-        context['total_size_display'] = self._format_file_size(total_size)
+        folder = self.request.GET.get('folder', '').strip()
+        context['current_folder'] = folder_tree(folder)
+        context['filter_query'] = urlencode({
+            key: self.request.GET[key] for key in ('q', 'folder') if self.request.GET.get(key)
+        })
         
         return context
     
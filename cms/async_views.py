@@ -0,0 +1,97 @@
+"""
+Async variants of the hot cms read views for ASGI deployments.
+
+``cms.urls`` routes to these instead of ``cms.views`` when
+``settings.CMS_ASYNC_VIEWS`` is on (the default under ``backend.asgi``).
+They answer with the same bytes as the sync views: snapshot lookups and
+fragment cache reads go through the async ORM and cache without tying up a
+worker thread; a snapshot miss or a sparse fieldset request renders the sync
+view in a thread, and ``resolve_translation`` runs the sync view's lookups
+(``cms.views._translation_target``) in one, so the two cannot drift apart.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.settings import api_settings
+
+from cms import views
+from cms.cache import FOOTER, NAVIGATION, acached_fragment
+from cms.serializers import FooterBlockSerializer, NavigationMenuItemSerializer
+from cms.snapshots import aget_snapshot_response
+
+
+def _json_response(data, status: int = 200) -> HttpResponse:
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+def _render_sync_view(view, request, **kwargs):
+    response = view(request, **kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+async def _detail(request, view, content_type: str, slug: str, locale):
+    if "fields" not in request.GET and "exclude" not in request.GET:
+        snapshot = await aget_snapshot_response(request, content_type, slug, locale)
+        if snapshot is not None:
+            return snapshot
+        request._snapshot_missed = True
+    return await sync_to_async(_render_sync_view)(view, request, slug=slug)
+
+
+@require_safe
+async def page_detail(request, slug: str):
+    return await _detail(request, views.page_detail, "page", slug, request.GET.get("locale"))
+
+
+@require_safe
+async def destination_detail(request, slug: str):
+    locale = request.GET.get("locale") or getattr(request, "LANGUAGE_CODE", None)
+    return await _detail(request, views.destination_detail, "destination", slug, locale)
+
+
+@require_safe
+async def blog_post_detail(request, slug: str):
+    locale = request.GET.get("locale") or getattr(request, "LANGUAGE_CODE", None)
+    return await _detail(request, views.blog_post_detail, "blog_post", slug, locale)
+
+
+@require_safe
+async def navigation_list(request):
+    """Navigation menu items for ?locale= (default 'en'), from the fragment cache."""
+    locale = request.GET.get("locale", "en")
+
+    async def build():
+        items = [item async for item in views._navigation_queryset(locale)]
+        return NavigationMenuItemSerializer(items, many=True).data
+
+    data, _ = await acached_fragment(NAVIGATION, locale, build)
+    return _json_response(data)
+
+
+@require_safe
+async def footer_list(request):
+    """Footer blocks for ?locale= (default 'en'), from the fragment cache."""
+    locale = request.GET.get("locale", "en")
+
+    async def build():
+        blocks = [block async for block in views._footer_queryset(locale)]
+        return FooterBlockSerializer(blocks, many=True).data
+
+    data, _ = await acached_fragment(FOOTER, locale, build)
+    return _json_response(data)
+
+
+@require_safe
+async def resolve_translation(request):
+    """Async ``cms.views.resolve_translation``; the lookups run in a thread."""
+    result = await sync_to_async(views._translation_target)(
+        request.GET.get('slug', '').strip(),
+        request.GET.get('content_type', '').strip(),
+        request.GET.get('locale', 'en').strip(),
+        request.GET.get('current_path', '').strip(),
+    )
+    return _json_response(result)
@@ -0,0 +1,83 @@
+"""
+Versioned fragment cache for the public cms API.
+
+A fragment is the serialized data of one small, hot endpoint for one locale
+(navigation, footer, homepage categories). Each fragment name has a version
+number that ``cms.signals`` bumps whenever a model feeding it changes, so
+stale entries are never read again and simply expire.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from rest_framework.utils.encoders import JSONEncoder
+
+from monitoring.timing import record_cache
+
+
+FRAGMENT_TIMEOUT = 60 * 5
+
+NAVIGATION = "navigation"
+FOOTER = "footer"
+HOMEPAGE_CATEGORIES = "homepage_categories"
+
+
+def _version_key(name: str) -> str:
+    return f"cms:fragment-version:{name}"
+
+
+def fragment_version(name: str) -> int:
+    return cache.get_or_set(_version_key(name), 1, timeout=None)
+
+
+async def afragment_version(name: str) -> int:
+    return await cache.aget_or_set(_version_key(name), 1, timeout=None)
+
+
+def bump_fragment_version(name: str) -> None:
+    """Invalidate every cached copy of a fragment."""
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        cache.set(_version_key(name), 2, timeout=None)
+
+
+def compute_etag(data) -> str:
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def cached_fragment(name: str, variant: str, builder):
+    """
+    Return ``(data, etag)`` for a fragment, building and caching it on a miss.
+
+    Args:
+        name: Fragment name (``NAVIGATION``, ``FOOTER``, ``HOMEPAGE_CATEGORIES``).
+        variant: Everything else the data depends on, e.g. locale and origin.
+        builder: Zero-argument callable returning the serialized data.
+    """
+    key = f"cms:fragment:{name}:{variant}:v{fragment_version(name)}"
+    cached = cache.get(key)
+    record_cache(hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    data = builder()
+    entry = (data, compute_etag(data))
+    cache.set(key, entry, FRAGMENT_TIMEOUT)
+    return entry
+
+
+async def acached_fragment(name: str, variant: str, builder):
+    """Async ``cached_fragment``; ``builder`` is a zero-argument coroutine function."""
+    key = f"cms:fragment:{name}:{variant}:v{await afragment_version(name)}"
+    cached = await cache.aget(key)
+    record_cache(hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    data = await builder()
+    entry = (data, compute_etag(data))
+    await cache.aset(key, entry, FRAGMENT_TIMEOUT)
+    return entry
@@ -0,0 +1,138 @@
+"""
+Hero images for countries and blog posts, as listed in the content files.
+
+``countries_images.json`` names each country's image and the prompt to
+generate it; the blog story files (``content/travel-stories-*.json``) name
+each post's hero image. ``manage.py sync_content_images`` gets every listed
+image into the media storage (an existing file is kept, an image checked into
+``frontend/public`` under the same path is copied, a country image is
+generated, anything else gets a placeholder) and then points the rows at them.
+
+Progress is appended to a JSON-lines manifest as each image is stored, so an
+interrupted run resumes where it stopped instead of paying for the generated
+images again. The manifest is kept outside ``MEDIA_ROOT``: the media folder is
+served as is and must not publish it.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+
+COUNTRY = "country"
+BLOG_POST = "blog_post"
+
+# How an image got into the storage; STUB images are replaced by a run that may generate
+EXISTING = "existing"
+COPIED = "copied"
+GENERATED = "generated"
+PLACEHOLDER = "placeholder"
+STUB = "stub"
+
+COUNTRY_IMAGE_FOLDER = "images/countries/"
+COUNTRY_IMAGE_SIZE = (1536, 1024)
+BLOG_IMAGE_SIZE = (800, 400)
+
+
+@dataclass
+class ImageJob:
+    """One image to get into the media storage and the row that shows it."""
+
+    kind: str
+    slug: str
+    name: str
+    title: str
+    prompt: Optional[str] = None
+
+    @property
+    def size(self) -> tuple:
+        return COUNTRY_IMAGE_SIZE if self.kind == COUNTRY else BLOG_IMAGE_SIZE
+
+    def local_source(self) -> Optional[Path]:
+        """The copy of this image checked into the frontend's public folder, if any."""
+        path = Path(settings.BASE_DIR) / "frontend" / "public" / self.name
+        return path if path.is_file() else None
+
+
+def country_jobs(path: Path) -> list:
+    with open(path, encoding="utf-8") as file:
+        items = json.load(file)
+    return [
+        ImageJob(
+            kind=COUNTRY,
+            slug=item["slug"],
+            name=f"{COUNTRY_IMAGE_FOLDER}{item['image_filename']}",
+            title=item["slug"].replace("-", " ").title(),
+            prompt=item.get("image_prompt") or None,
+        )
+        for item in items
+    ]
+
+
+def blog_post_jobs(path: Path) -> list:
+    with open(path, encoding="utf-8") as file:
+        stories = json.load(file)
+    return [
+        ImageJob(
+            kind=BLOG_POST,
+            slug=story["slug"],
+            name=story["hero_image"].lstrip("/"),
+            title=story.get("title") or "Travel Story",
+        )
+        for story in stories
+        if story.get("hero_image")
+    ]
+
+
+class Manifest:
+    """
+    Append-only record of the images already stored, one JSON object per line;
+    the last line for a name wins and a line cut off by a crash is ignored.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[entry["name"]] = entry
+
+    def get(self, name: str) -> Optional[dict]:
+        return self.entries.get(name)
+
+    def record(self, job: ImageJob, source: str, stored_name: str = "", error: str = "") -> dict:
+        if error and job.name in self.entries:
+            # A failed retry leaves the image stored by an earlier run in place
+            stored_name = self.entries[job.name]["stored_name"]
+        entry = {
+            "name": job.name,
+            "kind": job.kind,
+            "slug": job.slug,
+            "source": source,
+            "stored_name": stored_name,
+            "error": error,
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self.entries[job.name] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+            file.flush()
+        return entry
+
+    def stored(self, kind: str) -> dict:
+        """``{slug: stored file name}`` of the images of ``kind`` that are in the storage."""
+        return {
+            entry["slug"]: entry["stored_name"]
+            for entry in self.entries.values()
+            if entry["kind"] == kind and entry["stored_name"]
+        }
@@ -0,0 +1,141 @@
+"""
+Sparse fieldsets for the public cms API: ``?fields=a,b`` and ``?exclude=c``.
+
+``SparseFieldsetMixin`` drops the omitted fields from top-level serializers,
+so their ``SerializerMethodField``s are never computed, and
+``prune_queryset`` applies the same selection to the view's queryset:
+columns are limited with ``only()`` and ``select_related``/prefetch lookups
+that no selected field reads are removed.
+
+Each serializer declares what its non-trivial fields read in
+``sparse_dependencies`` as model lookups relative to its model, e.g.
+``"city__country"`` (a relation), ``"translations__title"`` (one column of
+a prefetched relation) or ``"translations"`` (the whole relation as loaded
+by the view). Concrete model fields map to their own column automatically.
+"""
+
+from typing import Iterable, Optional
+
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def translation_lookups(*columns: str) -> tuple:
+    """Lookups of a field read from the resolved translation (always needs ``locale``)."""
+    return ("translations__locale",) + tuple(f"translations__{column}" for column in columns)
+
+
+def _split(value: Optional[str]) -> list:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def _needed(path: str, lookups: set) -> bool:
+    """Whether a relation path is read by any of the lookups."""
+    return any(
+        lookup == path or lookup.startswith(path + "__") or path.startswith(lookup + "__")
+        for lookup in lookups
+    )
+
+
+def _select_related_paths(tree: dict, prefix: str = ""):
+    for name, subtree in tree.items():
+        path = prefix + name
+        if subtree:
+            yield from _select_related_paths(subtree, path + "__")
+        else:
+            yield path
+
+
+def _prune_prefetch(prefetch: Prefetch, lookups: set, model) -> Prefetch:
+    """Restrict the columns and nested prefetches of a one-level reverse ``Prefetch``."""
+    path = prefetch.prefetch_through
+    if prefetch.queryset is None or "__" in path or path in lookups:
+        return prefetch
+
+    relation = model._meta.get_field(path)
+    if not relation.one_to_many:
+        return prefetch
+
+    nested = {lookup[len(path) + 2:] for lookup in lookups if lookup.startswith(path + "__")}
+    # Prefetched rows are matched to their parent through this foreign key
+    nested.add(relation.field.name)
+    return Prefetch(path, queryset=prune_queryset(prefetch.queryset, nested), to_attr=prefetch.to_attr)
+
+
+def prune_queryset(queryset, lookups: Iterable[str]):
+    """Load only what ``lookups`` (relative to ``queryset.model``) read."""
+    lookups = set(lookups)
+    opts = queryset.model._meta
+    concrete = {field.name for field in opts.concrete_fields}
+
+    columns = {opts.pk.name}
+    for lookup in lookups:
+        head = lookup.split("__", 1)[0]
+        if head in concrete:
+            columns.add(head)
+
+    if isinstance(queryset.query.select_related, dict):
+        kept = [path for path in _select_related_paths(queryset.query.select_related) if _needed(path, lookups)]
+        queryset = queryset.select_related(None)
+        if kept:
+            queryset = queryset.select_related(*kept)
+
+    prefetches = []
+    for lookup in queryset._prefetch_related_lookups:
+        path = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+        if not _needed(path, lookups):
+            continue
+        prefetches.append(_prune_prefetch(lookup, lookups, queryset.model) if isinstance(lookup, Prefetch) else lookup)
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+
+    return queryset.only(*columns)
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=`` / ``?exclude=`` support for a top-level ``ModelSerializer``.
+
+    Serializers nested in another serializer always render all their fields.
+    """
+
+    # output field -> model lookups it reads (see module docstring)
+    sparse_dependencies = {}
+
+    @classmethod
+    def sparse_fieldset(cls, request) -> Optional[set]:
+        """Output fields selected by the request, or None when it selects all of them."""
+        params = getattr(request, "query_params", None)
+        if not params:
+            return None
+        fields, exclude = _split(params.get("fields")), _split(params.get("exclude"))
+        if not fields and not exclude:
+            return None
+        declared = set(cls.Meta.fields)
+        selected = declared.intersection(fields) if fields else declared
+        return selected.difference(exclude)
+
+    @classmethod
+    def prune_queryset(cls, queryset, request):
+        """Drop the columns and related lookups the selected fields do not read."""
+        selected = cls.sparse_fieldset(request)
+        if selected is None:
+            return queryset
+        lookups = set()
+        for name in selected:
+            lookups.update(cls.sparse_dependencies.get(name, (name,)))
+        return prune_queryset(queryset, lookups)
+
+    def _is_top_level(self) -> bool:
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_top_level():
+            return fields
+        selected = self.sparse_fieldset(self.context.get("request"))
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
@@ -0,0 +1,198 @@
+"""
+Image metadata for the frontend: size, format, dominant colour and blurhash,
+and the placeholder images rendered for content without a photo.
+
+Extracted once when an image is uploaded (``ImageMetadata.save``) or by
+``manage.py extract_image_metadata`` for existing files, so the API can
+tell the frontend how much space to reserve and what placeholder to paint
+before the image itself is downloaded.
+
+The blurhash (https://blurha.sh) is encoded here in pure Python from a
+32px thumbnail; at that size it costs a few milliseconds per image.
+"""
+
+import io
+import logging
+import math
+import zlib
+from typing import Optional
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
+
+BLURHASH_COMPONENTS = (4, 3)
+THUMBNAIL_SIZE = (32, 32)
+DOMINANT_PALETTE_SIZE = 5
+
+# (background, text) colours of placeholder images
+PLACEHOLDER_COLORS = (
+    ("#2C3E50", "#ECF0F1"),
+    ("#8E44AD", "#F8F9FA"),
+    ("#E74C3C", "#FFFFFF"),
+    ("#3498DB", "#FFFFFF"),
+    ("#27AE60", "#FFFFFF"),
+    ("#F39C12", "#2C3E50"),
+    ("#34495E", "#BDC3C7"),
+    ("#16A085", "#FFFFFF"),
+)
+PLACEHOLDER_WATERMARK = "Travel Across EU"
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _encode83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - index - 1)) % 83] for index in range(length))
+
+
+def _srgb_to_linear(value: int) -> float:
+    value = value / 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def blurhash(image: Image.Image, components: tuple = BLURHASH_COMPONENTS) -> str:
+    """Blurhash of an RGB image (pass a small thumbnail: the cost is per pixel and component)."""
+    x_components, y_components = components
+    width, height = image.size
+    linear = [tuple(_srgb_to_linear(channel) for channel in pixel) for pixel in image.get_flattened_data()]
+
+    factors = []
+    for j in range(y_components):
+        cos_y = [math.cos(math.pi * j * y / height) for y in range(height)]
+        for i in range(x_components):
+            cos_x = [math.cos(math.pi * i * x / width) for x in range(width)]
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[x] * cos_y[y]
+                    pixel = linear[row + x]
+                    r += basis * pixel[0]
+                    g += basis * pixel[1]
+                    b += basis * pixel[2]
+            scale = (1 if i == j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if ac:
+        actual_maximum = max(abs(value) for factor in ac for value in factor)
+        quantised_maximum = max(0, min(82, int(actual_maximum * 166 - 0.5)))
+        maximum = (quantised_maximum + 1) / 166
+        result += _encode83(quantised_maximum, 1)
+    else:
+        maximum = 1
+        result += _encode83(0, 1)
+
+    result += _encode83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+
+    for factor in ac:
+        r, g, b = (max(0, min(18, int(_sign_pow(value / maximum, 0.5) * 9 + 9.5))) for value in factor)
+        result += _encode83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def dominant_color(image: Image.Image) -> str:
+    """Most common colour of an RGB image after reducing it to a few colours, as ``#rrggbb``."""
+    quantized = image.quantize(colors=DOMINANT_PALETTE_SIZE, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    palette = quantized.getpalette()
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def extract_image_metadata(file) -> Optional[dict]:
+    """
+    ``{"image_width", "image_height", "image_format", "dominant_color", "blurhash"}``
+    of an open image file, or None when it cannot be read. Width and height
+    are as displayed, i.e. after the EXIF orientation.
+    """
+    try:
+        with Image.open(file) as image:
+            full_size = image.size
+            image_format = image.format or ""
+
+            # JPEG decoders can scale down while decoding
+            image.draft("RGB", (THUMBNAIL_SIZE[0] * 4, THUMBNAIL_SIZE[1] * 4))
+            decoded_size = image.size
+            # Turned upright, so the blurhash and colour follow the displayed image
+            upright = ImageOps.exif_transpose(image)
+            width, height = full_size if upright.size == decoded_size else full_size[::-1]
+            thumbnail = upright.convert("RGB")
+            thumbnail.thumbnail(THUMBNAIL_SIZE)
+    except (UnidentifiedImageError, OSError, ValueError) as error:
+        logger.warning("Could not read image metadata: %s", error)
+        return None
+
+    return {
+        "image_width": width,
+        "image_height": height,
+        "image_format": image_format,
+        "dominant_color": dominant_color(thumbnail),
+        "blurhash": blurhash(thumbnail),
+    }
+
+
+def extract_from_storage(name: str) -> tuple:
+    """``(name, metadata)`` of a file in the default storage; a process pool worker."""
+    from django.core.files.storage import default_storage
+
+    try:
+        with default_storage.open(name, "rb") as file:
+            return name, extract_image_metadata(file)
+    except OSError as error:
+        logger.warning("Could not open %s: %s", name, error)
+        return name, None
+
+
+def _wrap(draw: ImageDraw.ImageDraw, text: str, font, width: int) -> list:
+    lines, current = [], []
+    for word in text.split():
+        candidate = " ".join(current + [word])
+        left, _, right, _ = draw.textbbox((0, 0), candidate, font=font)
+        if right - left > width and current:
+            lines.append(" ".join(current))
+            current = [word]
+        else:
+            current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines if len(lines) <= 3 else lines[:2] + ["..."]
+
+
+def render_placeholder(title: str, size: tuple = (800, 400)) -> bytes:
+    """
+    JPEG bytes of a placeholder with ``title`` centred on a plain background.
+    The colours are picked from the title, so re-rendering gives the same image.
+    """
+    width, height = size
+    background, text_color = PLACEHOLDER_COLORS[zlib.crc32(title.encode()) % len(PLACEHOLDER_COLORS)]
+    font_size = max(16, height * 9 // 100)
+    font = ImageFont.load_default(size=font_size)
+    small_font = ImageFont.load_default(size=font_size * 2 // 3)
+
+    image = Image.new("RGB", size, background)
+    draw = ImageDraw.Draw(image)
+    line_height = font_size * 4 // 3
+    lines = _wrap(draw, title, font, width - 100)
+    top = (height - len(lines) * line_height) // 2
+    for index, line in enumerate(lines):
+        draw.text((width // 2, top + index * line_height), line, font=font, fill=text_color, anchor="mt")
+    draw.text((width - 20, height - 20), PLACEHOLDER_WATERMARK, font=small_font, fill=text_color, anchor="rb")
+
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=85)
+    return output.getvalue()
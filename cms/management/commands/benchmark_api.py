@@ -0,0 +1,192 @@
+"""Latency, query count and payload size of every public API endpoint on a synthetic catalogue."""
+
+import json
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from cms.cache import FOOTER, HOMEPAGE_CATEGORIES, NAVIGATION, bump_fragment_version
+from cms.models import ContentSnapshot
+from cms.snapshots import rebuild_snapshots
+from cms.synthetic import endpoints, generate_catalogue
+
+
+class Rollback(Exception):
+    """Raised to discard the synthetic catalogue at the end of a run."""
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic catalogue, request every public API endpoint and report "
+        "p50/p95/p99 latency, query counts and response bytes. The catalogue is rolled "
+        "back afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--countries", type=int, default=10)
+        parser.add_argument("--cities", type=int, default=5, help="Cities per country")
+        parser.add_argument("--destinations", type=int, default=10, help="Destinations per city")
+        parser.add_argument("--pages", type=int, default=10)
+        parser.add_argument("--categories", type=int, default=5, help="Blog categories")
+        parser.add_argument("--posts", type=int, default=200, help="Blog posts")
+        parser.add_argument("--media", type=int, default=100, help="Media library files")
+        parser.add_argument("--homepage-categories", type=int, default=6)
+        parser.add_argument("--sections", type=int, default=3, help="Sections per translation")
+        parser.add_argument("--slides", type=int, default=3, help="Hero slides per translation")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=50, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests per endpoint")
+        parser.add_argument("--no-snapshots", action="store_true", help="Do not build detail snapshots")
+        parser.add_argument("--output", help="Write the results as JSON to this file")
+        parser.add_argument("--compare", help="Earlier --output file to compare against")
+        parser.add_argument("--keep", action="store_true", help="Commit the synthetic catalogue instead of rolling it back")
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as handle:
+                baseline = json.load(handle)
+
+        self._invalidate_fragments()
+        try:
+            with transaction.atomic():
+                results = self._run(options)
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            pass
+        finally:
+            # Cached fragments may describe the discarded catalogue
+            self._invalidate_fragments()
+
+        self._report(results, baseline)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def _invalidate_fragments(self):
+        for name in (NAVIGATION, FOOTER, HOMEPAGE_CATEGORIES):
+            bump_fragment_version(name)
+
+    def _run(self, options):
+        self.stdout.write("Generating synthetic catalogue ...")
+        start = time.perf_counter()
+        catalogue = generate_catalogue(
+            countries=options["countries"],
+            cities_per_country=options["cities"],
+            destinations_per_city=options["destinations"],
+            pages=options["pages"],
+            blog_categories=options["categories"],
+            blog_posts=options["posts"],
+            media_files=options["media"],
+            homepage_categories=options["homepage_categories"],
+            sections=options["sections"],
+            slides=options["slides"],
+            seed=options["seed"],
+        )
+        if not options["no_snapshots"]:
+            for content_type in ContentSnapshot.ContentType.values:
+                rebuild_snapshots(content_type)
+        self.stdout.write(f"  {catalogue.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        client = Client(HTTP_HOST="localhost")
+        measured = {}
+        # Replicas cannot see the uncommitted catalogue
+        with override_settings(ALLOWED_HOSTS=["localhost"], DATABASE_REPLICA_VIEW_MODULES=[]):
+            for name, url in endpoints(catalogue):
+                measured[name] = self._measure(client, url, options["warmup"], options["iterations"])
+
+        return {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "catalogue": {
+                key: options[key]
+                for key in ("countries", "cities", "destinations", "pages", "categories", "posts", "sections", "slides", "seed")
+            } | {"rows": catalogue.rows, "snapshots": not options["no_snapshots"]},
+            "iterations": options["iterations"],
+            "endpoints": measured,
+        }
+
+    def _measure(self, client, url, warmup, iterations):
+        for _ in range(warmup):
+            self._fetch(client, url)
+
+        timings = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                status, size = self._fetch(client, url)
+                timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        return {
+            "url": url,
+            "status": status,
+            "p50_ms": round(_percentile(timings, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(timings, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(timings, 0.99) * 1000, 3),
+            "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+            "queries": len(queries.captured_queries),
+            "bytes": size,
+        }
+
+    def _fetch(self, client, url):
+        response = client.get(url)
+        if response.streaming:
+            content = b"".join(response.streaming_content)
+        else:
+            content = response.content
+        return response.status_code, len(content)
+
+    def _report(self, results, baseline):
+        catalogue = results["catalogue"]
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"API benchmark ({catalogue['rows']} rows, {results['iterations']} requests per endpoint)"
+            )
+        )
+        previous = (baseline or {}).get("endpoints", {})
+        header = f"{'endpoint':28} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'bytes':>9}"
+        if baseline:
+            header += f" {'p95 vs ' + str(baseline.get('commit') or 'baseline'):>18} {'queries':>8}"
+        self.stdout.write(header)
+
+        for name, row in results["endpoints"].items():
+            line = (
+                f"{name:28} {row['status']:6d} {row['p50_ms']:8.2f} {row['p95_ms']:8.2f} "
+                f"{row['p99_ms']:8.2f} {row['queries']:7d} {row['bytes']:9d}"
+            )
+            before = previous.get(name)
+            if before:
+                change = (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+                line += f" {change:+17.1f}% {row['queries'] - before['queries']:+8d}"
+            self.stdout.write(line)
+
+        if not results["catalogue"].get("snapshots", True):
+            self.stdout.write("Detail snapshots were not built (--no-snapshots); detail views render live.")
@@ -0,0 +1,57 @@
+"""Micro-benchmark of absolute media URL generation on a serialized list."""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from cms.models import MediaFile
+from cms.serializers import MediaFileSerializer
+
+
+class LegacyMediaFileSerializer(MediaFileSerializer):
+    """The previous per-object ``build_absolute_uri(file.url)`` implementation."""
+
+    def get_url(self, obj):
+        if obj.file:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.file.url)
+            return obj.file.url
+        return None
+
+
+def time_serializer(serializer_class, items, iterations):
+    timings = []
+    for _ in range(iterations):
+        # A fresh request per run, like a real API call
+        request = RequestFactory().get("/api/cms/media/", HTTP_HOST="localhost")
+        start = time.perf_counter()
+        data = serializer_class(items, many=True, context={"request": request}).data
+        timings.append(time.perf_counter() - start)
+    return min(timings), data
+
+
+class Command(BaseCommand):
+    help = "Compare per-object build_absolute_uri() with the shared media URL builder on a list of media files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=500, help="Objects in the serialized list")
+        parser.add_argument("--iterations", type=int, default=20, help="Runs per implementation (best is reported)")
+
+    def handle(self, *args, **options):
+        items = [
+            MediaFile(id=index, name=f"Image {index}", file=f"uploads/photos/image {index}.jpg", file_size=1024)
+            for index in range(options["items"])
+        ]
+
+        with override_settings(ALLOWED_HOSTS=["localhost"]):
+            legacy_time, legacy_data = time_serializer(LegacyMediaFileSerializer, items, options["iterations"])
+            shared_time, shared_data = time_serializer(MediaFileSerializer, items, options["iterations"])
+
+        identical = [dict(row) for row in legacy_data] == [dict(row) for row in shared_data]
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Media URL benchmark ({options['items']} items, 2 URLs each)"))
+        self.stdout.write(f"build_absolute_uri per object: {legacy_time * 1000:8.2f} ms")
+        self.stdout.write(f"shared media base:             {shared_time * 1000:8.2f} ms")
+        self.stdout.write(f"speedup: {legacy_time / shared_time:.2f}x, identical output: {'yes' if identical else 'NO'}")
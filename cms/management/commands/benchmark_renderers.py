@@ -0,0 +1,68 @@
+"""Compare the stock DRF JSON renderer with the orjson renderer on real API output."""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import ORJSONRenderer, orjson
+
+
+# (label, path, query) — the large list endpoints
+ENDPOINTS = [
+    ("countries_list", "/api/cms/countries/", {}),
+    ("blog_posts_list", "/api/cms/blog/", {}),
+    ("blog_posts_list?locale=fr", "/api/cms/blog/", {"locale": "fr"}),
+    ("destinations_list", "/api/cms/destinations/", {}),
+]
+
+
+def serialized_data(path, query):
+    """Run the view and return the serializer output it would render."""
+    request = RequestFactory().get(path, query, HTTP_HOST="localhost")
+    with override_settings(ALLOWED_HOSTS=["localhost"]):
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+    return response.data
+
+
+def time_render(renderer, data, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        renderer.render(data)
+    return (time.perf_counter() - start) / iterations
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSONRenderer against ORJSONRenderer on the serializer output of the list endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200, help="Renders per endpoint and renderer")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed (pip install orjson).")
+
+        iterations = options["iterations"]
+        stock, fast = JSONRenderer(), ORJSONRenderer()
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"JSON renderer benchmark ({iterations} renders each)"))
+        self.stdout.write(f"{'endpoint':<28} {'bytes':>10} {'json ms':>9} {'orjson ms':>10} {'speedup':>8}  identical")
+
+        for label, path, query in ENDPOINTS:
+            data = serialized_data(path, query)
+            expected = stock.render(data)
+            identical = fast.render(data) == expected
+
+            stock_time = time_render(stock, data, iterations)
+            fast_time = time_render(fast, data, iterations)
+            speedup = stock_time / fast_time if fast_time else 0
+
+            line = (
+                f"{label:<28} {len(expected):>10} {stock_time * 1000:>9.3f} "
+                f"{fast_time * 1000:>10.3f} {speedup:>7.1f}x  {'yes' if identical else 'NO'}"
+            )
+            self.stdout.write(line if identical else self.style.ERROR(line))
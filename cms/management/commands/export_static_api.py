@@ -0,0 +1,252 @@
+"""
+Export every public cms API response as static, pre-compressed JSON files.
+
+Each (endpoint, query) pair is written to ``<output>/api/cms/<path>/<name>.json``
+plus ``.json.gz`` and ``.json.br`` siblings, where ``<name>`` is ``index`` for
+requests without query parameters and ``<key>-<value>[__<key>-<value>]``
+otherwise (keys sorted), e.g. ``blog/index.json``, ``blog/locale-fr.json``,
+``blog/category-food__locale-fr.json``. nginx can serve them with::
+
+    location /api/cms/ {
+        root /srv/static_api;
+        gzip_static on;
+        brotli_static on;
+        try_files $uri/$static_api_name.json =404;
+    }
+
+where ``$static_api_name`` is mapped from ``$args`` the same way.
+
+After every run the ``api/cms/`` tree holds exactly the files of this export:
+anything else in it (deleted or unpublished content, ``.br`` files when brotli
+is no longer installed) is removed. ``--incremental`` only skips responses
+whose hash is unchanged and whose files are still on disk.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve
+
+from cms.models import (
+    Page, Country, City, Destination, BlogCategory, BlogPost, SUPPORTED_LOCALES,
+)
+from cms.workers import setup_django
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+API_PREFIX = "/api/cms/"
+MANIFEST_NAME = ".manifest.json"
+BATCH_SIZE = 50
+
+
+def export_filename(query: dict) -> str:
+    if not query:
+        return "index.json"
+    return "__".join(f"{key}-{query[key]}" for key in sorted(query)) + ".json"
+
+
+def build_jobs() -> list:
+    """List every (path, query) pair the public site can request."""
+    locales = [code for code, _ in SUPPORTED_LOCALES]
+    locale_variants = [{}] + [{"locale": locale} for locale in locales]
+    jobs = []
+
+    def add(path, queries):
+        jobs.extend((API_PREFIX + path, query) for query in queries)
+
+    for slug in Page.objects.filter(is_published=True).values_list("slug", flat=True):
+        add(f"pages/{slug}/", locale_variants)
+
+    add("countries/", [{}])
+    add("cities/", [{}])
+    add("destinations/", [{}])
+    for slug in Country.objects.filter(is_published=True).values_list("slug", flat=True):
+        add("cities/", [{"country": slug}])
+        add("destinations/", [{"country": slug}])
+    for slug in City.objects.filter(is_published=True).values_list("slug", flat=True).distinct():
+        add("destinations/", [{"city": slug}])
+    for slug in Destination.objects.filter(is_published=True).values_list("slug", flat=True).distinct():
+        add(f"destinations/{slug}/", locale_variants)
+
+    add("blog/", locale_variants)
+    add("blog/categories/", [{}])
+    for slug in BlogCategory.objects.filter(is_published=True).values_list("slug", flat=True):
+        add("blog/", [dict(query, category=slug) for query in locale_variants])
+        add(f"blog/category/{slug}/", locale_variants)
+    for slug in BlogPost.objects.filter(is_published=True).values_list("slug", flat=True):
+        add(f"blog/{slug}/", locale_variants)
+
+    add("navigation/", [{}] + locale_variants[1:])
+    add("footer/", [{}] + locale_variants[1:])
+    add("homepage-categories/", [{}] + locale_variants[1:])
+    return jobs
+
+
+def _write_atomic(path: str, content: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(content)
+    os.replace(tmp_path, path)
+
+
+def _output_files(target: str, use_brotli: bool) -> list:
+    return [target, f"{target}.gz"] + ([f"{target}.br"] if use_brotli else [])
+
+
+def remove_stale_files(output_dir: str, manifest: dict, use_brotli: bool) -> int:
+    """
+    Delete every file under ``<output>/api/cms/`` that this export did not
+    produce, and the directories left empty.
+
+    Returns:
+        The number of files removed.
+    """
+    expected = {
+        path
+        for relative_path in manifest
+        for path in _output_files(os.path.join(output_dir, relative_path), use_brotli)
+    }
+    removed = 0
+    api_root = os.path.join(output_dir, API_PREFIX.strip("/"))
+    for directory, _, filenames in os.walk(api_root, topdown=False):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            if path not in expected:
+                os.remove(path)
+                removed += 1
+        if directory != api_root and not os.listdir(directory):
+            os.rmdir(directory)
+    return removed
+
+
+def render_batch(batch, output_dir, base_url, known_hashes, use_brotli):
+    """
+    Render a batch of jobs in a worker process and write the changed files.
+
+    Returns:
+        A list of ``(relative_path, sha256, status)`` with status ``written``,
+        ``unchanged`` or ``error:<code>``.
+    """
+    origin = urlsplit(base_url)
+    factory = RequestFactory()
+    results = []
+
+    with override_settings(ALLOWED_HOSTS=[origin.hostname]):
+        for path, query in batch:
+            relative_path = os.path.join(path.strip("/"), export_filename(query))
+            request = factory.get(path, query, HTTP_HOST=origin.netloc, secure=origin.scheme == "https")
+            # LocaleMiddleware is skipped, so use the site default like a request without Accept-Language
+            request.LANGUAGE_CODE = settings.LANGUAGE_CODE
+
+            match = resolve(path)
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, "render"):
+                response.render()
+
+            if response.status_code != 200:
+                results.append((relative_path, None, f"error:{response.status_code}"))
+                continue
+
+            content = response.content
+            digest = hashlib.sha256(content).hexdigest()
+            target = os.path.join(output_dir, relative_path)
+            if known_hashes.get(relative_path) == digest and all(
+                os.path.exists(path) for path in _output_files(target, use_brotli)
+            ):
+                results.append((relative_path, digest, "unchanged"))
+                continue
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _write_atomic(target, content)
+            _write_atomic(f"{target}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+            if use_brotli:
+                _write_atomic(f"{target}.br", brotli.compress(content, quality=11))
+            results.append((relative_path, digest, "written"))
+
+    connections.close_all()
+    return results
+
+
+class Command(BaseCommand):
+    help = "Export all public cms API responses for every locale as static gzip/brotli JSON files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=str(settings.BASE_DIR / "static_api"),
+            help="Target directory (default: <project>/static_api)",
+        )
+        parser.add_argument(
+            "--base-url",
+            default="http://localhost:8000",
+            help="Public API origin used for absolute media URLs",
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel worker processes")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only rewrite files whose content hash changed or that are missing on disk",
+        )
+
+    def handle(self, *args, **options):
+        output_dir = os.path.abspath(options["output"])
+        manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        os.makedirs(output_dir, exist_ok=True)
+
+        known_hashes = {}
+        if options["incremental"] and os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as handle:
+                known_hashes = json.load(handle)
+
+        if brotli is None:
+            self.stdout.write(self.style.WARNING("brotli is not installed, writing gzip only (pip install brotli)."))
+
+        jobs = build_jobs()
+        batches = [jobs[i:i + BATCH_SIZE] for i in range(0, len(jobs), BATCH_SIZE)]
+        self.stdout.write(f"Exporting {len(jobs)} responses with {options['workers']} workers...")
+
+        # Workers must open their own database connections
+        connections.close_all()
+
+        manifest = {}
+        counts = {"written": 0, "unchanged": 0, "errors": 0}
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=setup_django, initargs=(settings.SETTINGS_MODULE,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    render_batch, batch, output_dir, options["base_url"], known_hashes, brotli is not None
+                )
+                for batch in batches
+            ]
+            for future in futures:
+                for relative_path, digest, status in future.result():
+                    if status.startswith("error"):
+                        counts["errors"] += 1
+                        self.stdout.write(self.style.WARNING(f"  {relative_path}: {status}"))
+                        continue
+                    manifest[relative_path] = digest
+                    counts[status] += 1
+
+        removed = remove_stale_files(output_dir, manifest, brotli is not None)
+        _write_atomic(manifest_path, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {counts['written']} written, {counts['unchanged']} unchanged, "
+                f"{removed} stale files removed, {counts['errors']} errors."
+            )
+        )
@@ -0,0 +1,81 @@
+"""Backfill width, height, format, dominant colour and blurhash of stored images."""
+
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from cms.images import extract_from_storage
+from cms.models import (
+    BlogPostHeroSlide, BlogPostSection, ContentSnapshot, DestinationHeroSlide, DestinationSection,
+    MediaFile, PageHeroSlide, PageSection,
+)
+from cms.snapshots import rebuild_snapshots
+from cms.workers import setup_django
+
+
+MODELS = (MediaFile, PageSection, PageHeroSlide, DestinationSection, DestinationHeroSlide, BlogPostSection, BlogPostHeroSlide)
+METADATA_FIELDS = ["image_width", "image_height", "image_format", "dominant_color", "blurhash"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract image metadata for images stored before it was recorded on upload. "
+        "Files are decoded in a process pool; each distinct file is read once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Also re-read images that already have metadata")
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes decoding images")
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows per bulk update")
+        parser.add_argument("--no-snapshots", action="store_true", help="Do not rebuild the detail API snapshots")
+
+    def handle(self, *args, **options):
+        # file name -> [(model, pk)], so images shared by several rows are decoded once
+        pending = defaultdict(list)
+        for model in MODELS:
+            field = model.image_field_name
+            rows = model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+            if not options["force"]:
+                rows = rows.filter(image_width__isnull=True)
+            for pk, name in rows.values_list("pk", field):
+                pending[name].append((model, pk))
+
+        if not pending:
+            self.stdout.write(self.style.SUCCESS("All images have metadata."))
+            return
+        self.stdout.write(f"Reading {len(pending)} files with {options['workers']} workers...")
+
+        updates = defaultdict(list)
+        updated = unreadable = 0
+        # Forked workers must not inherit (and later close) the open database connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=setup_django, initargs=(settings.SETTINGS_MODULE,)
+        ) as pool:
+            results = list(pool.map(extract_from_storage, pending, chunksize=16))
+
+        for name, metadata in results:
+            if metadata is None:
+                unreadable += 1
+                continue
+            updated += len(pending[name])
+            for model, pk in pending[name]:
+                instance = model(pk=pk)
+                instance.set_image_metadata(metadata)
+                updates[model].append(instance)
+
+        for model, instances in updates.items():
+            model.objects.bulk_update(instances, METADATA_FIELDS, batch_size=options["batch_size"])
+
+        self.stdout.write(f"Updated {updated} rows, {unreadable} files unreadable.")
+
+        # bulk_update sends no signals, so the snapshots still lack the new fields
+        if not options["no_snapshots"]:
+            for content_type in ContentSnapshot.ContentType.values:
+                written = rebuild_snapshots(content_type)
+                self.stdout.write(f"Rebuilt {written} {content_type} snapshots")
+        self.stdout.write(self.style.SUCCESS("Image metadata is up to date."))
@@ -0,0 +1,94 @@
+"""Compare throughput and tail latency of the cms read views under WSGI and ASGI."""
+
+import asyncio
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+
+DEFAULT_PATHS = [
+    "/api/cms/pages/about/?locale=en",
+    "/api/cms/destinations/lisbon/?locale=en",
+    "/api/cms/navigation/?locale=en",
+    "/api/cms/footer/?locale=en",
+    "/api/cms/resolve-translation/?content_type=page&slug=about&locale=fr",
+]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the cms read endpoints on a WSGI and an ASGI deployment with the same "
+        "number of concurrent connections and report requests/sec and p50/p99 latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wsgi-url", default="http://127.0.0.1:8000", help="Backend served by gunicorn (backend.wsgi)"
+        )
+        parser.add_argument(
+            "--asgi-url", default="http://127.0.0.1:8001", help="Backend served by uvicorn (backend.asgi)"
+        )
+        parser.add_argument("--connections", type=int, default=1000, help="Concurrent connections per target")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to load each target")
+        parser.add_argument("--path", action="append", dest="paths", help="API path to request (repeatable)")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or DEFAULT_PATHS
+        targets = [("wsgi", options["wsgi_url"]), ("asgi", options["asgi_url"])]
+
+        results = {}
+        for name, base_url in targets:
+            self.stdout.write(f"Loading {name} at {base_url} ...")
+            results[name] = asyncio.run(
+                self._run_clients(base_url, paths, options["connections"], options["duration"])
+            )
+            if not results[name]["latencies"]:
+                raise CommandError(f"No request to {base_url} completed; is it running?")
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"ASGI vs WSGI ({options['connections']} connections, {options['duration']:.0f}s each)"
+            )
+        )
+        self.stdout.write(f"{'':6} {'requests/sec':>13} {'p50 ms':>9} {'p99 ms':>9} {'errors':>8}")
+        for name, _ in targets:
+            stats = results[name]
+            latencies = sorted(stats["latencies"])
+            self.stdout.write(
+                f"{name:6} {len(latencies) / options['duration']:13.1f} "
+                f"{percentile(latencies, 0.50) * 1000:9.1f} {percentile(latencies, 0.99) * 1000:9.1f} "
+                f"{stats['errors']:8d}"
+            )
+
+    async def _run_clients(self, base_url, paths, connections, duration):
+        stats = {"latencies": [], "errors": 0}
+        deadline = time.monotonic() + duration
+        limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+            async def worker(offset):
+                index = offset
+                while time.monotonic() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        response = await client.get(paths[index % len(paths)])
+                        if response.status_code >= 500:
+                            stats["errors"] += 1
+                        else:
+                            stats["latencies"].append(time.perf_counter() - start)
+                    except httpx.HTTPError:
+                        stats["errors"] += 1
+                    index += 1
+
+            await asyncio.gather(*(worker(i) for i in range(connections)))
+
+        return stats
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from cms.media_folders import library_totals, rebuild_folder_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the media library totals per folder (after bulk changes that bypass MediaFile.save)"
+
+    def handle(self, *args, **options):
+        folders = rebuild_folder_stats()
+        totals = library_totals()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {folders} folders: {totals['files']} files, {totals['bytes']} bytes.")
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from cms.models import ContentSnapshot
+from cms.snapshots import rebuild_snapshots
+
+
+class Command(BaseCommand):
+    help = "Backfill the pre-rendered public API snapshots for pages, destinations and blog posts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            choices=ContentSnapshot.ContentType.values,
+            action="append",
+            dest="types",
+            help="Only rebuild this content type (repeatable). Defaults to all.",
+        )
+
+    def handle(self, *args, **options):
+        for content_type in options["types"] or ContentSnapshot.ContentType.values:
+            written = rebuild_snapshots(content_type)
+            self.stdout.write(f"Rebuilt {written} {content_type} snapshots")
+
+        self.stdout.write(self.style.SUCCESS("Snapshots are up to date."))
@@ -0,0 +1,167 @@
+"""Get the country and blog post hero images into the media storage and onto their rows."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from cms.content_images import (
+    BLOG_POST, COPIED, COUNTRY, EXISTING, GENERATED, PLACEHOLDER, STUB,
+    Manifest, blog_post_jobs, country_jobs,
+)
+from cms.images import render_placeholder
+from cms.models import BlogPost, ContentSnapshot, Country, Destination
+from cms.snapshots import rebuild_snapshots
+from core.ai import generate_image
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the hero images listed in countries_images.json and the blog story files, "
+        "then point the countries and blog posts at them. Existing files are kept, images "
+        "in frontend/public are copied, country images are generated (--stub renders "
+        "placeholders instead) and the rest get placeholders. Resumable: finished images "
+        "are recorded in a manifest and skipped by the next run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", choices=["countries", "blog"], help="Only handle these images")
+        parser.add_argument(
+            "--countries-file", default=str(Path(settings.BASE_DIR) / "countries_images.json"),
+            help="Country slugs, image file names and prompts",
+        )
+        parser.add_argument(
+            "--blog-file", action="append", dest="blog_files",
+            help="Blog story file with slug, title and hero_image (repeatable; default content/travel-stories-pt1.json)",
+        )
+        parser.add_argument(
+            "--manifest", default=str(Path(settings.BASE_DIR) / ".content-images.jsonl"),
+            help="Progress file that makes the run resumable (kept out of MEDIA_ROOT, which is served)",
+        )
+        parser.add_argument("--stub", action="store_true", help="Render placeholders instead of calling the image API")
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes rendering placeholders")
+        parser.add_argument("--concurrency", type=int, default=4, help="Image API calls in flight at once")
+
+    def handle(self, *args, **options):
+        manifest = Manifest(options["manifest"])
+        stub = options["stub"]
+
+        jobs = []
+        if options["only"] in (None, "countries"):
+            jobs += country_jobs(options["countries_file"])
+        if options["only"] in (None, "blog"):
+            blog_files = options["blog_files"] or [str(Path(settings.BASE_DIR) / "content" / "travel-stories-pt1.json")]
+            for path in blog_files:
+                jobs += blog_post_jobs(path)
+
+        copy, render, generate = [], [], []
+        done = 0
+        for job in jobs:
+            entry = manifest.get(job.name)
+            replaces_stub = entry is not None and entry["source"] == STUB and job.prompt and not stub
+            if entry is not None and not entry["error"] and not replaces_stub:
+                # The manifest lives outside the storage: redo an image that has since gone
+                if default_storage.exists(entry["stored_name"]):
+                    done += 1
+                    continue
+            if (entry is None or not entry["stored_name"]) and default_storage.exists(job.name):
+                # Uploaded or left by the old scripts: never overwrite it
+                manifest.record(job, EXISTING, job.name)
+                done += 1
+                continue
+            if job.local_source() is not None:
+                copy.append(job)
+            elif job.prompt and not stub:
+                generate.append(job)
+            else:
+                render.append(job)
+
+        if generate and not os.getenv("OPENAI_API_KEY"):
+            raise CommandError(
+                f"{len(generate)} images need generating but OPENAI_API_KEY is not set; "
+                "use --stub to render placeholders instead."
+            )
+        self.stdout.write(
+            f"{done} images already stored; copying {len(copy)}, generating {len(generate)}, "
+            f"rendering {len(render)} placeholders"
+        )
+
+        failed = 0
+        for job in copy:
+            self._store(manifest, job, COPIED, job.local_source().read_bytes())
+
+        if render or generate:
+            if render:
+                # Forked workers must not inherit (and later close) the open database connections
+                connections.close_all()
+            with ProcessPoolExecutor(max_workers=options["workers"]) as renderers, \
+                    ThreadPoolExecutor(max_workers=options["concurrency"]) as generators:
+                futures = {
+                    renderers.submit(render_placeholder, job.title, job.size): (job, STUB if job.prompt else PLACEHOLDER)
+                    for job in render
+                }
+                futures.update({generators.submit(generate_image, job.prompt): (job, GENERATED) for job in generate})
+                for future in as_completed(futures):
+                    job, source = futures[future]
+                    try:
+                        content = future.result()
+                    except Exception as error:
+                        failed += 1
+                        manifest.record(job, source, error=str(error))
+                        self.stderr.write(f"{job.name}: {error}")
+                        continue
+                    self._store(manifest, job, source, content)
+
+        countries, posts = self._update_rows(manifest, options["only"])
+        self.stdout.write(f"Updated {countries} countries and {posts} blog posts")
+        if failed:
+            raise CommandError(f"{failed} images failed; run the command again to retry them.")
+        self.stdout.write(self.style.SUCCESS("Content images are up to date."))
+
+    def _store(self, manifest, job, source, content):
+        entry = manifest.get(job.name)
+        if entry is not None and entry["stored_name"]:
+            default_storage.delete(entry["stored_name"])
+        stored_name = default_storage.save(job.name, ContentFile(content))
+        manifest.record(job, source, stored_name)
+        self.stdout.write(f"[{source}] {stored_name}")
+
+    def _update_rows(self, manifest, only):
+        now = timezone.now()
+        countries, posts = [], []
+
+        if only in (None, "countries"):
+            names = manifest.stored(COUNTRY)
+            for country in Country.objects.filter(slug__in=names).only("pk", "slug", "hero_image"):
+                if country.hero_image.name != names[country.slug]:
+                    country.hero_image = names[country.slug]
+                    country.updated_at = now
+                    countries.append(country)
+
+        if only in (None, "blog"):
+            names = manifest.stored(BLOG_POST)
+            for post in BlogPost.objects.filter(slug__in=names).only("pk", "slug", "hero_image"):
+                current = (post.hero_image.name or "").lstrip("/")
+                # Only fill in missing images (or the story file's "/images/..." form), never replace an upload
+                if current in ("", names[post.slug].lstrip("/")) and post.hero_image.name != names[post.slug]:
+                    post.hero_image = names[post.slug]
+                    post.updated_at = now
+                    posts.append(post)
+
+        with transaction.atomic():
+            Country.objects.bulk_update(countries, ["hero_image", "updated_at"])
+            BlogPost.objects.bulk_update(posts, ["hero_image", "updated_at"])
+
+        # bulk_update sends no signals: refresh the snapshots that embed these images
+        if countries:
+            destination_ids = Destination.objects.filter(city__country__in=countries).values_list("pk", flat=True)
+            rebuild_snapshots(ContentSnapshot.ContentType.DESTINATION, destination_ids)
+        if posts:
+            rebuild_snapshots(ContentSnapshot.ContentType.BLOG_POST, [post.pk for post in posts])
+        return len(countries), len(posts)
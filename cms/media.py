@@ -0,0 +1,47 @@
+"""
+Absolute media URLs for the cms serializers.
+
+``request.build_absolute_uri(field.url)`` parses the host and scheme and asks
+the storage for a URL on every image of every object. For files on the
+default ``FileSystemStorage`` the URL is always ``<media base><quoted name>``,
+so the base is computed once per request (or taken from
+``settings.MEDIA_BASE_URL``, e.g. a CDN origin) and names are appended to it.
+"""
+
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+
+
+def media_base_url(request) -> str:
+    """The absolute URL media names are appended to, memoized on the request."""
+    configured = getattr(settings, "MEDIA_BASE_URL", "")
+    if configured:
+        return configured.rstrip("/") + "/"
+    if request is None:
+        return settings.MEDIA_URL
+
+    base = getattr(request, "_media_base_url", None)
+    if base is None:
+        base = request.build_absolute_uri(settings.MEDIA_URL)
+        request._media_base_url = base
+    return base
+
+
+def media_url(file, request=None) -> Optional[str]:
+    """
+    Absolute URL of a ``FieldFile``, or None when the field is empty.
+
+    Args:
+        file: The ``FileField``/``ImageField`` value.
+        request: The serializer context request; relative URLs are returned without one.
+    """
+    if not file:
+        return None
+    storage = file.storage
+    if not isinstance(storage, FileSystemStorage) or storage.base_url != settings.MEDIA_URL:
+        # Remote storages build their own (possibly signed) URLs
+        return request.build_absolute_uri(file.url) if request is not None else file.url
+    return media_base_url(request) + filepath_to_uri(file.name).lstrip("/")
@@ -0,0 +1,105 @@
+"""
+Running totals of the media library per folder.
+
+Every ``MediaFile`` counts towards its folder and each folder above it, up to
+the root (``""``), so the ``MediaFolderStats`` row of a folder holds the
+number and size of all files below it and the root row holds the library
+totals. ``MediaFile.save`` moves a file's contribution when it is added,
+moved or resized, and the ``post_delete`` receiver in ``cms.signals``
+removes it. Both are F() updates, so concurrent uploads do not lose counts,
+and ``save`` holds the file's row lock while it moves the contribution.
+
+Queryset ``update``/``bulk_create``/raw SQL bypass these hooks; run
+``manage.py rebuild_media_folder_stats`` after such bulk changes.
+"""
+
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+
+def folder_prefixes(folder: str) -> list:
+    """``"uploads/blog/"`` -> ``["", "uploads/", "uploads/blog/"]``."""
+    prefixes = [""]
+    for segment in folder.strip("/").split("/"):
+        if segment:
+            prefixes.append(f"{prefixes[-1]}{segment}/")
+    return prefixes
+
+
+def add_to_folder(folder: str, files: int, size: int) -> None:
+    """Add ``files`` and ``size`` bytes (negative to remove) to ``folder`` and every folder above it."""
+    from cms.models import MediaFolderStats
+
+    prefixes = folder_prefixes(folder)
+    with transaction.atomic():
+        MediaFolderStats.objects.bulk_create(
+            [MediaFolderStats(folder=prefix) for prefix in prefixes], ignore_conflicts=True
+        )
+        MediaFolderStats.objects.filter(folder__in=prefixes).update(
+            files=F("files") + files, bytes=F("bytes") + size
+        )
+        if files < 0:
+            MediaFolderStats.objects.filter(folder__in=prefixes, files__lte=0).exclude(folder="").delete()
+
+
+def move_in_folders(stored: Optional[tuple], current: Optional[tuple]) -> None:
+    """Move a file's contribution from its stored ``(folder, size)`` to its current one (None: not counted)."""
+    if stored == current:
+        return
+    if stored is not None:
+        add_to_folder(stored[0], -1, -(stored[1] or 0))
+    if current is not None:
+        add_to_folder(current[0], 1, current[1] or 0)
+
+
+@transaction.atomic
+def rebuild_folder_stats() -> int:
+    """Recompute every ``MediaFolderStats`` row from the ``MediaFile`` table; returns the number of folders."""
+    from cms.models import MediaFile, MediaFolderStats
+
+    totals = {"": [0, 0]}
+    for row in MediaFile.objects.order_by().values("folder").annotate(count=Count("id"), size=Sum("file_size")):
+        for prefix in folder_prefixes(row["folder"]):
+            entry = totals.setdefault(prefix, [0, 0])
+            entry[0] += row["count"]
+            entry[1] += row["size"] or 0
+
+    MediaFolderStats.objects.all().delete()
+    MediaFolderStats.objects.bulk_create(
+        [MediaFolderStats(folder=folder, files=files, bytes=size) for folder, (files, size) in totals.items()]
+    )
+    return len(totals)
+
+
+def library_totals() -> dict:
+    """``{"files", "bytes"}`` of the whole library, from the root row."""
+    from cms.models import MediaFolderStats
+
+    root = MediaFolderStats.objects.filter(folder="").values("files", "bytes").first()
+    return root or {"files": 0, "bytes": 0}
+
+
+def folder_tree(folder: str = "") -> Optional[dict]:
+    """
+    The folder and its subfolders as nested ``{"name", "path", "files", "bytes", "children"}``
+    nodes, children sorted by name; None when a folder other than the root holds no files.
+    """
+    from cms.models import MediaFolderStats
+
+    path = folder_prefixes(folder)[-1]
+    rows = MediaFolderStats.objects.filter(folder__startswith=path).values_list("folder", "files", "bytes")
+
+    nodes = {}
+    for row_path, files, size in sorted(rows):
+        name = row_path.rstrip("/").rsplit("/", 1)[-1]
+        nodes[row_path] = {"name": name, "path": row_path, "files": files, "bytes": size, "children": []}
+    for row_path, node in nodes.items():
+        if row_path != path:
+            parent = nodes.get(folder_prefixes(row_path)[-2])
+            if parent is not None:
+                parent["children"].append(node)
+    if path == "" and path not in nodes:
+        return {"name": "", "path": "", "files": 0, "bytes": 0, "children": []}
+    return nodes.get(path)
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.14 on 2026-10-19 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0010_destination_category_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentSnapshot',
+            fields=[
+                ('key', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('content_type', models.CharField(choices=[('page', 'Page'), ('destination', 'Destination'), ('blog_post', 'Blog Post')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField(help_text='Primary key of the source Page/Destination/BlogPost')),
+                ('locale', models.CharField(blank=True, help_text='Empty for requests without a locale', max_length=5)),
+                ('payload', models.TextField(help_text='Rendered JSON response body')),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Content Snapshot',
+                'verbose_name_plural': 'Content Snapshots',
+                'ordering': ['key'],
+                'indexes': [models.Index(fields=['content_type', 'object_id'], name='cms_content_content_124e13_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.14 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+def fill_resolved_href(apps, schema_editor):
+    NavigationMenuItem = apps.get_model("cms", "NavigationMenuItem")
+
+    items = list(NavigationMenuItem.objects.select_related("page", "destination", "blog_category"))
+    for item in items:
+        if item.url:
+            item.resolved_href = item.url
+        elif item.page:
+            item.resolved_href = f"/{item.locale}/{item.page.slug}/"
+        elif item.destination:
+            item.resolved_href = f"/{item.locale}/destinations/{item.destination.slug}/"
+        elif item.blog_category:
+            item.resolved_href = f"/{item.locale}/blog/category/{item.blog_category.slug}/"
+        else:
+            item.resolved_href = "#"
+    NavigationMenuItem.objects.bulk_update(items, ["resolved_href"])
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0011_contentsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='navigationmenuitem',
+            name='resolved_href',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name='navigationmenuitem',
+            index=models.Index(fields=['locale', 'is_active', 'order', 'label'], name='cms_nav_locale_active_idx'),
+        ),
+        migrations.RunPython(fill_resolved_href, noop),
+    ]
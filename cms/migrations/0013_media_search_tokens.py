@@ -0,0 +1,97 @@
+# Generated by Django 5.1.14 on 2026-10-19 00:55
+
+import os
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copies of cms.search as of this migration, so later changes to the
+# tokenizer do not change what this migration does
+
+MAX_TOKEN_LENGTH = 64
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return [word[:MAX_TOKEN_LENGTH] for word in _WORD.findall(stripped)]
+
+
+def media_tokens(name, file_name):
+    return set(tokenize(name)) | set(tokenize(file_name))
+
+
+def media_folder(file_name):
+    folder = os.path.dirname(file_name)
+    return f"{folder}/" if folder else ""
+
+
+def index_media_files(apps, schema_editor):
+    MediaFile = apps.get_model("cms", "MediaFile")
+    MediaSearchToken = apps.get_model("cms", "MediaSearchToken")
+
+    files = list(MediaFile.objects.only("id", "name", "file"))
+    for media in files:
+        media.folder = media_folder(media.file.name or "")
+    MediaFile.objects.bulk_update(files, ["folder"], batch_size=500)
+    MediaSearchToken.objects.bulk_create(
+        [
+            MediaSearchToken(media_id=media.id, token=token)
+            for media in files
+            for token in sorted(media_tokens(media.name, media.file.name or ""))
+        ],
+        batch_size=500,
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0012_navigationmenuitem_resolved_href'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='folder',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='mediafile',
+            index=models.Index(fields=['-uploaded_at'], name='cms_media_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mediafile',
+            index=models.Index(fields=['folder', '-uploaded_at'], name='cms_media_folder_idx'),
+        ),
+        migrations.AddField(
+            model_name='mediasearchtoken',
+            name='media',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='cms.mediafile'),
+        ),
+        migrations.AddIndex(
+            model_name='mediasearchtoken',
+            index=models.Index(fields=['token', 'media'], name='cms_media_token_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='mediasearchtoken',
+            constraint=models.UniqueConstraint(fields=('media', 'token'), name='cms_media_token_unique'),
+        ),
+        migrations.RunPython(index_media_files, noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.14 on 2026-10-19 00:58
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+# Frozen copy of cms.media_folders.folder_prefixes as of this migration
+def folder_prefixes(folder):
+    prefixes = [""]
+    for segment in folder.strip("/").split("/"):
+        if segment:
+            prefixes.append(f"{prefixes[-1]}{segment}/")
+    return prefixes
+
+
+def fill_folder_stats(apps, schema_editor):
+    MediaFile = apps.get_model("cms", "MediaFile")
+    MediaFolderStats = apps.get_model("cms", "MediaFolderStats")
+
+    totals = {"": [0, 0]}
+    for row in MediaFile.objects.order_by().values("folder").annotate(count=Count("id"), size=Sum("file_size")):
+        for prefix in folder_prefixes(row["folder"]):
+            entry = totals.setdefault(prefix, [0, 0])
+            entry[0] += row["count"]
+            entry[1] += row["size"] or 0
+    MediaFolderStats.objects.bulk_create(
+        [MediaFolderStats(folder=folder, files=files, bytes=size) for folder, (files, size) in totals.items()]
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0013_media_search_tokens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaFolderStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('folder', models.CharField(help_text='Folder path with a trailing slash; "" is the whole library', max_length=255, unique=True)),
+                ('files', models.BigIntegerField(default=0)),
+                ('bytes', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Media Folder Stats',
+                'verbose_name_plural': 'Media Folder Stats',
+                'ordering': ['folder'],
+            },
+        ),
+        migrations.RunPython(fill_folder_stats, noop),
+    ]
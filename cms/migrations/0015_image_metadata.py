@@ -0,0 +1,188 @@
+# Generated by Django 5.1.14 on 2026-10-19 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0014_media_folder_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpostheroslide',
+            name='blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='blogpostheroslide',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='#rrggbb', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='blogpostheroslide',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, help_text='e.g. JPEG, PNG, WEBP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='blogpostheroslide',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpostheroslide',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpostsection',
+            name='blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='blogpostsection',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='#rrggbb', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='blogpostsection',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, help_text='e.g. JPEG, PNG, WEBP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='blogpostsection',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpostsection',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='destinationheroslide',
+            name='blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='destinationheroslide',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='#rrggbb', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='destinationheroslide',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, help_text='e.g. JPEG, PNG, WEBP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='destinationheroslide',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='destinationheroslide',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='destinationsection',
+            name='blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='destinationsection',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='#rrggbb', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='destinationsection',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, help_text='e.g. JPEG, PNG, WEBP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='destinationsection',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='destinationsection',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='#rrggbb', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, help_text='e.g. JPEG, PNG, WEBP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pageheroslide',
+            name='blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='pageheroslide',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='#rrggbb', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='pageheroslide',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, help_text='e.g. JPEG, PNG, WEBP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='pageheroslide',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pageheroslide',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pagesection',
+            name='blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='pagesection',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='#rrggbb', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='pagesection',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, help_text='e.g. JPEG, PNG, WEBP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='pagesection',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pagesection',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
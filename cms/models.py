@@ -1,9 +1,13 @@
 import os
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
 
+from cms.images import extract_image_metadata
+from cms.media_folders import move_in_folders
+from cms.search import MAX_TOKEN_LENGTH, media_folder, media_tokens
+
 
 # Supported locales for the project
 SUPPORTED_LOCALES = [
@@ -15,6 +19,70 @@ SUPPORTED_LOCALES = [
 ]
 
 
+class ImageMetadata(models.Model):
+    """
+    Size, format, dominant colour and blurhash of the model's image, so the
+    API can describe an image before it is downloaded (see cms.images).
+    Extracted on save when the file changes; files stored before this was
+    recorded are filled in by ``manage.py extract_image_metadata``.
+    """
+    image_field_name = "image"
+    
+    image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_format = models.CharField(max_length=10, blank=True, editable=False, help_text="e.g. JPEG, PNG, WEBP")
+    dominant_color = models.CharField(max_length=7, blank=True, editable=False, help_text="#rrggbb")
+    blurhash = models.CharField(max_length=100, blank=True, editable=False)
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored file name, so saving an unreadable file does not decode it again
+        stored = instance.__dict__.get(cls._meta.get_field(cls.image_field_name).attname)
+        instance._stored_image_name = getattr(stored, "name", stored)
+        return instance
+
+    def update_image_metadata(self, force: bool = False) -> bool:
+        """Refresh the metadata from the image file; returns whether it was read."""
+        file = getattr(self, self.image_field_name)
+        if not file:
+            self.set_image_metadata(None)
+            return False
+        unchanged = file.name == getattr(self, "_stored_image_name", None)
+        if not force and file._committed and (unchanged or self.image_width is not None):
+            return False
+
+        if file._committed:
+            with file.open("rb"):
+                metadata = extract_image_metadata(file)
+        else:
+            # A new upload: rewind it for the storage
+            metadata = extract_image_metadata(file)
+            file.seek(0)
+        self.set_image_metadata(metadata)
+        return metadata is not None
+
+    def set_image_metadata(self, metadata) -> None:
+        metadata = metadata or {}
+        self.image_width = metadata.get("image_width")
+        self.image_height = metadata.get("image_height")
+        self.image_format = metadata.get("image_format", "")
+        self.dominant_color = metadata.get("dominant_color", "")
+        self.blurhash = metadata.get("blurhash", "")
+    
+    def save(self, *args, **kwargs):
+        try:
+            self.update_image_metadata()
+        except (OSError, ValueError):
+            # A missing or unreadable file must not prevent saving the rest
+            self.set_image_metadata(None)
+        super().save(*args, **kwargs)
+        self._stored_image_name = getattr(self, self.image_field_name).name
+
+
 class Page(models.Model):
     class PageType(models.TextChoices):
         HOME = "home", "Home"
@@ -76,7 +144,7 @@ class PageTranslation(models.Model):
             raise ValidationError({"locale": "Locale must match supported site languages."})
 
 
-class PageSection(models.Model):
+class PageSection(ImageMetadata):
     SECTION_TYPES = [
         ("text", "Text Block"),
         ("image", "Image Block"), 
@@ -233,7 +301,7 @@ class DestinationTranslation(models.Model):
             raise ValidationError({"locale": "Locale must match supported site languages."})
 
 
-class DestinationSection(models.Model):
+class DestinationSection(ImageMetadata):
     SECTION_TYPES = [
         ("text", "Text Block"),
         ("image", "Image Block"),
@@ -326,7 +394,7 @@ class BlogPostTranslation(models.Model):
             raise ValidationError({"locale": "Locale must match supported site languages."})
 
 
-class BlogPostSection(models.Model):
+class BlogPostSection(ImageMetadata):
     SECTION_TYPES = [
         ("text", "Text Block"),
         ("image", "Image Block"),
@@ -353,7 +421,7 @@ class BlogPostSection(models.Model):
 
 # Hero Slide Models for Multi-Image Carousels
 
-class PageHeroSlide(models.Model):
+class PageHeroSlide(ImageMetadata):
     translation = models.ForeignKey(PageTranslation, related_name="hero_slides", on_delete=models.CASCADE)
     image = models.ImageField(upload_to="page_hero_slides/", help_text="Hero slide image (recommended: 1920x800px)")
     caption = models.CharField(max_length=255, blank=True, help_text="Optional caption text overlay")
@@ -368,7 +436,7 @@ class PageHeroSlide(models.Model):
         return f"{self.translation.page.slug} [{self.translation.locale}] - Slide #{self.order}"
 
 
-class DestinationHeroSlide(models.Model):
+class DestinationHeroSlide(ImageMetadata):
     translation = models.ForeignKey(DestinationTranslation, related_name="hero_slides", on_delete=models.CASCADE)
     image = models.ImageField(upload_to="destination_hero_slides/", help_text="Hero slide image (recommended: 1920x800px)")
     caption = models.CharField(max_length=255, blank=True, help_text="Optional caption text overlay")
@@ -383,7 +451,7 @@ class DestinationHeroSlide(models.Model):
         return f"{self.translation.destination.slug} [{self.translation.locale}] - Slide #{self.order}"
 
 
-class BlogPostHeroSlide(models.Model):
+class BlogPostHeroSlide(ImageMetadata):
     translation = models.ForeignKey(BlogPostTranslation, related_name="hero_slides", on_delete=models.CASCADE)
     image = models.ImageField(upload_to="blog_hero_slides/", help_text="Hero slide image (recommended: 1920x800px)")
     caption = models.CharField(max_length=255, blank=True, help_text="Optional caption text overlay")
@@ -398,17 +466,25 @@ class BlogPostHeroSlide(models.Model):
         return f"{self.translation.post.slug} [{self.translation.locale}] - Slide #{self.order}"
 
 
-class MediaFile(models.Model):
+class MediaFile(ImageMetadata):
     """Media file for reusable images across the CMS."""
+    image_field_name = "file"
+    
     file = models.ImageField(upload_to="uploads/")
     name = models.CharField(max_length=255, blank=True, help_text="Display name for this media file")
     uploaded_at = models.DateTimeField(auto_now_add=True)
     file_size = models.PositiveIntegerField(blank=True, null=True, help_text="File size in bytes")
+    # Directory of `file` with a trailing slash, for the indexed folder filter (cms.search)
+    folder = models.CharField(max_length=255, blank=True, editable=False)
     
     class Meta:
         ordering = ["-uploaded_at"]
         verbose_name = "Media File"
         verbose_name_plural = "Media Files"
+        indexes = [
+            models.Index(fields=["-uploaded_at"], name="cms_media_uploaded_idx"),
+            models.Index(fields=["folder", "-uploaded_at"], name="cms_media_folder_idx"),
+        ]
     
     def save(self, *args, **kwargs):
         # Auto-fill name from filename if not provided
@@ -420,8 +496,40 @@ class MediaFile(models.Model):
         # Store file size
         if self.file and hasattr(self.file, 'size'):
             self.file_size = self.file.size
+        
+        # The row stays locked until the folder totals have moved, so two
+        # concurrent saves of one file cannot both move it from the same folder
+        with transaction.atomic():
+            stored = None
+            if self.pk:
+                stored = (
+                    MediaFile.objects.select_for_update().filter(pk=self.pk)
+                    .values("name", "file", "folder", "file_size").first()
+                )
             
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
+            
+            # The stored name (with upload_to) is only known once the file is saved
+            file_name = self.file.name or ""
+            if stored is None or file_name != stored["file"]:
+                folder = media_folder(file_name)
+                if folder != self.folder:
+                    self.folder = folder
+                    MediaFile.objects.filter(pk=self.pk).update(folder=folder)
+            if stored is None or (self.name, file_name) != (stored["name"], stored["file"]):
+                self.update_search_tokens()
+            if stored is not None:
+                stored = (stored["folder"], stored["file_size"])
+            move_in_folders(stored, (self.folder, self.file_size))
+    
+    def update_search_tokens(self):
+        """Replace the MediaSearchToken rows of this file (run by save when the name or file changes)."""
+        tokens = media_tokens(self.name, self.file.name or "")
+        self.search_tokens.exclude(token__in=tokens).delete()
+        existing = set(self.search_tokens.values_list("token", flat=True))
+        MediaSearchToken.objects.bulk_create(
+            [MediaSearchToken(media=self, token=token) for token in sorted(tokens - existing)]
+        )
     
     def thumbnail(self):
         """Return the URL for thumbnail display."""
@@ -443,6 +551,40 @@ class MediaFile(models.Model):
         return f"{self.name} ({self.get_file_size_display()})"
 
 
+class MediaSearchToken(models.Model):
+    """One word of a media file's name or path, for prefix search (see cms.search)."""
+    media = models.ForeignKey(MediaFile, on_delete=models.CASCADE, related_name="search_tokens")
+    token = models.CharField(max_length=MAX_TOKEN_LENGTH)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["media", "token"], name="cms_media_token_unique"),
+        ]
+        indexes = [
+            # Covers the prefix range and the media_id it returns
+            models.Index(fields=["token", "media"], name="cms_media_token_idx"),
+        ]
+    
+    def __str__(self) -> str:
+        return self.token
+
+
+class MediaFolderStats(models.Model):
+    """Number and size of the media files in a folder and its subfolders (see cms.media_folders)."""
+    folder = models.CharField(max_length=255, unique=True, help_text='Folder path with a trailing slash; "" is the whole library')
+    files = models.BigIntegerField(default=0)
+    bytes = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ["folder"]
+        verbose_name = "Media Folder Stats"
+        verbose_name_plural = "Media Folder Stats"
+    
+    def __str__(self) -> str:
+        return self.folder or "/"
+
+
 class NavigationMenuItem(models.Model):
     """Navigation menu item with locale-aware linking to CMS content or external URLs."""
     locale = models.CharField(max_length=5, choices=SUPPORTED_LOCALES)
@@ -457,10 +599,25 @@ class NavigationMenuItem(models.Model):
     order = models.PositiveIntegerField(default=0, help_text="Order in the navigation menu (lower numbers appear first)")
     is_active = models.BooleanField(default=True, help_text="Show this item in the navigation")
     
+    # Denormalized get_url() so the navigation API reads this table alone.
+    # Refreshed on save and when a linked page/destination/category changes (cms.signals);
+    # rows written with bulk_create must set it themselves.
+    resolved_href = models.CharField(max_length=500, blank=True, editable=False)
+    
     class Meta:
         ordering = ["locale", "order", "label"]
         verbose_name = "Navigation Menu Item"
         verbose_name_plural = "Navigation Menu Items"
+        indexes = [
+            models.Index(fields=["locale", "is_active", "order", "label"], name="cms_nav_locale_active_idx"),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.resolved_href = self.get_url()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {"resolved_href"}
+        super().save(*args, **kwargs)
         
     def clean(self):
         """Validate that exactly one linking option is set."""
@@ -588,3 +745,29 @@ class HomepageCategoryTranslation(models.Model):
         supported_locales = {code for code, _ in SUPPORTED_LOCALES}
         if self.locale not in supported_locales:
             raise ValidationError({"locale": "Locale must match supported site languages."})
+
+
+class ContentSnapshot(models.Model):
+    """Pre-rendered public API payload for one content item in one locale."""
+
+    class ContentType(models.TextChoices):
+        PAGE = "page", "Page"
+        DESTINATION = "destination", "Destination"
+        BLOG_POST = "blog_post", "Blog Post"
+
+    # "<content_type>:<slug>:<locale>" so detail views read a single row by primary key
+    key = models.CharField(max_length=200, primary_key=True)
+    content_type = models.CharField(max_length=20, choices=ContentType.choices)
+    object_id = models.PositiveBigIntegerField(help_text="Primary key of the source Page/Destination/BlogPost")
+    locale = models.CharField(max_length=5, blank=True, help_text="Empty for requests without a locale")
+    payload = models.TextField(help_text="Rendered JSON response body")
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["key"]
+        indexes = [models.Index(fields=["content_type", "object_id"])]
+        verbose_name = "Content Snapshot"
+        verbose_name_plural = "Content Snapshots"
+
+    def __str__(self) -> str:
+        return self.key
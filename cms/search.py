@@ -0,0 +1,68 @@
+"""
+Indexed search for the media library.
+
+``icontains`` cannot use an index, so every search scanned the whole
+``MediaFile`` table. Instead each file stores its search tokens (the words
+of its name and of its path, lowercased and without accents) as
+``MediaSearchToken`` rows, and every word of a query must be the prefix of
+one of the file's tokens. A prefix is matched as a range
+(``token >= "par" AND token < "pas"``), which any B-tree index answers on
+both SQLite and PostgreSQL, unlike ``LIKE`` under their default collations.
+
+The folder filter uses the same kind of range on the indexed
+``MediaFile.folder`` column.
+"""
+
+import os
+import re
+import unicodedata
+
+from django.db.models import QuerySet
+
+
+MAX_TOKEN_LENGTH = 64
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list:
+    """Lowercase words of ``text`` without accents: ``"Málaga_Beach-01.jpg"`` -> ``["malaga", "beach", "01", "jpg"]``."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return [word[:MAX_TOKEN_LENGTH] for word in _WORD.findall(stripped)]
+
+
+def media_tokens(name: str, file_name: str) -> set:
+    """Search tokens of a media file: its display name and every segment of its path."""
+    return set(tokenize(name)) | set(tokenize(file_name))
+
+
+def media_folder(file_name: str) -> str:
+    """The folder of a stored file name, with a trailing slash: ``"uploads/hero/"`` (``""`` at the root)."""
+    folder = os.path.dirname(file_name)
+    return f"{folder}/" if folder else ""
+
+
+def prefix_range(prefix: str) -> tuple:
+    """Bounds ``(lower, upper)`` such that ``lower <= value < upper`` exactly when ``value`` starts with ``prefix``."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def search_media(queryset: QuerySet, query: str) -> QuerySet:
+    """Files matching every word of ``query`` by token prefix; a query without words does not filter."""
+    from cms.models import MediaSearchToken
+
+    for word in dict.fromkeys(tokenize(query)):
+        lower, upper = prefix_range(word)
+        matching = MediaSearchToken.objects.filter(token__gte=lower, token__lt=upper).values("media_id")
+        queryset = queryset.filter(pk__in=matching)
+    return queryset
+
+
+def filter_folder(queryset: QuerySet, folder: str) -> QuerySet:
+    """Files in ``folder`` (e.g. ``"uploads/page_hero_slides/"``) and its subfolders."""
+    folder = folder.strip().strip("/")
+    if not folder:
+        return queryset
+    lower, upper = prefix_range(f"{folder}/")
+    return queryset.filter(folder__gte=lower, folder__lt=upper)
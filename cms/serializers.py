@@ -2,6 +2,9 @@ from typing import Optional
 
 from rest_framework import serializers
 
+from cms.fieldsets import SparseFieldsetMixin, translation_lookups
+from cms.media import media_url
+from cms.translations import FALLBACK_LOCALE, Resolution, TranslationResolver
 from cms.models import (
     Page, PageTranslation, PageSection, PageHeroSlide,
     Country, City, Destination, DestinationTranslation, DestinationSection, DestinationHeroSlide,
@@ -11,20 +14,61 @@ from cms.models import (
 )
 
 
+class TranslationResolutionMixin:
+    """
+    Serializes the translation picked for the requested locale.
+
+    The choice (requested -> ``fallback_locale`` -> first) is made once per
+    object and request through ``cms.translations.TranslationResolver``.
+    """
+
+    # Destinations and blog posts have always fallen back to their first translation
+    fallback_locale: Optional[str] = None
+
+    def _get_requested_locale(self) -> Optional[str]:
+        request = self.context.get('request')
+        return getattr(request, 'LANGUAGE_CODE', None) if request else None
+
+    def _resolve(self, obj) -> Resolution:
+        resolver = TranslationResolver.for_request(self.context.get('request'))
+        return resolver.resolve(obj, self._get_requested_locale(), self.fallback_locale)
+
+    def _get_translation(self, obj):
+        if not obj:
+            return None
+        return self._resolve(obj).translation
+
+    def get_translation_missing(self, obj) -> bool:
+        return self._resolve(obj).translation_missing
+
+
+def _published_count(serializer, counts_key: str, obj, related) -> int:
+    """
+    Published rows in ``related`` for ``obj``.
+
+    List views put ``{parent pk: count}`` maps in the serializer context
+    under ``counts_key`` (one grouped query for the whole list); without one
+    the rows are counted per object.
+    """
+    counts = serializer.context.get(counts_key)
+    if counts is not None:
+        return counts.get(obj.pk, 0)
+    return related.filter(is_published=True).count()
+
+
+# Stored per image by cms.images, so the frontend can size and placeholder it before loading
+IMAGE_METADATA_FIELDS = ("image_width", "image_height", "image_format", "dominant_color", "blurhash")
+
+
 class PageSectionSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
 
     class Meta:
         model = PageSection
-        fields = ("id", "section_type", "order", "title", "body", "image", "cta_label", "cta_url")
+        fields = ("id", "section_type", "order", "title", "body", "image", "cta_label", "cta_url") + IMAGE_METADATA_FIELDS
 
     def get_image(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        return media_url(obj.image, self.context.get('request'))
 
 
 class PageHeroSlideSerializer(serializers.ModelSerializer):
@@ -32,15 +76,10 @@ class PageHeroSlideSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PageHeroSlide
-        fields = ("image", "caption", "order")
+        fields = ("image", "caption", "order") + IMAGE_METADATA_FIELDS
 
     def get_image(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        return media_url(obj.image, self.context.get('request'))
 
 
 class PageTranslationSerializer(serializers.ModelSerializer):
@@ -58,23 +97,22 @@ class PageTranslationSerializer(serializers.ModelSerializer):
         )
 
     def get_sections(self, obj):
-        sections = obj.sections.all().order_by('order')
+        # Sections and slides are ordered by "order" in their Meta, and a plain
+        # .all() reuses rows loaded with prefetch_related
+        sections = obj.sections.all()
         return PageSectionSerializer(sections, many=True, context=self.context).data
 
     def get_hero_slides(self, obj):
-        slides = obj.hero_slides.all().order_by('order')
+        slides = obj.hero_slides.all()
         return PageHeroSlideSerializer(slides, many=True, context=self.context).data
 
     def get_hero_image(self, obj):
-        if obj.hero_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.hero_image.url)
-            return obj.hero_image.url
-        return None
+        return media_url(obj.hero_image, self.context.get('request'))
+
 
+class PageDetailSerializer(TranslationResolutionMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    fallback_locale = FALLBACK_LOCALE
 
-class PageDetailSerializer(serializers.ModelSerializer):
     translation = serializers.SerializerMethodField()
     locale = serializers.SerializerMethodField()
     requested_locale = serializers.SerializerMethodField()
@@ -122,110 +160,107 @@ class PageDetailSerializer(serializers.ModelSerializer):
             "translation",
         )
 
-    def _get_translation(self) -> Optional[PageTranslation]:
-        return self.context.get("translation")
+    sparse_dependencies = {
+        "locale": translation_lookups(),
+        "translation_missing": translation_lookups(),
+        "translation": ("translations",),
+        **{
+            name: translation_lookups(name)
+            for name in (
+                "title", "subtitle", "body", "hero_image", "hero_slides", "meta_title", "meta_description",
+                "og_title", "og_description", "og_image", "canonical_url", "seo_enabled", "jsonld_type",
+                "jsonld_override", "sections",
+            )
+        },
+    }
 
     def _get_requested_locale(self) -> Optional[str]:
         return self.context.get("requested_locale")
 
     def get_translation(self, obj: Page):
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         if translation is None:
             return None
         return PageTranslationSerializer(translation).data
 
     def get_locale(self, obj: Page) -> Optional[str]:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.locale if translation else None
 
     def get_requested_locale(self, obj: Page) -> Optional[str]:
         return self._get_requested_locale()
 
     def get_title(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.title if translation else ""
 
     def get_subtitle(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.subtitle if translation else ""
 
     def get_body(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.body if translation else ""
 
     def get_hero_image(self, obj: Page) -> Optional[str]:
-        translation = self._get_translation()
-        if translation and translation.hero_image:
-            # hero_image is an ImageField, so it has a .url attribute
-            if hasattr(translation.hero_image, 'url'):
-                request = self.context.get('request')
-                if request:
-                    return request.build_absolute_uri(translation.hero_image.url)
-                return translation.hero_image.url
-            else:
-                # Fallback in case it's stored as a string
-                return str(translation.hero_image)
-        return None
+        translation = self._get_translation(obj)
+        if translation is None:
+            return None
+        return media_url(translation.hero_image, self.context.get('request'))
 
     def get_meta_title(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.meta_title if translation else ""
 
     def get_hero_slides(self, obj: Page) -> list:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         if translation:
-            slides = translation.hero_slides.all().order_by('order')
+            slides = translation.hero_slides.all()
             return PageHeroSlideSerializer(slides, many=True, context=self.context).data
         return []
 
     def get_sections(self, obj: Page) -> list:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         if translation:
-            sections = translation.sections.all().order_by('order')
+            sections = translation.sections.all()
             return PageSectionSerializer(sections, many=True, context=self.context).data
         return []
 
     def get_meta_description(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.meta_description if translation else ""
 
     def get_og_title(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.og_title if translation else ""
 
     def get_og_description(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.og_description if translation else ""
 
     def get_og_image(self, obj: Page) -> Optional[str]:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         if translation and translation.og_image:
             # og_image is a URLField, so it's already a string
             return str(translation.og_image)
         return None
 
     def get_canonical_url(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.canonical_url if translation else ""
 
     def get_seo_enabled(self, obj: Page) -> bool:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.seo_enabled if translation else False
 
     def get_jsonld_type(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.jsonld_type if translation else ""
 
     def get_jsonld_override(self, obj: Page) -> str:
-        translation = self._get_translation()
+        translation = self._get_translation(obj)
         return translation.jsonld_override if translation else ""
 
-    def get_translation_missing(self, obj: Page) -> bool:
-        requested = self._get_requested_locale()
-        translation = self._get_translation()
-        if not requested:
-            return translation is None
-        return translation is None or translation.locale != requested
 
 
 # Destination serializers
@@ -234,15 +269,10 @@ class DestinationSectionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DestinationSection
-        fields = ("id", "section_type", "order", "title", "body", "image", "cta_label", "cta_url")
+        fields = ("id", "section_type", "order", "title", "body", "image", "cta_label", "cta_url") + IMAGE_METADATA_FIELDS
 
     def get_image(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        return media_url(obj.image, self.context.get('request'))
 
 
 class DestinationHeroSlideSerializer(serializers.ModelSerializer):
@@ -250,18 +280,13 @@ class DestinationHeroSlideSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DestinationHeroSlide
-        fields = ("image", "caption", "order")
+        fields = ("image", "caption", "order") + IMAGE_METADATA_FIELDS
 
     def get_image(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        return media_url(obj.image, self.context.get('request'))
 
 
-class CountrySerializer(serializers.ModelSerializer):
+class CountrySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     hero_image = serializers.SerializerMethodField()
     cities_count = serializers.SerializerMethodField()
     destinations_count = serializers.IntegerField(read_only=True)
@@ -278,15 +303,10 @@ class CountrySerializer(serializers.ModelSerializer):
         )
 
     def get_hero_image(self, obj):
-        if obj.hero_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.hero_image.url)
-            return obj.hero_image.url
-        return None
+        return media_url(obj.hero_image, self.context.get('request'))
 
     def get_cities_count(self, obj):
-        return obj.cities.filter(is_published=True).count()
+        return _published_count(self, "published_cities_counts", obj, obj.cities)
     
     def get_has_content(self, obj):
         destinations_count = getattr(obj, 'destinations_count', 0) or 0
@@ -294,7 +314,7 @@ class CountrySerializer(serializers.ModelSerializer):
         return destinations_count > 0 or stories_count > 0
 
 
-class CitySerializer(serializers.ModelSerializer):
+class CitySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     hero_image = serializers.SerializerMethodField()
     country = CountrySerializer(read_only=True)
     destinations_count = serializers.SerializerMethodField()
@@ -308,15 +328,10 @@ class CitySerializer(serializers.ModelSerializer):
         )
 
     def get_hero_image(self, obj):
-        if obj.hero_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.hero_image.url)
-            return obj.hero_image.url
-        return None
+        return media_url(obj.hero_image, self.context.get('request'))
 
     def get_destinations_count(self, obj):
-        return obj.destinations.filter(is_published=True).count()
+        return _published_count(self, "published_destinations_counts", obj, obj.destinations)
 
 
 class DestinationTranslationSerializer(serializers.ModelSerializer):
@@ -332,23 +347,20 @@ class DestinationTranslationSerializer(serializers.ModelSerializer):
         )
 
     def get_sections(self, obj):
-        sections = obj.sections.all().order_by('order')
+        sections = obj.sections.all()
         return DestinationSectionSerializer(sections, many=True, context=self.context).data
 
     def get_hero_slides(self, obj):
-        slides = obj.hero_slides.all().order_by('order')
+        slides = obj.hero_slides.all()
         return DestinationHeroSlideSerializer(slides, many=True, context=self.context).data
 
     def get_hero_image(self, obj):
-        if obj.destination and obj.destination.hero_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.destination.hero_image.url)
-            return obj.destination.hero_image.url
-        return None
+        if obj.destination is None:
+            return None
+        return media_url(obj.destination.hero_image, self.context.get('request'))
 
 
-class DestinationSerializer(serializers.ModelSerializer):
+class DestinationSerializer(TranslationResolutionMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     hero_image = serializers.SerializerMethodField()
     hero_slides = serializers.SerializerMethodField()
     city = CitySerializer(read_only=True)
@@ -373,25 +385,23 @@ class DestinationSerializer(serializers.ModelSerializer):
             "canonical_url", "seo_enabled", "jsonld_type", "jsonld_override"
         )
 
-    def _get_requested_locale(self) -> Optional[str]:
-        request = self.context.get('request')
-        return getattr(request, 'LANGUAGE_CODE', None) if request else None
-
-    def _get_translation(self, obj):
-        if not obj:
-            return None
-        locale = self._get_requested_locale()
-        if not locale:
-            return obj.translations.first()
-        return obj.translations.filter(locale=locale).first() or obj.translations.first()
+    sparse_dependencies = {
+        "hero_slides": translation_lookups("hero_slides"),
+        "country": ("city__country",),
+        "translations": ("translations", "hero_image"),
+        "locale": translation_lookups(),
+        "title": translation_lookups("title"),
+        "subtitle": translation_lookups("subtitle"),
+        "short_description": translation_lookups("short_description"),
+        "body": translation_lookups("body"),
+        "meta_title": translation_lookups("meta_title"),
+        "meta_description": translation_lookups("meta_description"),
+        "sections": translation_lookups("sections"),
+        "translation_missing": translation_lookups(),
+    }
 
     def get_hero_image(self, obj):
-        if obj.hero_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.hero_image.url)
-            return obj.hero_image.url
-        return None
+        return media_url(obj.hero_image, self.context.get('request'))
 
     def get_translations(self, obj):
         return DestinationTranslationSerializer(obj.translations.all(), many=True, context=self.context).data
@@ -436,22 +446,16 @@ class DestinationSerializer(serializers.ModelSerializer):
         translation = self._get_translation(obj)
         if not translation:
             return []
-        slides = translation.hero_slides.all().order_by('order')
+        slides = translation.hero_slides.all()
         return DestinationHeroSlideSerializer(slides, many=True, context=self.context).data
 
     def get_sections(self, obj: Destination):
         translation = self._get_translation(obj)
         if not translation:
             return []
-        sections = translation.sections.all().order_by('order')
+        sections = translation.sections.all()
         return DestinationSectionSerializer(sections, many=True, context=self.context).data
 
-    def get_translation_missing(self, obj: Destination) -> bool:
-        requested = self._get_requested_locale()
-        translation = self._get_translation(obj)
-        if not requested:
-            return translation is None
-        return translation is None or translation.locale != requested
 
 
 # Blog serializers
@@ -460,15 +464,10 @@ class BlogPostSectionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BlogPostSection
-        fields = ("id", "section_type", "order", "title", "body", "image", "cta_label", "cta_url")
+        fields = ("id", "section_type", "order", "title", "body", "image", "cta_label", "cta_url") + IMAGE_METADATA_FIELDS
 
     def get_image(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        return media_url(obj.image, self.context.get('request'))
 
 
 class BlogPostHeroSlideSerializer(serializers.ModelSerializer):
@@ -476,18 +475,13 @@ class BlogPostHeroSlideSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BlogPostHeroSlide
-        fields = ("image", "caption", "order")
+        fields = ("image", "caption", "order") + IMAGE_METADATA_FIELDS
 
     def get_image(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        return media_url(obj.image, self.context.get('request'))
 
 
-class BlogCategorySerializer(serializers.ModelSerializer):
+class BlogCategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     posts_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -495,7 +489,7 @@ class BlogCategorySerializer(serializers.ModelSerializer):
         fields = ("id", "name", "slug", "is_published", "order", "posts_count")
 
     def get_posts_count(self, obj):
-        return obj.posts.filter(is_published=True).count()
+        return _published_count(self, "published_posts_counts", obj, obj.posts)
 
 
 class BlogPostTranslationSerializer(serializers.ModelSerializer):
@@ -508,25 +502,20 @@ class BlogPostTranslationSerializer(serializers.ModelSerializer):
         fields = ("locale", "title", "subtitle", "body", "hero_image", "hero_slides", "meta_title", "meta_description", "sections", "created_at", "updated_at")
 
     def get_sections(self, obj):
-        sections = obj.sections.all().order_by('order')
+        sections = obj.sections.all()
         return BlogPostSectionSerializer(sections, many=True, context=self.context).data
 
     def get_hero_slides(self, obj):
-        slides = obj.hero_slides.all().order_by('order')
+        slides = obj.hero_slides.all()
         return BlogPostHeroSlideSerializer(slides, many=True, context=self.context).data
 
     def get_hero_image(self, obj):
         # Use translation-specific hero image if available, otherwise fallback to post hero image
         image = obj.hero_image or obj.post.hero_image
-        if image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(image.url)
-            return image.url
-        return None
+        return media_url(image, self.context.get('request'))
 
 
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(TranslationResolutionMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     hero_image = serializers.SerializerMethodField()
     hero_slides = serializers.SerializerMethodField()
     category = BlogCategorySerializer(read_only=True)
@@ -549,28 +538,25 @@ class BlogPostSerializer(serializers.ModelSerializer):
             "canonical_url", "seo_enabled", "jsonld_type", "jsonld_override"
         )
 
-    def _get_requested_locale(self) -> Optional[str]:
-        request = self.context.get('request')
-        return getattr(request, 'LANGUAGE_CODE', None) if request else None
-
-    def _get_translation(self, obj):
-        if not obj:
-            return None
-        locale = self._get_requested_locale()
-        if not locale:
-            return obj.translations.first()
-        return obj.translations.filter(locale=locale).first() or obj.translations.first()
+    sparse_dependencies = {
+        "hero_image": ("hero_image",) + translation_lookups("hero_image"),
+        "hero_slides": translation_lookups("hero_slides"),
+        "translations": ("translations", "hero_image"),
+        "locale": translation_lookups(),
+        "title": translation_lookups("title"),
+        "subtitle": translation_lookups("subtitle"),
+        "body": translation_lookups("body"),
+        "meta_title": translation_lookups("meta_title"),
+        "meta_description": translation_lookups("meta_description"),
+        "sections": translation_lookups("sections"),
+        "translation_missing": translation_lookups(),
+    }
 
     def get_hero_image(self, obj):
         translation = self._get_translation(obj)
         # Use translation-specific hero image if available, otherwise fallback to post hero image
         image = (translation.hero_image if translation else None) or obj.hero_image
-        if image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(image.url)
-            return image.url
-        return None
+        return media_url(image, self.context.get('request'))
 
     def get_translations(self, obj):
         return BlogPostTranslationSerializer(obj.translations.all(), many=True, context=self.context).data
@@ -603,22 +589,16 @@ class BlogPostSerializer(serializers.ModelSerializer):
         translation = self._get_translation(obj)
         if not translation:
             return []
-        slides = translation.hero_slides.all().order_by('order')
+        slides = translation.hero_slides.all()
         return BlogPostHeroSlideSerializer(slides, many=True, context=self.context).data
 
     def get_sections(self, obj: BlogPost):
         translation = self._get_translation(obj)
         if not translation:
             return []
-        sections = translation.sections.all().order_by('order')
+        sections = translation.sections.all()
         return BlogPostSectionSerializer(sections, many=True, context=self.context).data
 
-    def get_translation_missing(self, obj: BlogPost) -> bool:
-        requested = self._get_requested_locale()
-        translation = self._get_translation(obj)
-        if not requested:
-            return translation is None
-        return translation is None or translation.locale != requested
 
 
 class MediaFileSerializer(serializers.ModelSerializer):
@@ -628,17 +608,12 @@ class MediaFileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = MediaFile
-        fields = ("id", "name", "url", "thumbnail", "uploaded_at", "file_size", "get_file_size_display")
+        fields = ("id", "name", "url", "thumbnail", "uploaded_at", "file_size", "get_file_size_display") + IMAGE_METADATA_FIELDS
         read_only_fields = ("uploaded_at", "file_size")
     
     def get_url(self, obj):
         """Return absolute URL for the media file."""
-        if obj.file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return None
+        return media_url(obj.file, self.context.get('request'))
     
     def get_thumbnail(self, obj):
         """Return thumbnail URL (same as main URL for images)."""
@@ -655,19 +630,8 @@ class NavigationMenuItemSerializer(serializers.ModelSerializer):
         
     def get_href(self, obj):
         """Return the appropriate URL for this menu item."""
-        if obj.url:
-            # External URL - return as-is
-            return obj.url
-        elif obj.page:
-            # Internal page - build locale-aware URL
-            return f"/{obj.locale}/{obj.page.slug}/"
-        elif obj.destination:
-            # Destination - build locale-aware URL
-            return f"/{obj.locale}/destinations/{obj.destination.slug}/"
-        elif obj.blog_category:
-            # Blog category - build locale-aware URL
-            return f"/{obj.locale}/blog/category/{obj.blog_category.slug}/"
-        return "#"
+        # Precomputed on save, see NavigationMenuItem.resolved_href; "#" like get_url() without a link
+        return obj.resolved_href or "#"
 
 
 class FooterLinkSerializer(serializers.ModelSerializer):
@@ -697,12 +661,7 @@ class HomepageCategorySerializer(serializers.ModelSerializer):
         
     def get_image(self, obj):
         """Return absolute image URL."""
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        return media_url(obj.image, self.context.get('request'))
         
     def to_representation(self, instance):
         """Flatten the structure to include category fields directly."""
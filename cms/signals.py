@@ -0,0 +1,211 @@
+"""Model signal receivers for the cms app. Connected in ``CmsConfig.ready()``."""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from cms.models import (
+    Page, PageTranslation, PageSection, PageHeroSlide,
+    Country, City, Destination, DestinationTranslation, DestinationSection, DestinationHeroSlide,
+    BlogCategory, BlogPost, BlogPostTranslation, BlogPostSection, BlogPostHeroSlide,
+    NavigationMenuItem, FooterBlock, FooterLink, HomepageCategory, HomepageCategoryTranslation,
+    ContentSnapshot, MediaFile,
+)
+from cms.cache import FOOTER, HOMEPAGE_CATEGORIES, NAVIGATION, bump_fragment_version
+from cms.media_folders import move_in_folders
+from cms.snapshots import schedule_snapshot_rebuild
+
+
+PAGE = ContentSnapshot.ContentType.PAGE
+DESTINATION = ContentSnapshot.ContentType.DESTINATION
+BLOG_POST = ContentSnapshot.ContentType.BLOG_POST
+
+
+def _parent_id(translation_model, translation_id, parent_field):
+    """Look up the owning item of a translation that may already be deleted."""
+    return (
+        translation_model.objects.filter(pk=translation_id)
+        .values_list(parent_field, flat=True)
+        .first()
+    )
+
+
+# Snapshots: pages
+
+@receiver([post_save, post_delete], sender=Page)
+def page_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(PAGE, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=PageTranslation)
+def page_translation_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(PAGE, instance.page_id)
+
+
+@receiver([post_save, post_delete], sender=PageSection)
+@receiver([post_save, post_delete], sender=PageHeroSlide)
+def page_content_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(PAGE, _parent_id(PageTranslation, instance.translation_id, "page_id"))
+
+
+# Snapshots: destinations (the payload embeds the city and country)
+
+@receiver([post_save, post_delete], sender=Destination)
+def destination_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(DESTINATION, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=DestinationTranslation)
+def destination_translation_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(DESTINATION, instance.destination_id)
+
+
+@receiver([post_save, post_delete], sender=DestinationSection)
+@receiver([post_save, post_delete], sender=DestinationHeroSlide)
+def destination_content_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(
+        DESTINATION, _parent_id(DestinationTranslation, instance.translation_id, "destination_id")
+    )
+
+
+@receiver(post_save, sender=City)
+def city_changed(sender, instance, **kwargs):
+    for destination_id in Destination.objects.filter(city=instance).values_list("pk", flat=True):
+        schedule_snapshot_rebuild(DESTINATION, destination_id)
+
+
+@receiver(post_save, sender=Country)
+def country_changed(sender, instance, **kwargs):
+    for destination_id in Destination.objects.filter(city__country=instance).values_list("pk", flat=True):
+        schedule_snapshot_rebuild(DESTINATION, destination_id)
+
+
+# Snapshots: blog posts (the payload embeds the category)
+
+@receiver([post_save, post_delete], sender=BlogPost)
+def blog_post_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(BLOG_POST, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=BlogPostTranslation)
+def blog_post_translation_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(BLOG_POST, instance.post_id)
+
+
+@receiver([post_save, post_delete], sender=BlogPostSection)
+@receiver([post_save, post_delete], sender=BlogPostHeroSlide)
+def blog_post_content_changed(sender, instance, **kwargs):
+    schedule_snapshot_rebuild(BLOG_POST, _parent_id(BlogPostTranslation, instance.translation_id, "post_id"))
+
+
+@receiver(post_save, sender=BlogCategory)
+def blog_category_changed(sender, instance, **kwargs):
+    for post_id in BlogPost.objects.filter(category=instance).values_list("pk", flat=True):
+        schedule_snapshot_rebuild(BLOG_POST, post_id)
+
+
+# Snapshots: published sibling counts. A destination's payload shows the
+# published destinations of its city and the published cities of its country,
+# a blog post's the published posts of its category; publishing, unpublishing,
+# moving or deleting one of those rebuilds every snapshot showing the count.
+
+# model -> (parent field, snapshot type, lookup of the snapshot items under the parents)
+COUNTED_IN_PARENT = {
+    Destination: ("city_id", DESTINATION, "city_id__in"),
+    City: ("country_id", DESTINATION, "city__country_id__in"),
+    BlogPost: ("category_id", BLOG_POST, "category_id__in"),
+}
+
+
+def _rebuild_counts(sender, parent_ids):
+    _, content_type, lookup = COUNTED_IN_PARENT[sender]
+    snapshot_model = BlogPost if content_type == BLOG_POST else Destination
+    for object_id in snapshot_model.objects.filter(**{lookup: parent_ids}).values_list("pk", flat=True):
+        schedule_snapshot_rebuild(content_type, object_id)
+
+
+@receiver(pre_save, sender=Destination)
+@receiver(pre_save, sender=City)
+@receiver(pre_save, sender=BlogPost)
+def remember_counted_parent(sender, instance, **kwargs):
+    """Parent that counted the stored row as published (None: not counted), for the post_save receiver."""
+    parent_field = COUNTED_IN_PARENT[sender][0]
+    stored = None
+    if instance.pk is not None:
+        stored = sender.objects.filter(pk=instance.pk).values_list("is_published", parent_field).first()
+    instance._counted_parent = stored[1] if stored and stored[0] else None
+
+
+@receiver(post_save, sender=Destination)
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=BlogPost)
+def counted_parent_saved(sender, instance, **kwargs):
+    before = getattr(instance, "_counted_parent", None)
+    after = getattr(instance, COUNTED_IN_PARENT[sender][0]) if instance.is_published else None
+    if before != after:
+        _rebuild_counts(sender, [parent for parent in (before, after) if parent is not None])
+
+
+@receiver(post_delete, sender=Destination)
+@receiver(post_delete, sender=City)
+@receiver(post_delete, sender=BlogPost)
+def counted_parent_deleted(sender, instance, **kwargs):
+    if instance.is_published:
+        _rebuild_counts(sender, [getattr(instance, COUNTED_IN_PARENT[sender][0])])
+
+
+# Navigation hrefs
+
+def _refresh_navigation_hrefs(**link):
+    items = list(NavigationMenuItem.objects.filter(**link).select_related("page", "destination", "blog_category"))
+    changed = []
+    for item in items:
+        href = item.get_url()
+        if href != item.resolved_href:
+            item.resolved_href = href
+            changed.append(item)
+    if changed:
+        NavigationMenuItem.objects.bulk_update(changed, ["resolved_href"])
+
+
+@receiver(post_save, sender=Page)
+def page_slug_changed(sender, instance, **kwargs):
+    _refresh_navigation_hrefs(page=instance)
+
+
+@receiver(post_save, sender=Destination)
+def destination_slug_changed(sender, instance, **kwargs):
+    _refresh_navigation_hrefs(destination=instance)
+
+
+@receiver(post_save, sender=BlogCategory)
+def blog_category_slug_changed(sender, instance, **kwargs):
+    _refresh_navigation_hrefs(blog_category=instance)
+
+
+# Layout fragments (navigation hrefs embed page, destination and category slugs)
+
+@receiver([post_save, post_delete], sender=NavigationMenuItem)
+@receiver([post_save, post_delete], sender=Page)
+@receiver([post_save, post_delete], sender=Destination)
+@receiver([post_save, post_delete], sender=BlogCategory)
+def navigation_changed(sender, **kwargs):
+    bump_fragment_version(NAVIGATION)
+
+
+@receiver([post_save, post_delete], sender=FooterBlock)
+@receiver([post_save, post_delete], sender=FooterLink)
+def footer_changed(sender, **kwargs):
+    bump_fragment_version(FOOTER)
+
+
+@receiver([post_save, post_delete], sender=HomepageCategory)
+@receiver([post_save, post_delete], sender=HomepageCategoryTranslation)
+def homepage_categories_changed(sender, **kwargs):
+    bump_fragment_version(HOMEPAGE_CATEGORIES)
+
+
+# Media folder totals (saves are counted in MediaFile.save)
+
+@receiver(post_delete, sender=MediaFile)
+def media_file_deleted(sender, instance, **kwargs):
+    move_in_folders((instance.folder, instance.file_size), None)
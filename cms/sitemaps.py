@@ -0,0 +1,232 @@
+"""
+Server-side sitemap for the public frontend.
+
+``sitemap.xml`` is a sitemap index pointing at one file per section and
+chunk (at most 50,000 URLs each). Chunks are streamed from ``values_list``
+queries. Pages, destinations and blog posts are listed, with ``hreflang``
+alternates, only in the locales they have a translation for (looked up once
+per batch of rows); countries and cities have no translations and are listed
+in every locale.
+
+Each chunk is cached under a key derived from its section's state: the row
+count, the latest ``updated_at`` (including the parents whose slugs are part
+of the URLs) and the number and newest id of the translations, so any content
+change produces a fresh document. The state is section-wide on purpose:
+chunks are offset slices in primary key order, so adding or removing one item
+shifts every later chunk. The price is that one edit re-renders all chunks
+of its section, once, on their next request.
+"""
+
+import math
+from itertools import islice
+from xml.sax.saxutils import escape, quoteattr
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from backend.compression import set_compression_key
+from cms.models import (
+    Page, PageTranslation, Country, City, Destination, DestinationTranslation, BlogPost, BlogPostTranslation,
+    SUPPORTED_LOCALES,
+)
+from cms.utils import FRONTEND_BASE_URL
+from monitoring.timing import record_cache
+
+
+URLS_PER_SITEMAP = 50000
+LOCALES = [code for code, _ in SUPPORTED_LOCALES]
+DEFAULT_LOCALE = "en"
+
+# Each item is listed once per locale
+ITEMS_PER_CHUNK = URLS_PER_SITEMAP // len(LOCALES)
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = (
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+)
+
+
+def _page_path(slug):
+    return "/" if slug == "home" else f"/{slug}/"
+
+
+# section -> (queryset factory, values_list fields, path builder)
+SECTIONS = {
+    "pages": (
+        lambda: Page.objects.filter(is_published=True),
+        ("slug",),
+        _page_path,
+    ),
+    "countries": (
+        lambda: Country.objects.filter(is_published=True),
+        ("slug",),
+        lambda slug: f"/destinations/{slug}/",
+    ),
+    "cities": (
+        lambda: City.objects.filter(is_published=True, country__is_published=True),
+        ("country__slug", "slug"),
+        lambda country, slug: f"/destinations/{country}/{slug}/",
+    ),
+    "destinations": (
+        lambda: Destination.objects.filter(
+            is_published=True, city__is_published=True, city__country__is_published=True
+        ),
+        ("city__country__slug", "city__slug", "slug"),
+        lambda country, city, slug: f"/destinations/{country}/{city}/{slug}/",
+    ),
+    "blog": (
+        lambda: BlogPost.objects.filter(is_published=True),
+        ("slug",),
+        lambda slug: f"/blog/{slug}/",
+    ),
+}
+
+
+# section -> relations whose slugs appear in the section's URLs
+SECTION_PARENTS = {
+    "cities": ("country",),
+    "destinations": ("city", "city__country"),
+}
+
+# section -> (translation model, its foreign key to the item); items are only
+# listed in the locales they are translated into
+SECTION_TRANSLATIONS = {
+    "pages": (PageTranslation, "page_id"),
+    "destinations": (DestinationTranslation, "destination_id"),
+    "blog": (BlogPostTranslation, "post_id"),
+}
+
+TRANSLATION_BATCH_SIZE = 2000
+
+
+def _section_state(section):
+    """
+    Return ``(row_count, latest updated_at, translations)`` for a section in
+    one query: a renamed parent changes every child URL, so parents count
+    towards the latest, and ``translations`` (count and newest id, or None)
+    changes when a locale is added or removed.
+    """
+    queryset_factory, _, _ = SECTIONS[section]
+    parents = SECTION_PARENTS.get(section, ())
+    translations = {}
+    if section in SECTION_TRANSLATIONS:
+        translations = {
+            "translation_count": Count("translations", distinct=True),
+            "translation_newest": Max("translations__pk"),
+        }
+    state = queryset_factory().aggregate(
+        count=Count("pk", distinct=True),
+        latest=Max("updated_at"),
+        **{f"latest_{index}": Max(f"{parent}__updated_at") for index, parent in enumerate(parents)},
+        **translations,
+    )
+    count = state.pop("count")
+    translation_state = (state.pop("translation_count"), state.pop("translation_newest")) if translations else None
+    latest = [value for value in state.values() if value is not None]
+    return count, max(latest) if latest else None, translation_state
+
+
+def _lastmod(value):
+    return value.isoformat(timespec="seconds") if value else ""
+
+
+def _cache_key(section, chunk, count, latest, translations):
+    translation_part = ":".join(map(str, translations)) if translations else "-"
+    return f"cms:sitemap:{section}:{chunk}:{count}:{latest.timestamp() if latest else 0}:{translation_part}"
+
+
+def _url_entries(path, lastmod, locales):
+    """One ``<url>`` per locale of ``locales``, each listing all of them as alternates."""
+    if not locales:
+        return ""
+    default = DEFAULT_LOCALE if DEFAULT_LOCALE in locales else locales[0]
+    alternates = "".join(
+        f'    <xhtml:link rel="alternate" hreflang="{locale}" '
+        f'href={quoteattr(f"{FRONTEND_BASE_URL}/{locale}{path}")}/>\n'
+        for locale in locales
+    )
+    alternates += (
+        f'    <xhtml:link rel="alternate" hreflang="x-default" '
+        f'href={quoteattr(f"{FRONTEND_BASE_URL}/{default}{path}")}/>\n'
+    )
+    lastmod_tag = f"    <lastmod>{lastmod}</lastmod>\n" if lastmod else ""
+    return "".join(
+        f"  <url>\n    <loc>{escape(f'{FRONTEND_BASE_URL}/{locale}{path}')}</loc>\n{lastmod_tag}{alternates}  </url>\n"
+        for locale in locales
+    )
+
+
+def _translated_locales(section, pks) -> dict:
+    """``{pk: [locale, ...]}`` in ``LOCALES`` order for the items of a translated section."""
+    model, item_field = SECTION_TRANSLATIONS[section]
+    found = {}
+    for pk, locale in model.objects.filter(**{f"{item_field}__in": pks}).values_list(item_field, "locale"):
+        found.setdefault(pk, set()).add(locale)
+    return {pk: [locale for locale in LOCALES if locale in locales] for pk, locales in found.items()}
+
+
+def _stream_chunk(section, chunk, cache_key):
+    """Yield the chunk's XML, caching the full document once it is complete."""
+    queryset_factory, fields, build_path = SECTIONS[section]
+    start = chunk * ITEMS_PER_CHUNK
+    rows = (
+        queryset_factory()
+        .order_by("pk")
+        .values_list("pk", *fields, "updated_at")[start:start + ITEMS_PER_CHUNK]
+        .iterator(chunk_size=TRANSLATION_BATCH_SIZE)
+    )
+
+    parts = [XML_HEADER, URLSET_OPEN]
+    yield XML_HEADER + URLSET_OPEN
+    while batch := list(islice(rows, TRANSLATION_BATCH_SIZE)):
+        locales = _translated_locales(section, [row[0] for row in batch]) if section in SECTION_TRANSLATIONS else None
+        for pk, *path_parts, updated_at in batch:
+            item_locales = LOCALES if locales is None else locales.get(pk, [])
+            entry = _url_entries(build_path(*path_parts), _lastmod(updated_at), item_locales)
+            parts.append(entry)
+            yield entry
+    parts.append("</urlset>\n")
+    yield "</urlset>\n"
+
+    cache.set(cache_key, "".join(parts), CACHE_TIMEOUT)
+
+
+@require_GET
+def sitemap_index(request):
+    """Sitemap index listing every section chunk."""
+    lines = [XML_HEADER, '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for section in SECTIONS:
+        count, latest, _ = _section_state(section)
+        for chunk in range(max(1, math.ceil(count / ITEMS_PER_CHUNK))):
+            location = request.build_absolute_uri(
+                reverse("cms-sitemap-section", kwargs={"section": section, "chunk": chunk})
+            )
+            lastmod_tag = f"<lastmod>{_lastmod(latest)}</lastmod>" if latest else ""
+            lines.append(f"  <sitemap><loc>{escape(location)}</loc>{lastmod_tag}</sitemap>\n")
+    lines.append("</sitemapindex>\n")
+    return HttpResponse("".join(lines), content_type="application/xml")
+
+
+@require_GET
+def sitemap_section(request, section, chunk):
+    """One chunk of a section's URLs, streamed on a cache miss."""
+    if section not in SECTIONS:
+        raise Http404("Unknown sitemap section.")
+
+    count, latest, translations = _section_state(section)
+    if chunk * ITEMS_PER_CHUNK >= max(count, 1):
+        raise Http404("Sitemap chunk out of range.")
+
+    cache_key = _cache_key(section, chunk, count, latest, translations)
+    cached = cache.get(cache_key)
+    record_cache(hit=cached is not None)
+    if cached is not None:
+        return set_compression_key(HttpResponse(cached, content_type="application/xml"), cache_key)
+
+    return StreamingHttpResponse(_stream_chunk(section, chunk, cache_key), content_type="application/xml")
@@ -0,0 +1,255 @@
+"""
+Publish-time materialization of the public detail API responses.
+
+For every published Page, Destination and BlogPost one JSON document is
+rendered per locale (plus a locale-less variant) with the same serializers
+the live views use, and stored in ``ContentSnapshot``. The detail views then
+answer with a single primary-key lookup. Snapshots are rebuilt from model
+signals (see ``cms.signals``) and by ``manage.py rebuild_snapshots``.
+"""
+
+import threading
+from typing import Optional
+
+from django.db import connection, transaction
+from django.db.models import Count, Prefetch
+from django.http import HttpResponse
+from rest_framework.settings import api_settings
+
+from backend.compression import set_compression_key
+
+from cms.models import (
+    Page, PageTranslation, Destination, DestinationTranslation,
+    BlogPost, BlogPostTranslation, ContentSnapshot, SUPPORTED_LOCALES,
+)
+
+
+# Stands in for "scheme://host" in rendered media URLs; swapped for the real
+# origin when a snapshot is served.
+ORIGIN_PLACEHOLDER = "__SNAPSHOT_ORIGIN__"
+
+# (content_type, object_id) waiting for the current transaction to commit, per thread
+_pending = threading.local()
+
+# "" is the variant served when no locale is requested
+SNAPSHOT_LOCALES = [""] + [code for code, _ in SUPPORTED_LOCALES]
+
+
+class SnapshotRequest:
+    """Minimal stand-in for the request the serializers read from."""
+
+    def __init__(self, locale: Optional[str]):
+        self.LANGUAGE_CODE = locale
+
+    def build_absolute_uri(self, location: str) -> str:
+        if location.startswith(("http://", "https://")):
+            return location
+        return f"{ORIGIN_PLACEHOLDER}{location}"
+
+
+def snapshot_key(content_type: str, slug: str, locale: Optional[str]) -> str:
+    return f"{content_type}:{slug}:{locale or ''}"
+
+
+def _snapshot_response(request, key: str, snapshot) -> Optional[HttpResponse]:
+    if snapshot is None:
+        return None
+
+    payload, built_at = snapshot
+    origin = request.build_absolute_uri("/").rstrip("/")
+    response = HttpResponse(payload.replace(ORIGIN_PLACEHOLDER, origin), content_type="application/json")
+    return set_compression_key(response, f"snapshot:{key}:{built_at.timestamp()}:{origin}")
+
+
+def get_snapshot_response(request, content_type: str, slug: str, locale: Optional[str]) -> Optional[HttpResponse]:
+    """
+    Return the stored response for a detail view, or None to fall back to live rendering.
+    """
+    if (locale or "") not in SNAPSHOT_LOCALES:
+        return None
+
+    key = snapshot_key(content_type, slug, locale)
+    snapshot = ContentSnapshot.objects.filter(pk=key).values_list("payload", "built_at").first()
+    return _snapshot_response(request, key, snapshot)
+
+
+async def aget_snapshot_response(request, content_type: str, slug: str, locale: Optional[str]) -> Optional[HttpResponse]:
+    """Async ``get_snapshot_response`` for ``cms.async_views``."""
+    if (locale or "") not in SNAPSHOT_LOCALES:
+        return None
+
+    key = snapshot_key(content_type, slug, locale)
+    snapshot = await ContentSnapshot.objects.filter(pk=key).values_list("payload", "built_at").afirst()
+    return _snapshot_response(request, key, snapshot)
+
+
+def _render(data) -> str:
+    renderer_class = api_settings.DEFAULT_RENDERER_CLASSES[0]
+    return renderer_class().render(data).decode("utf-8")
+
+
+def _render_page(page: Page, locale: str) -> str:
+    from cms.serializers import PageDetailSerializer
+
+    requested_locale = locale or None
+    serializer = PageDetailSerializer(
+        page,
+        context={
+            "requested_locale": requested_locale,
+            "request": SnapshotRequest(requested_locale),
+        },
+    )
+    return _render(serializer.data)
+
+
+def _render_destination(destination: Destination, locale: str) -> str:
+    from cms.serializers import DestinationSerializer
+
+    serializer = DestinationSerializer(destination, context={"request": SnapshotRequest(locale or None)})
+    return _render(serializer.data)
+
+
+def _render_blog_post(post: BlogPost, locale: str) -> str:
+    from cms.serializers import BlogPostSerializer
+
+    serializer = BlogPostSerializer(post, context={"request": SnapshotRequest(locale or None)})
+    return _render(serializer.data)
+
+
+def _pages():
+    return Page.objects.filter(is_published=True).prefetch_related(
+        Prefetch(
+            "translations",
+            queryset=PageTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale"),
+        )
+    )
+
+
+def _destinations():
+    return (
+        Destination.objects.filter(is_published=True)
+        .select_related("city__country")
+        .prefetch_related(
+            Prefetch(
+                "translations",
+                queryset=DestinationTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale"),
+            )
+        )
+    )
+
+
+def _blog_posts():
+    return (
+        BlogPost.objects.filter(is_published=True)
+        .select_related("category")
+        .prefetch_related(
+            Prefetch(
+                "translations",
+                queryset=BlogPostTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale"),
+            )
+        )
+    )
+
+
+SNAPSHOT_SOURCES = {
+    ContentSnapshot.ContentType.PAGE: (_pages, _render_page),
+    ContentSnapshot.ContentType.DESTINATION: (_destinations, _render_destination),
+    ContentSnapshot.ContentType.BLOG_POST: (_blog_posts, _render_blog_post),
+}
+
+
+def _build_rows(content_type: str, obj) -> list:
+    _, render = SNAPSHOT_SOURCES[content_type]
+    return [
+        ContentSnapshot(
+            key=snapshot_key(content_type, obj.slug, locale),
+            content_type=content_type,
+            object_id=obj.pk,
+            locale=locale,
+            payload=render(obj, locale),
+        )
+        for locale in SNAPSHOT_LOCALES
+    ]
+
+
+def rebuild_snapshots(content_type: str, object_ids=None) -> int:
+    """
+    Re-render the snapshots of the given items (all items when ``object_ids`` is None).
+
+    Unpublished or deleted items simply lose their snapshots, so their detail
+    views fall back to the live 404.
+
+    Returns:
+        The number of snapshot rows written.
+    """
+    queryset_factory, _ = SNAPSHOT_SOURCES[content_type]
+    queryset = queryset_factory()
+    existing = ContentSnapshot.objects.filter(content_type=content_type)
+    if object_ids is not None:
+        object_ids = list(object_ids)
+        queryset = queryset.filter(pk__in=object_ids)
+        existing = existing.filter(object_id__in=object_ids)
+
+    duplicate_slugs = set()
+    if content_type == ContentSnapshot.ContentType.DESTINATION:
+        # Destination slugs are only unique per city; the detail view cannot
+        # pick between duplicates, so neither can a snapshot.
+        duplicate_slugs = set(
+            Destination.objects.filter(is_published=True)
+            .values("slug")
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .values_list("slug", flat=True)
+        )
+
+    rows = []
+    for obj in queryset:
+        if obj.slug not in duplicate_slugs:
+            rows.extend(_build_rows(content_type, obj))
+
+    with transaction.atomic():
+        existing.delete()
+        if object_ids is not None:
+            # Rows under the same keys may still belong to a renamed or duplicate item
+            stale_keys = [row.key for row in rows] + [
+                snapshot_key(content_type, slug, locale) for slug in duplicate_slugs for locale in SNAPSHOT_LOCALES
+            ]
+            ContentSnapshot.objects.filter(key__in=stale_keys).delete()
+        ContentSnapshot.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def _rebuild_pending() -> None:
+    """``on_commit`` callback: rebuild everything scheduled so far, once."""
+    pending = getattr(_pending, "keys", None)
+    if not pending:
+        # An earlier callback of the same commit already drained the set
+        return
+    _pending.keys = set()
+    by_type = {}
+    for content_type, object_id in pending:
+        by_type.setdefault(content_type, []).append(object_id)
+    for content_type, object_ids in by_type.items():
+        rebuild_snapshots(content_type, object_ids)
+
+
+def schedule_snapshot_rebuild(content_type: str, object_id) -> None:
+    """
+    Rebuild one item's snapshots once the current transaction commits.
+
+    An admin save with inlines fires many signals for the same item; they are
+    collapsed into a single rebuild per transaction. Every call registers its
+    own ``on_commit`` callback (Django drops those of a rolled-back savepoint);
+    the first one to run drains the shared set and the rest find it empty.
+    """
+    if object_id is None:
+        return
+
+    if not connection.in_atomic_block:
+        rebuild_snapshots(content_type, [object_id])
+        return
+
+    if getattr(_pending, "keys", None) is None:
+        _pending.keys = set()
+    _pending.keys.add((content_type, object_id))
+    transaction.on_commit(_rebuild_pending)
@@ -0,0 +1,392 @@
+"""
+Synthetic cms catalogue for benchmarks.
+
+``generate_catalogue`` bulk-creates a realistic, fully translated catalogue
+(countries > cities > destinations, pages and blog posts, each translation
+with sections and hero slides, plus navigation, footer and homepage
+categories per locale, a media library and the ``core`` travel pages behind
+``/api/``) under a slug prefix, so it can live next to real content. Bulk
+creation skips the model signals; callers rebuild snapshots and bump fragment
+versions themselves (see ``benchmark_api``). The media library's search
+tokens and folder totals, which ``MediaFile.save`` would keep, are written
+here.
+"""
+
+import random
+import string
+from dataclasses import dataclass, field
+from itertools import product
+
+from cms.media_folders import add_to_folder
+from cms.models import (
+    SUPPORTED_LOCALES,
+    BlogCategory, BlogPost, BlogPostHeroSlide, BlogPostSection, BlogPostTranslation,
+    City, Country, Destination, DestinationHeroSlide, DestinationSection, DestinationTranslation,
+    FooterBlock, FooterLink, HomepageCategory, HomepageCategoryTranslation, MediaFile, MediaSearchToken,
+    NavigationMenuItem, Page, PageHeroSlide, PageSection, PageTranslation,
+)
+from cms.search import media_folder, media_tokens
+from core import models as core
+
+
+LOCALES = [code for code, _ in SUPPORTED_LOCALES]
+
+WORDS = (
+    "old town harbour cathedral market river bridge square museum castle garden "
+    "coast island valley festival tram hill palace quarter beach vineyard tower "
+    "gallery cafe lighthouse canal monastery fortress promenade park village"
+).split()
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class Catalogue:
+    """Slugs of the generated objects, for building benchmark URLs."""
+
+    prefix: str = ""
+    countries: list = field(default_factory=list)
+    cities: list = field(default_factory=list)
+    destinations: list = field(default_factory=list)
+    pages: list = field(default_factory=list)
+    blog_categories: list = field(default_factory=list)
+    blog_posts: list = field(default_factory=list)
+    rows: int = 0
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return "\n\n".join(_text(rng, 60) + "." for _ in range(count))
+
+
+def _create(model, objects: list, catalogue: Catalogue) -> list:
+    created = model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    catalogue.rows += len(created)
+    return created
+
+
+def _translated_content(rng, catalogue, translations, section_model, slide_model, slide_dir, sections, slides):
+    section_types = [choice for choice, _ in section_model.SECTION_TYPES]
+    _create(section_model, [
+        section_model(
+            translation=translation,
+            section_type=section_types[order % len(section_types)],
+            order=order,
+            title=_text(rng, 4),
+            body=_paragraphs(rng, 2),
+            image=f"{section_model._meta.get_field('image').upload_to}synthetic-{order}.jpg",
+            cta_label=_text(rng, 2),
+            cta_url=f"/{translation.locale}/",
+        )
+        for translation in translations
+        for order in range(sections)
+    ], catalogue)
+    _create(slide_model, [
+        slide_model(translation=translation, image=f"{slide_dir}synthetic-{order}.jpg", caption=_text(rng, 5), order=order)
+        for translation in translations
+        for order in range(slides)
+    ], catalogue)
+
+
+def generate_catalogue(
+    countries: int = 10,
+    cities_per_country: int = 5,
+    destinations_per_city: int = 10,
+    pages: int = 10,
+    blog_categories: int = 5,
+    blog_posts: int = 200,
+    media_files: int = 100,
+    homepage_categories: int = 6,
+    sections: int = 3,
+    slides: int = 3,
+    prefix: str = "bench",
+    seed: int = 0,
+) -> Catalogue:
+    """
+    Create the catalogue; every object is published and translated into all locales.
+
+    The ``core`` catalogue mirrors the cms one: a country per country, a city
+    per city, a category per blog category and a travel page per page and
+    language. The same arguments and seed always produce the same content.
+    """
+    rng = random.Random(seed)
+    catalogue = Catalogue(prefix=prefix)
+
+    country_objs = _create(Country, [
+        Country(
+            name=f"{_text(rng, 1)} {index}",
+            slug=f"{prefix}-country-{index}",
+            short_description=_text(rng, 20),
+            hero_image=f"country_hero_images/{prefix}-{index}.jpg",
+            is_published=True,
+            order=index,
+        )
+        for index in range(countries)
+    ], catalogue)
+    catalogue.countries = [country.slug for country in country_objs]
+
+    city_objs = _create(City, [
+        City(
+            country=country,
+            name=f"{_text(rng, 1)} {country.pk}-{index}",
+            slug=f"{prefix}-city-{country.pk}-{index}",
+            short_description=_text(rng, 20),
+            hero_image=f"city_hero_images/{prefix}-{country.pk}-{index}.jpg",
+            is_published=True,
+            order=index,
+        )
+        for country in country_objs
+        for index in range(cities_per_country)
+    ], catalogue)
+    catalogue.cities = [city.slug for city in city_objs]
+
+    categories = [choice for choice, _ in Destination.CATEGORY_CHOICES]
+    destination_objs = _create(Destination, [
+        Destination(
+            city=city,
+            # Globally unique, so every destination gets snapshots
+            slug=f"{prefix}-destination-{city.pk}-{index}",
+            category=categories[index % len(categories)],
+            tags=", ".join(rng.sample(WORDS, 3)),
+            is_featured=index == 0,
+            is_published=True,
+            hero_image=f"destination_hero_images/{prefix}-{city.pk}-{index}.jpg",
+        )
+        for city in city_objs
+        for index in range(destinations_per_city)
+    ], catalogue)
+    catalogue.destinations = [destination.slug for destination in destination_objs]
+
+    destination_translations = _create(DestinationTranslation, [
+        DestinationTranslation(
+            destination=destination,
+            locale=locale,
+            title=_text(rng, 3),
+            subtitle=_text(rng, 8),
+            short_description=_text(rng, 15),
+            body=_paragraphs(rng, 4),
+            meta_title=_text(rng, 5),
+            meta_description=_text(rng, 20),
+        )
+        for destination in destination_objs
+        for locale in LOCALES
+    ], catalogue)
+    _translated_content(
+        rng, catalogue, destination_translations,
+        DestinationSection, DestinationHeroSlide, "destination_hero_slides/", sections, slides,
+    )
+
+    page_objs = _create(Page, [
+        Page(slug=f"{prefix}-page-{index}", page_type=Page.PageType.CUSTOM, is_published=True)
+        for index in range(pages)
+    ], catalogue)
+    catalogue.pages = [page.slug for page in page_objs]
+
+    page_translations = _create(PageTranslation, [
+        PageTranslation(
+            page=page,
+            locale=locale,
+            title=_text(rng, 3),
+            subtitle=_text(rng, 8),
+            body=_paragraphs(rng, 3),
+            meta_title=_text(rng, 5),
+            meta_description=_text(rng, 20),
+        )
+        for page in page_objs
+        for locale in LOCALES
+    ], catalogue)
+    _translated_content(
+        rng, catalogue, page_translations, PageSection, PageHeroSlide, "page_hero_slides/", sections, slides,
+    )
+
+    category_objs = _create(BlogCategory, [
+        BlogCategory(name=_text(rng, 2), slug=f"{prefix}-category-{index}", is_published=True, order=index)
+        for index in range(blog_categories)
+    ], catalogue)
+    catalogue.blog_categories = [category.slug for category in category_objs]
+
+    post_objs = _create(BlogPost, [
+        BlogPost(
+            category=category_objs[index % len(category_objs)],
+            slug=f"{prefix}-post-{index}",
+            hero_image=f"blog_hero_images/{prefix}-{index}.jpg",
+            is_published=True,
+        )
+        for index in range(blog_posts if category_objs else 0)
+    ], catalogue)
+    catalogue.blog_posts = [post.slug for post in post_objs]
+
+    post_translations = _create(BlogPostTranslation, [
+        BlogPostTranslation(
+            post=post,
+            locale=locale,
+            title=_text(rng, 6),
+            subtitle=_text(rng, 10),
+            body=_paragraphs(rng, 5),
+            meta_title=_text(rng, 5),
+            meta_description=_text(rng, 20),
+        )
+        for post in post_objs
+        for locale in LOCALES
+    ], catalogue)
+    _translated_content(
+        rng, catalogue, post_translations, BlogPostSection, BlogPostHeroSlide, "blog_hero_slides/", sections, slides,
+    )
+
+    _create(NavigationMenuItem, [
+        NavigationMenuItem(
+            locale=locale,
+            label=_text(rng, 1),
+            page=page,
+            resolved_href=f"/{locale}/{page.slug}/",
+            order=index,
+        )
+        for locale in LOCALES
+        for index, page in enumerate(page_objs[:8])
+    ], catalogue)
+
+    footer_blocks = _create(FooterBlock, [
+        FooterBlock(locale=locale, title=_text(rng, 2), body=_text(rng, 12), order=index)
+        for locale in LOCALES
+        for index in range(3)
+    ], catalogue)
+    _create(FooterLink, [
+        FooterLink(block=block, label=_text(rng, 2), url=f"/{block.locale}/{_text(rng, 1).lower()}/", order=index)
+        for block in footer_blocks
+        for index in range(5)
+    ], catalogue)
+
+    home_categories = _create(HomepageCategory, [
+        HomepageCategory(slug=f"{prefix}-home-{index}", order=index, meta_title=_text(rng, 4))
+        for index in range(homepage_categories)
+    ], catalogue)
+    _create(HomepageCategoryTranslation, [
+        HomepageCategoryTranslation(
+            category=category,
+            locale=locale,
+            title=_text(rng, 2),
+            description=_text(rng, 15),
+            image=f"homepage_categories/{category.slug}.jpg",
+        )
+        for category in home_categories
+        for locale in LOCALES
+    ], catalogue)
+
+    _media_library(rng, catalogue, prefix, media_files)
+    _core_catalogue(rng, catalogue, prefix, countries, cities_per_country, blog_categories, pages)
+    return catalogue
+
+
+def _media_library(rng, catalogue, prefix, count):
+    media = _create(MediaFile, [
+        MediaFile(
+            file=f"uploads/{prefix}-{rng.choice(WORDS)}/{prefix}-hero-{index}.jpg",
+            name=f"{_text(rng, 2)} hero {index}",
+            file_size=rng.randint(20_000, 2_000_000),
+            image_width=1600,
+            image_height=900,
+            image_format="JPEG",
+            dominant_color="#336699",
+        )
+        for index in range(count)
+    ], catalogue)
+    totals = {}
+    for media_file in media:
+        media_file.folder = media_folder(media_file.file.name)
+        entry = totals.setdefault(media_file.folder, [0, 0])
+        entry[0] += 1
+        entry[1] += media_file.file_size
+    MediaFile.objects.bulk_update(media, ["folder"], batch_size=BATCH_SIZE)
+    _create(MediaSearchToken, [
+        MediaSearchToken(media=media_file, token=token)
+        for media_file in media
+        for token in sorted(media_tokens(media_file.name, media_file.file.name))
+    ], catalogue)
+    for folder, (files, size) in totals.items():
+        add_to_folder(folder, files, size)
+
+
+def _free_country_codes(count):
+    """Two-letter codes not used by any ``core.Country`` yet (the column is unique)."""
+    taken = set(core.Country.objects.values_list("code", flat=True))
+    codes = ("".join(pair) for pair in product(string.ascii_uppercase, repeat=2))
+    return [code for code in codes if code not in taken][:count]
+
+
+def _core_catalogue(rng, catalogue, prefix, countries, cities_per_country, categories, pages):
+    country_objs = _create(core.Country, [
+        core.Country(code=code, name=_text(rng, 1), slug=f"{prefix}-core-country-{index}")
+        for index, code in enumerate(_free_country_codes(countries))
+    ], catalogue)
+    city_objs = _create(core.City, [
+        core.City(country=country, name=_text(rng, 1), slug=f"{prefix}-core-city-{index}")
+        for country in country_objs
+        for index in range(cities_per_country)
+    ], catalogue)
+    category_objs = _create(core.Category, [
+        core.Category(slug=f"{prefix}-core-category-{index}", name=_text(rng, 2))
+        for index in range(categories)
+    ], catalogue)
+    _create(core.TravelPage, [
+        core.TravelPage(
+            country=city.country,
+            city=city,
+            category=category_objs[index % len(category_objs)] if category_objs else None,
+            language=language,
+            slug=f"{prefix}-core-page-{index}",
+            title=_text(rng, 4),
+            summary=_text(rng, 20),
+            body=_paragraphs(rng, 3),
+            is_published=True,
+        )
+        for index in range(pages if city_objs else 0)
+        for city in [city_objs[index % len(city_objs)]]
+        for language, _ in core.TravelPage.LANGUAGE_CHOICES
+    ], catalogue)
+
+
+def endpoints(catalogue) -> list:
+    """``(name, url)`` pairs covering every ``api/cms/`` and ``api/`` endpoint."""
+
+    def middle(slugs):
+        return slugs[len(slugs) // 2] if slugs else "missing"
+
+    page = middle(catalogue.pages)
+    country = middle(catalogue.countries)
+    destination = middle(catalogue.destinations)
+    category = middle(catalogue.blog_categories)
+    post = middle(catalogue.blog_posts)
+    batch = ",".join(f"{slug}:{locale}" for slug in catalogue.pages[:10] for locale in ("en", "fr"))
+
+    return [
+        ("cms-page-detail", f"/api/cms/pages/{page}/?locale=fr"),
+        ("cms-page-detail-sparse", f"/api/cms/pages/{page}/?locale=fr&fields=slug,title,sections"),
+        ("cms-page-batch", f"/api/cms/pages/batch/?pages={batch}"),
+        ("cms-countries-list", "/api/cms/countries/"),
+        ("cms-cities-list", f"/api/cms/cities/?country={country}"),
+        ("cms-destinations-list", f"/api/cms/destinations/?country={country}&locale=fr"),
+        ("cms-destinations-list-all", "/api/cms/destinations/?locale=fr"),
+        ("cms-destination-detail", f"/api/cms/destinations/{destination}/?locale=fr"),
+        ("cms-blog-posts-list", "/api/cms/blog/?locale=fr"),
+        ("cms-blog-categories-list", "/api/cms/blog/categories/"),
+        ("cms-blog-category-detail", f"/api/cms/blog/category/{category}/?locale=fr"),
+        ("cms-blog-post-detail", f"/api/cms/blog/{post}/?locale=fr"),
+        ("cms-media-list", "/api/cms/media/"),
+        ("cms-media-search", f"/api/cms/media/?q=hero+{catalogue.prefix}&folder=uploads/"),
+        ("cms-media-folders", "/api/cms/media/folders/"),
+        ("cms-navigation-list", "/api/cms/navigation/?locale=fr"),
+        ("cms-footer-list", "/api/cms/footer/?locale=fr"),
+        ("cms-homepage-categories", "/api/cms/homepage-categories/?locale=fr"),
+        ("cms-layout", "/api/cms/layout/?locale=fr"),
+        ("cms-resolve-translation", f"/api/cms/resolve-translation/?content_type=page&slug={page}&locale=nl"),
+        ("cms-sitemap-index", "/api/cms/sitemap.xml"),
+        ("cms-sitemap-destinations", "/api/cms/sitemap-destinations-0.xml"),
+        ("api-root", "/api/"),
+        ("api-countries", "/api/countries/"),
+        ("api-cities", "/api/cities/"),
+        ("api-categories", "/api/categories/"),
+        ("api-pages", "/api/pages/"),
+    ]
@@ -0,0 +1,545 @@
+"""
+Query budgets for the public API, and the bookkeeping that keeps derived
+data (snapshots, media folder totals, the content image manifest) in step.
+
+Every endpoint declares the most queries it may run. Each budget is checked
+on a small and a large synthetic catalogue (``cms.synthetic``) and the two
+counts must match, so a query that grows with the number of rows (an N+1 in
+``cms.serializers``) fails even while it is still under budget. Failures
+list the captured SQL.
+
+Detail snapshots are not built here, so detail endpoints are measured on
+their live rendering path.
+"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image, ImageDraw
+
+from cms import async_views, snapshots, views
+from cms.images import extract_image_metadata
+from cms.management.commands.export_static_api import remove_stale_files, render_batch
+from cms.content_images import COUNTRY, GENERATED, STUB, ImageJob, Manifest
+from cms.media_folders import rebuild_folder_stats
+from cms.models import (
+    BlogPost, City, ContentSnapshot, Destination, FooterBlock, MediaFile, MediaFolderStats, NavigationMenuItem,
+    Page, PageTranslation,
+)
+from cms.synthetic import endpoints, generate_catalogue
+from cms.utils import FRONTEND_BASE_URL
+
+
+# endpoint (see cms.synthetic.endpoints) -> maximum queries per request
+QUERY_BUDGETS = {
+    "cms-page-detail": 5,
+    "cms-page-detail-sparse": 3,
+    "cms-page-batch": 4,
+    "cms-countries-list": 2,
+    "cms-cities-list": 3,
+    "cms-destinations-list": 6,
+    "cms-destinations-list-all": 6,
+    "cms-destination-detail": 7,
+    "cms-blog-posts-list": 5,
+    "cms-blog-categories-list": 2,
+    "cms-blog-category-detail": 6,
+    "cms-blog-post-detail": 6,
+    "cms-media-list": 1,
+    "cms-media-search": 1,
+    "cms-media-folders": 1,
+    "cms-navigation-list": 1,
+    "cms-footer-list": 2,
+    "cms-homepage-categories": 1,
+    "cms-layout": 4,
+    "cms-resolve-translation": 2,
+    "cms-sitemap-index": 5,
+    "cms-sitemap-destinations": 3,
+    "api-root": 0,
+    "api-countries": 1,
+    "api-cities": 1,
+    "api-categories": 1,
+    "api-pages": 1,
+}
+
+CATALOGUE_SIZES = {
+    "small": dict(
+        countries=1, cities_per_country=1, destinations_per_city=2, pages=2, blog_categories=1, blog_posts=2,
+        media_files=2, homepage_categories=1,
+    ),
+    "large": dict(
+        countries=3, cities_per_country=3, destinations_per_city=4, pages=6, blog_categories=3, blog_posts=15,
+        media_files=12, homepage_categories=4,
+    ),
+}
+
+
+class DiscardCatalogue(Exception):
+    pass
+
+
+def is_empty(content: bytes) -> bool:
+    """
+    An XML document without a ``<loc>``, or JSON (one document or JSON lines)
+    that is empty or has only empty values.
+    """
+    if content.lstrip().startswith(b"<"):
+        return b"<loc>" not in content
+    try:
+        documents = [json.loads(content)]
+    except ValueError:
+        documents = [json.loads(line) for line in content.splitlines() if line.strip()]
+    return not any(
+        any(document.values()) if isinstance(document, dict) else document for document in documents
+    )
+
+
+# The slow-query log's EXPLAINs would be captured as extra queries on a slow machine
+@override_settings(MONITORING_SLOW_QUERY_MS=0)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # size -> endpoint -> (status code, captured queries, response body)
+        cls.measurements = {}
+        for size, arguments in CATALOGUE_SIZES.items():
+            try:
+                with transaction.atomic():
+                    cls.measurements[size] = cls._measure(generate_catalogue(prefix=size, sections=2, slides=2, **arguments))
+                    raise DiscardCatalogue
+            except DiscardCatalogue:
+                pass
+
+    @classmethod
+    def _measure(cls, catalogue) -> dict:
+        client = cls.client_class()
+        results = {}
+        for name, url in endpoints(catalogue):
+            # Cold fragment caches: measure the queries of a cache miss
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+                content = b"".join(response.streaming_content) if response.streaming else response.content
+            results[name] = (response.status_code, queries.captured_queries, content)
+        return results
+
+    def test_every_endpoint_has_a_budget(self):
+        measured = set(self.measurements["small"])
+        self.assertEqual(measured - set(QUERY_BUDGETS), set(), "Endpoints without a query budget")
+        self.assertEqual(set(QUERY_BUDGETS) - measured, set(), "Budgets for unknown endpoints")
+
+    def test_endpoints_respond(self):
+        for size, results in self.measurements.items():
+            for name, (status_code, _, content) in results.items():
+                with self.subTest(endpoint=name, catalogue=size):
+                    self.assertEqual(status_code, 200)
+                    # A budget measured on an empty response says nothing about the query count
+                    self.assertFalse(is_empty(content), f"{name} returned no content")
+
+    def test_query_budgets(self):
+        for name, budget in QUERY_BUDGETS.items():
+            for size, results in self.measurements.items():
+                with self.subTest(endpoint=name, catalogue=size):
+                    queries = results[name][1]
+                    if len(queries) > budget:
+                        self.fail(
+                            f"{name} ran {len(queries)} queries on the {size} catalogue, "
+                            f"budget is {budget}:\n{self._format(queries)}"
+                        )
+
+    def test_query_counts_do_not_grow_with_the_catalogue(self):
+        small, large = self.measurements["small"], self.measurements["large"]
+        for name in QUERY_BUDGETS:
+            with self.subTest(endpoint=name):
+                small_queries, large_queries = small[name][1], large[name][1]
+                if len(large_queries) != len(small_queries):
+                    self.fail(
+                        f"{name} ran {len(small_queries)} queries on the small catalogue and "
+                        f"{len(large_queries)} on the large one:\n{self._format(large_queries)}"
+                    )
+
+    @staticmethod
+    def _format(queries) -> str:
+        return "\n".join(f"{index}. {query['sql']}" for index, query in enumerate(queries, 1))
+
+
+class SnapshotScheduleTests(TestCase):
+    def setUp(self):
+        self.rebuilds = []
+        patcher = mock.patch.object(
+            snapshots, "rebuild_snapshots", lambda content_type, ids: self.rebuilds.append((content_type, sorted(ids)))
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rebuilds_once_per_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                snapshots.schedule_snapshot_rebuild(ContentSnapshot.ContentType.PAGE, 1)
+            snapshots.schedule_snapshot_rebuild(ContentSnapshot.ContentType.PAGE, 2)
+        self.assertEqual(self.rebuilds, [(ContentSnapshot.ContentType.PAGE, [1, 2])])
+
+    def test_rolled_back_savepoint_does_not_swallow_a_later_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            snapshots.schedule_snapshot_rebuild(ContentSnapshot.ContentType.BLOG_POST, 5)
+            try:
+                with transaction.atomic():
+                    snapshots.schedule_snapshot_rebuild(ContentSnapshot.ContentType.PAGE, 1)
+                    raise DiscardCatalogue
+            except DiscardCatalogue:
+                pass
+            snapshots.schedule_snapshot_rebuild(ContentSnapshot.ContentType.PAGE, 1)
+        self.assertEqual(
+            sorted(self.rebuilds),
+            [(ContentSnapshot.ContentType.BLOG_POST, [5]), (ContentSnapshot.ContentType.PAGE, [1])],
+        )
+
+
+class SnapshotCountTests(TestCase):
+    """Snapshots embed published sibling counts; they must follow the siblings."""
+
+    def setUp(self):
+        generate_catalogue(
+            prefix="counts", countries=1, cities_per_country=2, destinations_per_city=2,
+            pages=1, blog_categories=1, blog_posts=2, sections=1, slides=1,
+        )
+        for content_type in (ContentSnapshot.ContentType.DESTINATION, ContentSnapshot.ContentType.BLOG_POST):
+            snapshots.rebuild_snapshots(content_type)
+        self.destination, self.sibling = Destination.objects.order_by("pk")[:2]
+        self.post, self.other_post = BlogPost.objects.order_by("pk")[:2]
+
+    def assertSnapshotMatchesLive(self, url: str, content_type: str, slug: str):
+        snapshot = self.client.get(url)
+        key = snapshots.snapshot_key(content_type, slug, "fr")
+        self.assertTrue(ContentSnapshot.objects.filter(pk=key).exists(), "not served from a snapshot")
+        ContentSnapshot.objects.filter(pk=key).delete()
+        self.assertEqual(snapshot.content.decode(), self.client.get(url).content.decode())
+
+    def _save(self, obj, **changes):
+        for name, value in changes.items():
+            setattr(obj, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+
+    def _assert_destination(self):
+        self.assertSnapshotMatchesLive(
+            f"/api/cms/destinations/{self.destination.slug}/?locale=fr", "destination", self.destination.slug
+        )
+
+    def test_unpublishing_and_publishing_a_sibling_destination(self):
+        self._save(self.sibling, is_published=False)
+        self._assert_destination()
+        snapshots.rebuild_snapshots(ContentSnapshot.ContentType.DESTINATION)
+        self._save(self.sibling, is_published=True)
+        self._assert_destination()
+
+    def test_deleting_a_sibling_destination(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sibling.delete()
+        self._assert_destination()
+
+    def test_unpublishing_a_sibling_city(self):
+        other_city = City.objects.exclude(pk=self.destination.city_id).get()
+        self._save(other_city, is_published=False)
+        self._assert_destination()
+
+    def test_unpublishing_a_sibling_blog_post(self):
+        self._save(self.other_post, is_published=False)
+        self.assertSnapshotMatchesLive(f"/api/cms/blog/{self.post.slug}/?locale=fr", "blog_post", self.post.slug)
+
+
+class AsyncParityTests(TestCase):
+    """cms.async_views answers with the same bytes as the sync views it stands in for."""
+
+    def setUp(self):
+        cache.clear()
+        self.catalogue = generate_catalogue(
+            prefix="parity", countries=1, cities_per_country=1, destinations_per_city=1,
+            pages=2, blog_categories=1, blog_posts=1, media_files=0, homepage_categories=0, sections=0, slides=0,
+        )
+
+    def _both(self, sync_view, async_view, url: str) -> tuple:
+        factory = RequestFactory()
+        sync_response = sync_view(factory.get(url))
+        sync_response.render()
+        async_response = async_to_sync(async_view)(factory.get(url))
+        return sync_response.content.decode(), async_response.content.decode()
+
+    def test_resolve_translation(self):
+        page, post = self.catalogue.pages[0], self.catalogue.blog_posts[0]
+        queries = [
+            f"content_type=page&slug={page}&locale=fr",
+            "content_type=page&slug=missing&locale=fr",
+            f"content_type=blog_post&slug={post}&locale=nl",
+            f"content_type=destination&slug=x&locale=es&current_path=/en/destinations/a/b/{self.catalogue.destinations[0]}",
+            "content_type=destination&slug=x&locale=es&current_path=/en/destinations/a/",
+            "content_type=home&locale=pt",
+            "content_type=page&locale=fr",
+            "content_type=page&slug=x&locale=xx",
+            "content_type=unknown&slug=x&locale=fr",
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                sync_body, async_body = self._both(
+                    views.resolve_translation, async_views.resolve_translation, f"/api/cms/resolve-translation/?{query}"
+                )
+                self.assertEqual(sync_body, async_body)
+
+    def test_navigation_and_footer_share_the_fragment_cache(self):
+        for sync_view, async_view, url, rows in (
+            (views.navigation_list, async_views.navigation_list, "/api/cms/navigation/?locale=fr",
+             NavigationMenuItem.objects.filter(locale="fr")),
+            (views.footer_list, async_views.footer_list, "/api/cms/footer/?locale=fr", FooterBlock.objects.filter(locale="fr")),
+        ):
+            with self.subTest(url=url):
+                before = self._both(sync_view, async_view, url)
+                self.assertEqual(before[0], before[1])
+                # Bulk updates send no signals: both keep serving the cached fragment
+                rows.update(order=99)
+                self.assertEqual(self._both(sync_view, async_view, url), before)
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.page = Page.objects.create(slug="about", page_type=Page.PageType.CUSTOM, is_published=True)
+        for locale in ("fr", "nl"):
+            PageTranslation.objects.create(page=self.page, locale=locale, title=f"About {locale}")
+
+    def _sitemap(self) -> str:
+        response = self.client.get("/api/cms/sitemap-pages-0.xml")
+        return b"".join(response.streaming_content).decode() if response.streaming else response.content.decode()
+
+    def test_lists_only_translated_locales(self):
+        sitemap = self._sitemap()
+        self.assertEqual(sitemap.count("/about/</loc>"), 2)
+        for locale in ("fr", "nl"):
+            self.assertIn(f"<loc>{FRONTEND_BASE_URL}/{locale}/about/</loc>", sitemap)
+            self.assertIn(f'hreflang="{locale}"', sitemap)
+        self.assertNotIn(f'hreflang="en" href="{FRONTEND_BASE_URL}/en/about/"', sitemap)
+        # Without an English translation, x-default points at the first translated locale
+        self.assertIn(f'hreflang="x-default" href="{FRONTEND_BASE_URL}/fr/about/"', sitemap)
+
+    def test_new_translation_invalidates_the_cached_chunk(self):
+        self._sitemap()
+        PageTranslation.objects.create(page=self.page, locale="en", title="About")
+        sitemap = self._sitemap()
+        self.assertEqual(sitemap.count("/about/</loc>"), 3)
+        self.assertIn(f'hreflang="x-default" href="{FRONTEND_BASE_URL}/en/about/"', sitemap)
+
+
+def png_upload(name: str, size: tuple = (8, 8)) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "#336699").save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class MediaFileTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class MediaFileSaveTests(MediaFileTestCase):
+    def _tokens(self, media) -> list:
+        return sorted(media.search_tokens.values_list("token", flat=True))
+
+    def test_save_without_name_or_file_change_skips_search_tokens(self):
+        media = MediaFile.objects.create(file=png_upload("beach.png"))
+        media = MediaFile.objects.get(pk=media.pk)
+        with CaptureQueriesContext(connection) as queries:
+            media.save()
+        self.assertFalse([query for query in queries if "cms_mediasearchtoken" in query["sql"]])
+
+    def test_rename_and_new_file_update_search_tokens(self):
+        media = MediaFile.objects.create(file=png_upload("beach.png"))
+        self.assertEqual(self._tokens(media), ["beach", "png", "uploads"])
+        media.name = "Málaga Day"
+        media.save()
+        self.assertEqual(self._tokens(media), ["beach", "day", "malaga", "png", "uploads"])
+        media.file = png_upload("harbour.png")
+        media.save()
+        self.assertEqual(self._tokens(media), ["day", "harbour", "malaga", "png", "uploads"])
+
+
+class ImageMetadataTests(MediaFileTestCase):
+    @staticmethod
+    def _jpeg(image, **save_options) -> io.BytesIO:
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", **save_options)
+        buffer.seek(0)
+        return buffer
+
+    def test_exif_rotated_image_is_described_upright(self):
+        upright = Image.new("RGB", (200, 400), "#ffffff")
+        ImageDraw.Draw(upright).rectangle((0, 0, 199, 199), fill="#cc2200")
+        # Stored lying on its side, with orientation 6 (rotate 90 degrees clockwise to display)
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        rotated = self._jpeg(upright.transpose(Image.Transpose.ROTATE_90), exif=exif.tobytes())
+
+        metadata = extract_image_metadata(rotated)
+        expected = extract_image_metadata(self._jpeg(upright))
+        self.assertEqual((metadata["image_width"], metadata["image_height"]), (200, 400))
+        self.assertEqual(metadata["blurhash"], expected["blurhash"])
+
+    def test_unreadable_file_is_not_decoded_again_on_save(self):
+        with self.assertLogs("cms.images", "WARNING"):
+            media = MediaFile.objects.create(file=SimpleUploadedFile("broken.png", b"not an image"))
+        self.assertIsNone(media.image_width)
+        media = MediaFile.objects.get(pk=media.pk)
+        with mock.patch("cms.models.extract_image_metadata") as extract:
+            media.name = "Renamed"
+            media.save()
+        extract.assert_not_called()
+
+
+class MediaFolderStatsTests(MediaFileTestCase):
+    """The totals kept up by MediaFile.save and the delete receiver match a full rebuild."""
+
+    def assertMatchesRebuild(self):
+        incremental = sorted(MediaFolderStats.objects.values_list("folder", "files", "bytes"))
+        rebuild_folder_stats()
+        self.assertEqual(incremental, sorted(MediaFolderStats.objects.values_list("folder", "files", "bytes")))
+        return incremental
+
+    def setUp(self):
+        super().setUp()
+        self.beach = MediaFile.objects.create(file=png_upload("beach.png"))
+        self.harbour = MediaFile.objects.create(file=png_upload("harbour.png", (16, 16)))
+
+    def test_create(self):
+        stats = self.assertMatchesRebuild()
+        self.assertEqual([(folder, files) for folder, files, _ in stats], [("", 2), ("uploads/", 2)])
+
+    def test_move_and_resize(self):
+        with self.beach.file.open("rb"):
+            self.beach.file = default_storage.save("images/blog/beach.png", self.beach.file)
+        self.beach.save()
+        self.harbour.file = png_upload("harbour.png", (32, 32))
+        self.harbour.save()
+        stats = self.assertMatchesRebuild()
+        self.assertIn("images/blog/", [folder for folder, _, _ in stats])
+
+    def test_delete(self):
+        self.beach.delete()
+        self.assertMatchesRebuild()
+
+    def test_queryset_delete(self):
+        MediaFile.objects.create(file=png_upload("market.png"))
+        MediaFile.objects.filter(pk__in=[self.beach.pk, self.harbour.pk]).delete()
+        stats = self.assertMatchesRebuild()
+        self.assertEqual([(folder, files) for folder, files, _ in stats], [("", 1), ("uploads/", 1)])
+
+
+class ManifestTests(MediaFileTestCase):
+    def setUp(self):
+        super().setUp()
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        self.manifest_path = os.path.join(work_dir, "content-images.jsonl")
+        self.countries_path = os.path.join(work_dir, "countries_images.json")
+        with open(self.countries_path, "w", encoding="utf-8") as file:
+            json.dump([{"slug": "testland", "image_filename": "testland.jpg", "image_prompt": "A test coast"}], file)
+        self.job = ImageJob(kind=COUNTRY, slug="testland", name="images/countries/testland.jpg", title="Testland")
+
+    def _sync(self, generated):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"}), \
+                mock.patch("cms.management.commands.sync_content_images.generate_image", generated):
+            call_command(
+                "sync_content_images", only="countries", countries_file=self.countries_path,
+                manifest=self.manifest_path, stdout=io.StringIO(), stderr=io.StringIO(),
+            )
+
+    def _stored(self, source: str = STUB) -> str:
+        stored_name = default_storage.save(self.job.name, io.BytesIO(source.encode()))
+        Manifest(self.manifest_path).record(self.job, source, stored_name)
+        return stored_name
+
+    def test_truncated_last_line_is_ignored(self):
+        manifest = Manifest(self.manifest_path)
+        manifest.record(self.job, STUB, self.job.name)
+        manifest.record(ImageJob(kind=COUNTRY, slug="other", name="images/countries/other.jpg", title="Other"), STUB)
+        with open(self.manifest_path, "a", encoding="utf-8") as file:
+            file.write('{"name": "images/countries/testland.jpg", "kind": "coun')
+        reloaded = Manifest(self.manifest_path)
+        self.assertEqual(sorted(reloaded.entries), ["images/countries/other.jpg", self.job.name])
+        self.assertEqual(reloaded.get(self.job.name)["source"], STUB)
+
+    def test_run_without_stub_replaces_stub(self):
+        self._stored()
+        self._sync(lambda prompt: b"generated")
+        entry = Manifest(self.manifest_path).get(self.job.name)
+        self.assertEqual((entry["source"], entry["error"]), (GENERATED, ""))
+        with default_storage.open(entry["stored_name"]) as file:
+            self.assertEqual(file.read(), b"generated")
+
+    def test_failed_retry_keeps_previous_image(self):
+        stored_name = self._stored()
+
+        def fail(prompt):
+            raise RuntimeError("rate limited")
+
+        with self.assertRaises(CommandError):
+            self._sync(fail)
+        entry = Manifest(self.manifest_path).get(self.job.name)
+        self.assertEqual((entry["stored_name"], entry["error"]), (stored_name, "rate limited"))
+        self.assertTrue(default_storage.exists(stored_name))
+
+    def test_recorded_image_missing_from_storage_is_redone(self):
+        default_storage.delete(self._stored(GENERATED))
+        self._sync(lambda prompt: b"regenerated")
+        entry = Manifest(self.manifest_path).get(self.job.name)
+        with default_storage.open(entry["stored_name"]) as file:
+            self.assertEqual(file.read(), b"regenerated")
+
+
+class StaticExportTests(TestCase):
+    JOB = ("/api/cms/countries/", {})
+    RELATIVE_PATH = os.path.join("api", "cms", "countries", "index.json")
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        self.target = os.path.join(self.output_dir, self.RELATIVE_PATH)
+
+    def _render(self, known_hashes=None):
+        [result] = render_batch([self.JOB], self.output_dir, "http://testserver", known_hashes or {}, False)
+        return result
+
+    def test_incremental_rewrites_missing_file(self):
+        _, digest, status = self._render()
+        self.assertEqual(status, "written")
+        self.assertEqual(self._render({self.RELATIVE_PATH: digest})[2], "unchanged")
+
+        os.remove(self.target)
+        self.assertEqual(self._render({self.RELATIVE_PATH: digest})[2], "written")
+        self.assertTrue(os.path.exists(self.target))
+
+    def test_files_not_exported_are_removed(self):
+        _, digest, _ = self._render()
+        stale_dir = os.path.join(self.output_dir, "api", "cms", "pages", "deleted")
+        os.makedirs(stale_dir)
+        for name in ("index.json", "index.json.gz", "index.json.br"):
+            open(os.path.join(stale_dir, name), "wb").close()
+        open(f"{self.target}.br", "wb").close()
+
+        removed = remove_stale_files(self.output_dir, {self.RELATIVE_PATH: digest}, use_brotli=False)
+        self.assertEqual(removed, 4)
+        self.assertFalse(os.path.exists(os.path.dirname(stale_dir)))
+        self.assertTrue(os.path.exists(self.target))
+        self.assertTrue(os.path.exists(f"{self.target}.gz"))
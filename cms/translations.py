@@ -0,0 +1,73 @@
+"""
+Translation resolution shared by the cms views and serializers.
+
+A page's translation for a locale is the requested one, else the
+``FALLBACK_LOCALE`` one, else the first available; destinations and blog
+posts go straight from the requested one to the first available (their
+``fallback_locale`` is None). ``TranslationResolver`` memoizes that choice per
+request, keyed by ``(model, pk, locale, fallback)``, so every
+field of every serializer that renders the object (including nested and
+repeated occurrences) shares a single resolution.
+"""
+
+from typing import NamedTuple, Optional
+
+
+FALLBACK_LOCALE = "en"
+
+
+class Resolution(NamedTuple):
+    translation: Optional[object]
+    translation_missing: bool
+
+
+def select_translation(translations, locale: Optional[str], fallback: Optional[str] = FALLBACK_LOCALE):
+    """Pick the translation for ``locale``, else ``fallback``, else the first, from an ordered list."""
+    if not translations:
+        return None
+
+    translations_by_locale = {translation.locale: translation for translation in translations}
+
+    if locale and locale in translations_by_locale:
+        return translations_by_locale[locale]
+
+    if fallback and fallback in translations_by_locale:
+        return translations_by_locale[fallback]
+
+    return translations[0]
+
+
+def resolve_translation(obj, locale: Optional[str], fallback: Optional[str] = FALLBACK_LOCALE) -> Resolution:
+    """Resolve without memoization; uses prefetched ``translations`` when available."""
+    translation = select_translation(list(obj.translations.all()), locale, fallback)
+    if not locale:
+        missing = translation is None
+    else:
+        missing = translation is None or translation.locale != locale
+    return Resolution(translation, missing)
+
+
+class TranslationResolver:
+    """Per-request memo of ``resolve_translation``."""
+
+    def __init__(self):
+        self._resolved = {}
+
+    @classmethod
+    def for_request(cls, request) -> "TranslationResolver":
+        if request is None:
+            return cls()
+        resolver = getattr(request, "_translation_resolver", None)
+        if resolver is None:
+            resolver = cls()
+            request._translation_resolver = resolver
+        return resolver
+
+    def resolve(self, obj, locale: Optional[str], fallback: Optional[str] = FALLBACK_LOCALE) -> Resolution:
+        if obj.pk is None:
+            return resolve_translation(obj, locale, fallback)
+        key = (type(obj), obj.pk, locale or None, fallback)
+        resolution = self._resolved.get(key)
+        if resolution is None:
+            resolution = self._resolved[key] = resolve_translation(obj, locale, fallback)
+        return resolution
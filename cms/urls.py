@@ -1,20 +1,29 @@
+from django.conf import settings
 from django.urls import path
 
-from cms import views
+from cms import async_views, sitemaps, views
+
+# Async variants of the hot read views when served over ASGI
+read_views = async_views if settings.CMS_ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("pages/<slug:slug>/", views.page_detail, name="cms-page-detail"),
+    path("pages/batch/", views.page_batch, name="cms-page-batch"),
+    path("pages/<slug:slug>/", read_views.page_detail, name="cms-page-detail"),
     path("countries/", views.countries_list, name="cms-countries-list"),
     path("cities/", views.cities_list, name="cms-cities-list"),
     path("destinations/", views.destinations_list, name="cms-destinations-list"),
-    path("destinations/<slug:slug>/", views.destination_detail, name="cms-destination-detail"),
+    path("destinations/<slug:slug>/", read_views.destination_detail, name="cms-destination-detail"),
     path("blog/", views.blog_posts_list, name="cms-blog-posts-list"),
     path("blog/categories/", views.blog_categories_list, name="cms-blog-categories-list"),
     path("blog/category/<slug:slug>/", views.blog_category_detail, name="cms-blog-category-detail"),
-    path("blog/<slug:slug>/", views.blog_post_detail, name="cms-blog-post-detail"),
+    path("blog/<slug:slug>/", read_views.blog_post_detail, name="cms-blog-post-detail"),
     path("media/", views.media_list, name="cms-media-list"),
-    path("navigation/", views.navigation_list, name="cms-navigation-list"),
-    path("footer/", views.footer_list, name="cms-footer-list"),
+    path("media/folders/", views.media_folders, name="cms-media-folders"),
+    path("navigation/", read_views.navigation_list, name="cms-navigation-list"),
+    path("footer/", read_views.footer_list, name="cms-footer-list"),
     path("homepage-categories/", views.homepage_categories, name="cms-homepage-categories"),
-    path("resolve-translation/", views.resolve_translation, name="cms-resolve-translation"),
+    path("layout/", views.layout, name="cms-layout"),
+    path("resolve-translation/", read_views.resolve_translation, name="cms-resolve-translation"),
+    path("sitemap.xml", sitemaps.sitemap_index, name="cms-sitemap-index"),
+    path("sitemap-<slug:section>-<int:chunk>.xml", sitemaps.sitemap_section, name="cms-sitemap-section"),
 ]
@@ -1,61 +1,74 @@
-from typing import Optional
+import hashlib
 
-from django.db.models import Prefetch, Q
+from django.db.models import Count, Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ParseError
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from backend.compression import set_compression_key
 from cms.models import (
     Page, PageTranslation, MediaFile, NavigationMenuItem, FooterBlock,
     Destination, DestinationTranslation, BlogPost, BlogPostTranslation, BlogCategory,
-    HomepageCategory, HomepageCategoryTranslation
+    HomepageCategory, HomepageCategoryTranslation, SUPPORTED_LOCALES,
 )
 from cms.serializers import PageDetailSerializer, MediaFileSerializer, NavigationMenuItemSerializer, FooterBlockSerializer, HomepageCategorySerializer
+from cms.cache import FOOTER, HOMEPAGE_CATEGORIES, NAVIGATION, cached_fragment
+from cms.snapshots import get_snapshot_response
+from cms.media_folders import folder_tree
+from cms.search import filter_folder, search_media
+from cms.translations import FALLBACK_LOCALE
+
+
+def _published_counts(model, parent: str, **filters) -> dict:
+    """``{parent pk: published rows}`` in one grouped query, for the serializers' ``*_count`` fields."""
+    rows = (
+        model.objects.filter(is_published=True, **filters)
+        .values(parent)
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    return {row[parent]: row["count"] for row in rows}
 
 
-FALLBACK_LOCALE = "en"
-
-
-def _select_translation(page: Page, locale: Optional[str]) -> Optional[PageTranslation]:
-    translations = list(page.translations.all())
-    if not translations:
-        return None
-
-    translations_by_locale = {translation.locale: translation for translation in translations}
-
-    if locale and locale in translations_by_locale:
-        return translations_by_locale[locale]
-
-    if FALLBACK_LOCALE in translations_by_locale:
-        return translations_by_locale[FALLBACK_LOCALE]
-
-    return translations[0]
+def _looks_up_snapshot(request: Request) -> bool:
+    """
+    Snapshots hold the full representation, so ?fields=/?exclude= is rendered
+    live. ``cms.async_views`` marks requests whose snapshot it already missed.
+    """
+    if getattr(request, "_snapshot_missed", False):
+        return False
+    return "fields" not in request.query_params and "exclude" not in request.query_params
 
 
 @api_view(["GET"])
 def page_detail(request: Request, slug: str) -> Response:
     locale = request.query_params.get("locale")
 
+    # Pre-rendered at publish time, see cms.snapshots
+    if _looks_up_snapshot(request):
+        snapshot = get_snapshot_response(request, "page", slug, locale)
+        if snapshot is not None:
+            return snapshot
+
     try:
-        page = (
-            Page.objects.filter(is_published=True, slug=slug)
-            .prefetch_related(
-                Prefetch(
-                    "translations", 
-                    queryset=PageTranslation.objects.prefetch_related("sections").order_by("locale")
-                )
+        queryset = Page.objects.filter(is_published=True, slug=slug).prefetch_related(
+            Prefetch(
+                "translations", 
+                queryset=PageTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale")
             )
-            .get()
         )
+        page = PageDetailSerializer.prune_queryset(queryset, request).get()
     except Page.DoesNotExist:
         return Response({"detail": "Page not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    translation = _select_translation(page, locale)
     serializer = PageDetailSerializer(
         page,
         context={
-            "translation": translation,
             "requested_locale": locale,
             "request": request,
         },
@@ -65,12 +78,89 @@ def page_detail(request: Request, slug: str) -> Response:
     return Response(payload)
 
 
+MAX_BATCH_PAGES = 5000
+
+
+def _batch_page_pairs(request: Request) -> list:
+    """(slug, locale) pairs requested from ``page_batch``; locale "" means no locale."""
+    if request.method == "POST":
+        pages = request.data.get("pages", []) if isinstance(request.data, dict) else None
+        if not isinstance(pages, list):
+            raise ParseError('Expected a JSON object like {"pages": [{"slug": ..., "locale": ...}]}.')
+        return [
+            (str(item.get("slug", "")), str(item.get("locale") or ""))
+            for item in pages
+            if isinstance(item, dict)
+        ]
+
+    pairs = request.query_params.get("pages")
+    if pairs:
+        return [tuple(pair.partition(":")[::2]) for pair in pairs.split(",") if pair]
+
+    slugs = [slug for slug in request.query_params.get("slugs", "").split(",") if slug]
+    if not slugs:
+        slugs = list(Page.objects.filter(is_published=True).values_list("slug", flat=True))
+    locales = [locale for locale in request.query_params.get("locales", "").split(",") if locale]
+    if not locales:
+        locales = [code for code, _ in SUPPORTED_LOCALES]
+    return [(slug, locale) for slug in slugs for locale in locales]
+
+
+@api_view(["GET", "POST"])
+def page_batch(request: Request):
+    """
+    Many page details in one response, streamed as JSON Lines.
+
+    Query parameters (GET):
+    - pages: Explicit pairs, e.g. 'home:en,about:fr' (omit ':locale' for no locale)
+    - slugs: Page slugs - defaults to all published pages
+    - locales: Locales for every slug - defaults to all supported locales
+
+    POST accepts {"pages": [{"slug": "home", "locale": "fr"}, ...]} for long lists.
+
+    Each line is {"slug", "locale", "status", "data"} with the page_detail
+    payload, or a "detail" message with status 404. Pages, translations,
+    sections and hero slides are loaded in four queries whatever the batch size.
+    """
+    pairs = _batch_page_pairs(request)
+    if len(pairs) > MAX_BATCH_PAGES:
+        return Response(
+            {"detail": f"At most {MAX_BATCH_PAGES} pages per batch."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    queryset = Page.objects.filter(
+        is_published=True, slug__in={slug for slug, _ in pairs}
+    ).prefetch_related(
+        Prefetch(
+            "translations",
+            queryset=PageTranslation.objects.order_by("locale").prefetch_related("sections", "hero_slides"),
+        )
+    )
+    pages = {page.slug: page for page in PageDetailSerializer.prune_queryset(queryset, request)}
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+    def lines():
+        for slug, locale in pairs:
+            page = pages.get(slug)
+            if page is None:
+                item = {"slug": slug, "locale": locale, "status": 404, "detail": "Page not found."}
+            else:
+                serializer = PageDetailSerializer(
+                    page, context={"requested_locale": locale or None, "request": request}
+                )
+                item = {"slug": slug, "locale": locale, "status": 200, "data": serializer.data}
+            yield renderer.render(item) + b"\n"
+
+    return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+
+
 # Destination views
 @api_view(["GET"])
 def countries_list(request: Request) -> Response:
     """List all published countries with content counts"""
     from django.db.models import Count, Q
-    from cms.models import Country
+    from cms.models import City, Country
     from cms.serializers import CountrySerializer
     
     countries = (
@@ -90,7 +180,12 @@ def countries_list(request: Request) -> Response:
         )
         .order_by("order", "name")
     )
-    serializer = CountrySerializer(countries, many=True, context={"request": request})
+    countries = CountrySerializer.prune_queryset(countries, request)
+    context = {
+        "request": request,
+        "published_cities_counts": _published_counts(City, "country"),
+    }
+    serializer = CountrySerializer(countries, many=True, context=context)
     return Response(serializer.data)
 
 
@@ -106,15 +201,20 @@ def cities_list(request: Request) -> Response:
     if country_slug:
         queryset = queryset.filter(country__slug=country_slug, country__is_published=True)
     
-    cities = queryset.order_by("order", "name")
-    serializer = CitySerializer(cities, many=True, context={"request": request})
+    cities = CitySerializer.prune_queryset(queryset.order_by("order", "name"), request)
+    context = {
+        "request": request,
+        "published_destinations_counts": _published_counts(Destination, "city", city__in=queryset.values("pk")),
+        "published_cities_counts": _published_counts(City, "country", country__in=queryset.values("country")),
+    }
+    serializer = CitySerializer(cities, many=True, context=context)
     return Response(serializer.data)
 
 
 @api_view(["GET"])
 def destinations_list(request: Request) -> Response:
     """List all published destinations, optionally filtered by country and/or city"""
-    from cms.models import Destination
+    from cms.models import City, Destination
     from cms.serializers import DestinationSerializer
     
     queryset = Destination.objects.filter(is_published=True).select_related("city__country")
@@ -128,8 +228,19 @@ def destinations_list(request: Request) -> Response:
     if city_slug:
         queryset = queryset.filter(city__slug=city_slug, city__is_published=True)
     
-    destinations = queryset.order_by("slug")
-    serializer = DestinationSerializer(destinations, many=True, context={"request": request})
+    destinations = queryset.prefetch_related(
+        Prefetch(
+            "translations",
+            queryset=DestinationTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale"),
+        )
+    )
+    destinations = DestinationSerializer.prune_queryset(destinations.order_by("slug"), request)
+    context = {
+        "request": request,
+        "published_destinations_counts": _published_counts(Destination, "city", city__in=queryset.values("city")),
+        "published_cities_counts": _published_counts(City, "country", country__in=queryset.values("city__country")),
+    }
+    serializer = DestinationSerializer(destinations, many=True, context=context)
     return Response(serializer.data)
 
 
@@ -141,18 +252,23 @@ def destination_detail(request: Request, slug: str) -> Response:
     
     locale = request.query_params.get("locale")
 
+    if _looks_up_snapshot(request):
+        snapshot = get_snapshot_response(request, "destination", slug, locale or getattr(request, "LANGUAGE_CODE", None))
+        if snapshot is not None:
+            return snapshot
+
     try:
-        destination = (
+        queryset = (
             Destination.objects.filter(is_published=True, slug=slug)
             .select_related("city__country")
             .prefetch_related(
                 Prefetch(
                     "translations", 
-                    queryset=DestinationTranslation.objects.prefetch_related("sections").order_by("locale")
+                    queryset=DestinationTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale")
                 )
             )
-            .get()
         )
+        destination = DestinationSerializer.prune_queryset(queryset, request).get()
     except Destination.DoesNotExist:
         return Response({"detail": "Destination not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -172,7 +288,9 @@ def blog_categories_list(request: Request) -> Response:
     from cms.serializers import BlogCategorySerializer
     
     categories = BlogCategory.objects.filter(is_published=True).order_by("order", "name")
-    serializer = BlogCategorySerializer(categories, many=True, context={"request": request})
+    categories = BlogCategorySerializer.prune_queryset(categories, request)
+    context = {"request": request, "published_posts_counts": _published_counts(BlogPost, "category")}
+    serializer = BlogCategorySerializer(categories, many=True, context=context)
     return Response(serializer.data)
 
 
@@ -196,11 +314,16 @@ def blog_posts_list(request: Request) -> Response:
     posts = queryset.prefetch_related(
         Prefetch(
             "translations", 
-            queryset=BlogPostTranslation.objects.prefetch_related("sections").order_by("locale")
+            queryset=BlogPostTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale")
         )
     ).order_by("-created_at")
+    posts = BlogPostSerializer.prune_queryset(posts, request)
     
-    serializer = BlogPostSerializer(posts, many=True, context={"request": request})
+    context = {
+        "request": request,
+        "published_posts_counts": _published_counts(BlogPost, "category", category__in=queryset.values("category")),
+    }
+    serializer = BlogPostSerializer(posts, many=True, context=context)
     return Response(serializer.data)
 
 
@@ -226,11 +349,13 @@ def blog_category_detail(request: Request, slug: str) -> Response:
     ).select_related("category").prefetch_related(
         Prefetch(
             "translations", 
-            queryset=BlogPostTranslation.objects.prefetch_related("sections").order_by("locale")
+            queryset=BlogPostTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale")
         )
     ).order_by("-created_at")
+    posts = BlogPostSerializer.prune_queryset(posts, request)
     
-    serializer = BlogPostSerializer(posts, many=True, context={"request": request})
+    context = {"request": request, "published_posts_counts": _published_counts(BlogPost, "category", category=category)}
+    serializer = BlogPostSerializer(posts, many=True, context=context)
     
     return Response({
         "category": {
@@ -251,18 +376,23 @@ def blog_post_detail(request: Request, slug: str) -> Response:
     
     locale = request.query_params.get("locale")
 
+    if _looks_up_snapshot(request):
+        snapshot = get_snapshot_response(request, "blog_post", slug, locale or getattr(request, "LANGUAGE_CODE", None))
+        if snapshot is not None:
+            return snapshot
+
     try:
-        post = (
+        queryset = (
             BlogPost.objects.filter(is_published=True, slug=slug)
             .select_related("category")
             .prefetch_related(
                 Prefetch(
                     "translations", 
-                    queryset=BlogPostTranslation.objects.prefetch_related("sections").order_by("locale")
+                    queryset=BlogPostTranslation.objects.prefetch_related("sections", "hero_slides").order_by("locale")
                 )
             )
-            .get()
         )
+        post = BlogPostSerializer.prune_queryset(queryset, request).get()
     except BlogPost.DoesNotExist:
         return Response({"detail": "Blog post not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -280,65 +410,95 @@ def media_list(request: Request) -> Response:
     API endpoint for media files - supports search and filtering.
     
     Query parameters:
-    - q: Search query for name or filename
-    - folder: Filter by folder path (e.g., 'uploads/page_hero_slides/')
+    - q: Search query; every word must start a word of the name or file path
+    - folder: Filter by folder path, including subfolders (e.g., 'uploads/page_hero_slides/')
     """
     queryset = MediaFile.objects.all().order_by('-uploaded_at')
     
-    # Search functionality
+    # Search functionality (token prefixes, see cms.search)
     search_query = request.query_params.get('q', '').strip()
     if search_query:
-        queryset = queryset.filter(
-            Q(name__icontains=search_query) |
-            Q(file__icontains=search_query)
-        )
+        queryset = search_media(queryset, search_query)
     
     # Folder filtering
     folder_filter = request.query_params.get('folder', '').strip()
     if folder_filter:
-        queryset = queryset.filter(file__startswith=folder_filter)
+        queryset = filter_folder(queryset, folder_filter)
     
     serializer = MediaFileSerializer(queryset, many=True, context={"request": request})
     return Response(serializer.data)
 
 
+@api_view(["GET"])
+def media_folders(request: Request) -> Response:
+    """
+    API endpoint for the media folder tree with file counts and sizes.
+    
+    Query parameters:
+    - folder: Return only this folder and its subfolders (e.g., 'uploads/')
+    
+    Each node is {"name", "path", "files", "bytes", "children"}; the counts
+    include subfolders. The root node ('' path) holds the library totals.
+    """
+    folder = request.query_params.get('folder', '').strip()
+    tree = folder_tree(folder)
+    if tree is None:
+        return Response({"detail": "Folder not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(tree)
+
+
 @api_view(["GET"])
 def navigation_list(request: Request) -> Response:
     """
-    API endpoint for navigation menu items.
+    API endpoint for navigation menu items, served from the fragment cache (see cms.cache).
     
     Query parameters:
     - locale: Filter by locale (e.g., 'en', 'fr') - defaults to 'en'
     """
     locale = request.query_params.get('locale', 'en')
-    
-    # Get active navigation items for the specified locale
-    queryset = NavigationMenuItem.objects.filter(
+    data, _ = cached_fragment(NAVIGATION, locale, lambda: _navigation_data(locale))
+    return Response(data)
+
+
+def _navigation_queryset(locale: str):
+    # Active navigation items for the specified locale
+    # resolved_href holds the link, so the linked content is never joined
+    return NavigationMenuItem.objects.filter(
         locale=locale,
         is_active=True
+    ).only(
+        'label', 'order', 'resolved_href',
     ).order_by('order', 'label')
-    
-    serializer = NavigationMenuItemSerializer(queryset, many=True)
-    return Response(serializer.data)
+
+
+def _navigation_data(locale: str) -> list:
+    serializer = NavigationMenuItemSerializer(_navigation_queryset(locale), many=True)
+    return serializer.data
 
 
 @api_view(["GET"])
 def footer_list(request: Request) -> Response:
     """
-    API endpoint for footer blocks.
+    API endpoint for footer blocks, served from the fragment cache (see cms.cache).
     
     Query parameters:
     - locale: Filter by locale (e.g., 'en', 'fr') - defaults to 'en'
     """
     locale = request.query_params.get('locale', 'en')
-    
-    # Get footer blocks for the specified locale with their links
-    queryset = FooterBlock.objects.filter(
+    data, _ = cached_fragment(FOOTER, locale, lambda: _footer_data(locale))
+    return Response(data)
+
+
+def _footer_queryset(locale: str):
+    # Footer blocks for the specified locale with their links
+    return FooterBlock.objects.filter(
         locale=locale
     ).prefetch_related('links').order_by('order', 'title')
-    
-    serializer = FooterBlockSerializer(queryset, many=True)
-    return Response(serializer.data)
+
+
+def _footer_data(locale: str) -> list:
+    serializer = FooterBlockSerializer(_footer_queryset(locale), many=True)
+    return serializer.data
 
 
 @api_view(["GET"])
@@ -356,204 +516,113 @@ def resolve_translation(request: Request) -> Response:
     content_type = request.query_params.get('content_type', '').strip()
     target_locale = request.query_params.get('locale', 'en').strip()
     current_path = request.query_params.get('current_path', '').strip()
-    
+    return Response(_translation_target(slug, content_type, target_locale, current_path))
+
+
+def _translation_target(slug: str, content_type: str, target_locale: str, current_path: str) -> dict:
+    """The ``{"found", "url", "reason"}`` answer of ``resolve_translation`` (also used by ``cms.async_views``)."""
     # Validate required parameters
     if not content_type:
-        return Response({
-            "found": False,
-            "url": f"/{target_locale}",
-            "reason": "missing_content_type"
-        })
-    
+        return {"found": False, "url": f"/{target_locale}", "reason": "missing_content_type"}
+
     # Slug is required for most content types but can be empty for home
     if not slug and content_type != 'home':
-        return Response({
-            "found": False,
-            "url": f"/{target_locale}",
-            "reason": "missing_slug"
-        })
-    
+        return {"found": False, "url": f"/{target_locale}", "reason": "missing_slug"}
+
     # Validate target locale
-    valid_locales = ['en', 'fr', 'nl', 'es', 'pt']
-    if target_locale not in valid_locales:
-        return Response({
-            "found": False,
-            "url": f"/en",
-            "reason": "invalid_locale"
-        })
-    
+    if target_locale not in ['en', 'fr', 'nl', 'es', 'pt']:
+        return {"found": False, "url": "/en", "reason": "invalid_locale"}
+
     try:
-        # Static pages (about, contact, privacy, etc.) - same slug across locales
-        if content_type == 'static':
-            return Response({
-                "found": True,
-                "url": f"/{target_locale}/{slug}/",
-                "reason": "static_page"
-            })
-        
-        # Home page
-        elif content_type == 'home':
-            return Response({
-                "found": True,
-                "url": f"/{target_locale}/",
-                "reason": "home_page"
-            })
-        
-        # CMS Pages
-        elif content_type == 'page':
-            try:
-                # Find the page by slug
-                page = Page.objects.get(slug=slug)
-                # Look for translation in target locale
-                translation = PageTranslation.objects.filter(
-                    page=page, locale=target_locale
-                ).first()
-                
-                if translation:
-                    return Response({
-                        "found": True,
-                        "url": f"/{target_locale}/{page.slug}/",
-                        "reason": "page_translated"
-                    })
-                else:
-                    return Response({
-                        "found": False,
-                        "url": f"/{target_locale}/",
-                        "reason": "page_translation_missing"
-                    })
-            except Page.DoesNotExist:
-                return Response({
-                    "found": False,
-                    "url": f"/{target_locale}/",
-                    "reason": "page_not_found"
-                })
-        
-        # Destinations (country/city/destination)
-        elif content_type == 'destination':
-            try:
-                # Parse path to extract destination parts
-                path_parts = current_path.strip('/').split('/')
-                
-                # Remove locale and 'destinations' from path
-                if len(path_parts) >= 2 and path_parts[1] == 'destinations':
-                    dest_parts = path_parts[2:]  # Get parts after /locale/destinations/
-                    
-                    if len(dest_parts) >= 3:
-                        # Full destination path: /locale/destinations/country/city/destination
-                        country_slug, city_slug, dest_slug = dest_parts[:3]
-                        try:
-                            destination = Destination.objects.get(slug=dest_slug)
-                            translation = DestinationTranslation.objects.filter(
-                                destination=destination, locale=target_locale
-                            ).first()
-                            
-                            if translation:
-                                return Response({
-                                    "found": True,
-                                    "url": f"/{target_locale}/destinations/{country_slug}/{city_slug}/{dest_slug}/",
-                                    "reason": "destination_translated"
-                                })
-                        except Destination.DoesNotExist:
-                            pass
-                    
-                    elif len(dest_parts) >= 2:
-                        # City path: /locale/destinations/country/city
-                        country_slug, city_slug = dest_parts[:2]
-                        return Response({
-                            "found": True,
-                            "url": f"/{target_locale}/destinations/{country_slug}/{city_slug}/",
-                            "reason": "city_page"
-                        })
-                    
-                    elif len(dest_parts) >= 1:
-                        # Country path: /locale/destinations/country
-                        country_slug = dest_parts[0]
-                        return Response({
-                            "found": True,
-                            "url": f"/{target_locale}/destinations/{country_slug}/",
-                            "reason": "country_page"
-                        })
-                
-                # Default to destinations index
-                return Response({
-                    "found": True,
-                    "url": f"/{target_locale}/destinations/",
-                    "reason": "destinations_index"
-                })
-                
-            except Exception:
-                return Response({
-                    "found": False,
-                    "url": f"/{target_locale}/destinations/",
-                    "reason": "destination_parsing_error"
-                })
-        
-        # Blog Posts
-        elif content_type == 'blog_post':
+        return _resolve_content(slug, content_type, target_locale, current_path)
+    except Exception as e:
+        return {"found": False, "url": f"/{target_locale}/", "reason": f"error: {str(e)}"}
+
+
+def _resolve_content(slug: str, content_type: str, target_locale: str, current_path: str) -> dict:
+    # Static pages (about, contact, privacy, etc.) - same slug across locales
+    if content_type == 'static':
+        return {"found": True, "url": f"/{target_locale}/{slug}/", "reason": "static_page"}
+
+    # Home page
+    if content_type == 'home':
+        return {"found": True, "url": f"/{target_locale}/", "reason": "home_page"}
+
+    # CMS Pages
+    if content_type == 'page':
+        try:
+            page = Page.objects.get(slug=slug)
+        except Page.DoesNotExist:
+            return {"found": False, "url": f"/{target_locale}/", "reason": "page_not_found"}
+        if PageTranslation.objects.filter(page=page, locale=target_locale).exists():
+            return {"found": True, "url": f"/{target_locale}/{page.slug}/", "reason": "page_translated"}
+        return {"found": False, "url": f"/{target_locale}/", "reason": "page_translation_missing"}
+
+    # Destinations (country/city/destination)
+    if content_type == 'destination':
+        try:
+            return _resolve_destination(target_locale, current_path)
+        except Exception:
+            return {"found": False, "url": f"/{target_locale}/destinations/", "reason": "destination_parsing_error"}
+
+    # Blog Posts
+    if content_type == 'blog_post':
+        try:
+            blog_post = BlogPost.objects.get(slug=slug)
+        except BlogPost.DoesNotExist:
+            return {"found": False, "url": f"/{target_locale}/blog/", "reason": "blog_post_not_found"}
+        if BlogPostTranslation.objects.filter(post=blog_post, locale=target_locale).exists():
+            return {"found": True, "url": f"/{target_locale}/blog/{blog_post.slug}/", "reason": "blog_post_translated"}
+        return {"found": False, "url": f"/{target_locale}/blog/", "reason": "blog_post_translation_missing"}
+
+    # Blog Categories (no translations, same slug)
+    if content_type == 'blog_category':
+        try:
+            category = BlogCategory.objects.get(slug=slug)
+        except BlogCategory.DoesNotExist:
+            return {"found": False, "url": f"/{target_locale}/blog/", "reason": "blog_category_not_found"}
+        return {"found": True, "url": f"/{target_locale}/blog/category/{category.slug}/", "reason": "blog_category"}
+
+    # Blog Index
+    if content_type == 'blog':
+        return {"found": True, "url": f"/{target_locale}/blog/", "reason": "blog_index"}
+
+    return {"found": False, "url": f"/{target_locale}/", "reason": "unknown_content_type"}
+
+
+def _resolve_destination(target_locale: str, current_path: str) -> dict:
+    path_parts = current_path.strip('/').split('/')
+
+    # Path after /<locale>/destinations/: <country>/<city>/<destination>
+    if len(path_parts) >= 2 and path_parts[1] == 'destinations':
+        dest_parts = path_parts[2:]
+
+        if len(dest_parts) >= 3:
+            country_slug, city_slug, dest_slug = dest_parts[:3]
             try:
-                blog_post = BlogPost.objects.get(slug=slug)
-                translation = BlogPostTranslation.objects.filter(
-                    post=blog_post, locale=target_locale
-                ).first()
-                
-                if translation:
-                    return Response({
+                destination = Destination.objects.get(slug=dest_slug)
+                if DestinationTranslation.objects.filter(destination=destination, locale=target_locale).exists():
+                    return {
                         "found": True,
-                        "url": f"/{target_locale}/blog/{blog_post.slug}/",
-                        "reason": "blog_post_translated"
-                    })
-                else:
-                    return Response({
-                        "found": False,
-                        "url": f"/{target_locale}/blog/",
-                        "reason": "blog_post_translation_missing"
-                    })
-            except BlogPost.DoesNotExist:
-                return Response({
-                    "found": False,
-                    "url": f"/{target_locale}/blog/",
-                    "reason": "blog_post_not_found"
-                })
-        
-        # Blog Categories
-        elif content_type == 'blog_category':
-            try:
-                category = BlogCategory.objects.get(slug=slug)
-                # Blog categories don't have translations, use same slug
-                return Response({
-                    "found": True,
-                    "url": f"/{target_locale}/blog/category/{category.slug}/",
-                    "reason": "blog_category"
-                })
-            except BlogCategory.DoesNotExist:
-                return Response({
-                    "found": False,
-                    "url": f"/{target_locale}/blog/",
-                    "reason": "blog_category_not_found"
-                })
-        
-        # Blog Index
-        elif content_type == 'blog':
-            return Response({
+                        "url": f"/{target_locale}/destinations/{country_slug}/{city_slug}/{dest_slug}/",
+                        "reason": "destination_translated",
+                    }
+            except Destination.DoesNotExist:
+                pass
+
+        elif len(dest_parts) >= 2:
+            country_slug, city_slug = dest_parts[:2]
+            return {
                 "found": True,
-                "url": f"/{target_locale}/blog/",
-                "reason": "blog_index"
-            })
-        
-        # Unknown content type
-        else:
-            return Response({
-                "found": False,
-                "url": f"/{target_locale}/",
-                "reason": "unknown_content_type"
-            })
-    
-    except Exception as e:
-        return Response({
-            "found": False,
-            "url": f"/{target_locale}/",
-            "reason": f"error: {str(e)}"
-        })
+                "url": f"/{target_locale}/destinations/{country_slug}/{city_slug}/",
+                "reason": "city_page",
+            }
+
+        elif len(dest_parts) >= 1:
+            return {"found": True, "url": f"/{target_locale}/destinations/{dest_parts[0]}/", "reason": "country_page"}
+
+    # Default to destinations index
+    return {"found": True, "url": f"/{target_locale}/destinations/", "reason": "destinations_index"}
 
 
 @api_view(['GET'])
@@ -568,7 +637,10 @@ def homepage_categories(request: Request) -> Response:
     - Array of category objects with slug, title, description, image, order
     """
     locale = request.GET.get('locale', FALLBACK_LOCALE)
-    
+    return Response(_homepage_categories_data(request, locale))
+
+
+def _homepage_categories_data(request: Request, locale: str) -> list:
     # Fetch published category translations for the requested locale
     # where the parent category is active
     categories = HomepageCategoryTranslation.objects.filter(
@@ -578,4 +650,44 @@ def homepage_categories(request: Request) -> Response:
     ).select_related('category').order_by('category__order', 'category__slug')
     
     serializer = HomepageCategorySerializer(categories, many=True, context={'request': request})
-    return Response(serializer.data)
+    return serializer.data
+
+
+@api_view(['GET'])
+def layout(request: Request) -> Response:
+    """
+    Per-locale layout bundle: navigation, footer and homepage categories in one response.
+    
+    Query parameters:
+    - locale: Language code (e.g., 'en', 'fr') - defaults to 'en'
+    
+    Each part is served from the fragment cache (see cms.cache); the ETag
+    combines the fragment ETags so unchanged layouts answer 304.
+    """
+    locale = request.query_params.get('locale', FALLBACK_LOCALE)
+    # Homepage category images are absolute URLs, so the origin is part of the variant
+    origin = request.build_absolute_uri('/')
+
+    navigation, navigation_etag = cached_fragment(NAVIGATION, locale, lambda: _navigation_data(locale))
+    footer, footer_etag = cached_fragment(FOOTER, locale, lambda: _footer_data(locale))
+    categories, categories_etag = cached_fragment(
+        HOMEPAGE_CATEGORIES,
+        f"{locale}:{origin}",
+        lambda: _homepage_categories_data(request, locale),
+    )
+
+    etag = '"%s"' % hashlib.sha1(
+        f"{locale}:{navigation_etag}:{footer_etag}:{categories_etag}".encode()
+    ).hexdigest()
+    # Compressed responses carry the weak form of the ETag
+    client_etags = {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}
+    if etag in client_etags:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    response = Response({
+        "locale": locale,
+        "navigation": navigation,
+        "footer": footer,
+        "homepage_categories": categories,
+    }, headers={'ETag': etag})
+    return set_compression_key(response, f"layout:{etag}")
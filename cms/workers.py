@@ -0,0 +1,21 @@
+"""
+Initializer for the process pools of the cms management commands.
+
+With the ``spawn`` start method (the default on Windows and macOS) a worker
+starts as a fresh interpreter without settings or app registry, and it has
+to import this module to unpickle the initializer, so it must not import
+models (or anything else that needs Django set up) at module level.
+"""
+
+import os
+
+
+def setup_django(settings_module: str) -> None:
+    """Process pool ``initializer``: configure Django in a worker that does not have it yet."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
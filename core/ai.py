@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import base64
 import os
+import time
 from typing import Optional, TypedDict
 
 from openai import OpenAI
 
+from monitoring.metrics import AI_DURATION, AI_REQUESTS
+
 
 class TravelPageDraft(TypedDict):
     """Structured draft payload returned by the AI helper."""
@@ -37,6 +41,7 @@ def generate_travel_page_draft(
 
     client = get_openai_client()
     if client is None:
+        AI_REQUESTS.inc("travel_page_draft", "unconfigured")
         raise RuntimeError("OPENAI_API_KEY is not configured in the environment.")
 
     location_label = city if city else country
@@ -70,13 +75,21 @@ def generate_travel_page_draft(
 
     prompt_text = "\n".join(user_prompt)
 
-    completion = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt_text},
-        ],
-    )
+    start = time.perf_counter()
+    try:
+        completion = client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt_text},
+            ],
+        )
+    except Exception:
+        AI_REQUESTS.inc("travel_page_draft", "error")
+        raise
+    finally:
+        AI_DURATION.observe(time.perf_counter() - start, "travel_page_draft")
+    AI_REQUESTS.inc("travel_page_draft", "ok")
 
     content = completion.choices[0].message.content or ""
     parts = [p.strip() for p in content.split("\n\n") if p.strip()]
@@ -90,3 +103,24 @@ def generate_travel_page_draft(
         "summary": summary,
         "body": body,
     }
+
+
+def generate_image(prompt: str, *, size: str = "1536x1024") -> bytes:
+    """Generate one image for ``prompt`` and return the encoded image bytes."""
+
+    client = get_openai_client()
+    if client is None:
+        AI_REQUESTS.inc("image", "unconfigured")
+        raise RuntimeError("OPENAI_API_KEY is not configured in the environment.")
+
+    start = time.perf_counter()
+    try:
+        result = client.images.generate(model="gpt-image-1", prompt=prompt, size=size, n=1)
+    except Exception:
+        AI_REQUESTS.inc("image", "error")
+        raise
+    finally:
+        AI_DURATION.observe(time.perf_counter() - start, "image")
+    AI_REQUESTS.inc("image", "ok")
+
+    return base64.b64decode(result.data[0].b64_json)
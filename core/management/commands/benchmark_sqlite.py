@@ -0,0 +1,154 @@
+"""Benchmark concurrent SQLite reads while an import is writing."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.database import DEFAULT_SQLITE_PRAGMAS, apply_sqlite_pragmas
+
+
+# Stock Django/SQLite behaviour: rollback journal, no mmap, default cache
+BASELINE_PRAGMAS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "busy_timeout": DEFAULT_SQLITE_PRAGMAS["busy_timeout"],
+}
+
+SCHEMA = """
+CREATE TABLE bench_country (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL,
+    slug VARCHAR(150) NOT NULL UNIQUE,
+    short_description TEXT NOT NULL,
+    is_published BOOL NOT NULL,
+    "order" INTEGER NOT NULL
+)
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare concurrent read throughput during a running import (rollback journal vs tuned WAL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8, help="Concurrent reader threads")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile")
+        parser.add_argument("--rows", type=int, default=5000, help="Rows seeded before the run")
+        parser.add_argument("--batch", type=int, default=500, help="Rows written per import transaction")
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING("SQLite concurrent read benchmark"))
+        self.stdout.write(
+            f"readers={options['readers']} duration={options['duration']}s "
+            f"rows={options['rows']} batch={options['batch']}"
+        )
+
+        results = {}
+        for label, pragmas in (("baseline", BASELINE_PRAGMAS), ("tuned", DEFAULT_SQLITE_PRAGMAS)):
+            results[label] = self._run_profile(pragmas, **options)
+            stats = results[label]
+            self.stdout.write(
+                f"{label:<9} reads/s={stats['reads_per_sec']:>10.1f}  "
+                f"read_errors={stats['read_errors']:<6} import_rows/s={stats['writes_per_sec']:>9.1f}"
+            )
+
+        baseline = results["baseline"]["reads_per_sec"] or 1
+        speedup = results["tuned"]["reads_per_sec"] / baseline
+        self.stdout.write(self.style.SUCCESS(f"Read throughput during import: {speedup:.2f}x baseline"))
+
+    def _run_profile(self, pragmas, readers, duration, rows, batch, **kwargs):
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        try:
+            self._seed(path, pragmas, rows)
+
+            stop = threading.Event()
+            counters = {"reads": 0, "read_errors": 0, "writes": 0}
+            lock = threading.Lock()
+
+            threads = [threading.Thread(target=self._importer, args=(path, pragmas, batch, stop, counters, lock))]
+            threads += [
+                threading.Thread(target=self._reader, args=(path, pragmas, stop, counters, lock))
+                for _ in range(readers)
+            ]
+
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            time.sleep(duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            return {
+                "reads_per_sec": counters["reads"] / elapsed,
+                "read_errors": counters["read_errors"],
+                "writes_per_sec": counters["writes"] / elapsed,
+            }
+        finally:
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    def _connect(self, path, pragmas):
+        conn = sqlite3.connect(path, timeout=pragmas["busy_timeout"] / 1000, isolation_level=None)
+        apply_sqlite_pragmas(conn.cursor(), pragmas)
+        return conn
+
+    def _seed(self, path, pragmas, rows):
+        conn = self._connect(path, pragmas)
+        conn.execute(SCHEMA)
+        conn.execute("BEGIN")
+        conn.executemany(
+            'INSERT INTO bench_country (name, slug, short_description, is_published, "order") VALUES (?, ?, ?, 1, ?)',
+            ((f"Country {i}", f"country-{i}", "Lorem ipsum " * 20, i) for i in range(rows)),
+        )
+        conn.execute("COMMIT")
+        conn.close()
+
+    def _importer(self, path, pragmas, batch, stop, counters, lock):
+        """Mimic the admin JSON import: one big transaction of upserts per batch."""
+        conn = self._connect(path, pragmas)
+        offset = 0
+        while not stop.is_set():
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for i in range(offset, offset + batch):
+                    conn.execute(
+                        'INSERT INTO bench_country (name, slug, short_description, is_published, "order") '
+                        "VALUES (?, ?, ?, 1, ?) "
+                        "ON CONFLICT(slug) DO UPDATE SET short_description = excluded.short_description",
+                        (f"Imported {i}", f"imported-{i % 10000}", "Imported text " * 20, i),
+                    )
+                conn.execute("COMMIT")
+            except sqlite3.OperationalError:
+                # BEGIN IMMEDIATE itself may be the statement that found the database locked
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                continue
+            offset += batch
+            with lock:
+                counters["writes"] += batch
+        conn.close()
+
+    def _reader(self, path, pragmas, stop, counters, lock):
+        """Mimic countries_list: a published listing ordered like the API."""
+        conn = self._connect(path, pragmas)
+        reads = errors = 0
+        while not stop.is_set():
+            try:
+                conn.execute(
+                    'SELECT id, name, slug, short_description FROM bench_country '
+                    'WHERE is_published = 1 ORDER BY "order", name LIMIT 50'
+                ).fetchall()
+                reads += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        conn.close()
+        with lock:
+            counters["reads"] += reads
+            counters["read_errors"] += errors
@@ -0,0 +1,108 @@
+"""Load test the API and watch how many PostgreSQL connections it holds."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+DEFAULT_PATHS = [
+    "/api/cms/navigation/?locale=en",
+    "/api/cms/footer/?locale=en",
+    "/api/cms/countries/",
+    "/api/cms/blog/?locale=en",
+    "/api/cms/homepage-categories/?locale=en",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the API with many concurrent clients while sampling pg_stat_activity, "
+        "to check that pooled connection counts stay bounded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Running backend to load")
+        parser.add_argument("--clients", type=int, default=500, help="Concurrent API clients")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+        parser.add_argument("--path", action="append", dest="paths", help="API path to request (repeatable)")
+        parser.add_argument(
+            "--max-connections",
+            type=int,
+            default=None,
+            help="Fail if the backend ever holds more connections than this (e.g. workers x pool max_size)",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Connection sampling needs PostgreSQL (DJANGO_DB_ENGINE=postgres).")
+
+        paths = options["paths"] or DEFAULT_PATHS
+        samples = []
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample_connections, args=(samples, stop))
+        sampler.start()
+
+        try:
+            stats = asyncio.run(
+                self._run_clients(options["base_url"], paths, options["clients"], options["duration"])
+            )
+        finally:
+            stop.set()
+            sampler.join()
+
+        peak = max(samples) if samples else 0
+        average = sum(samples) / len(samples) if samples else 0
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Connection load test"))
+        self.stdout.write(f"clients:            {options['clients']}")
+        self.stdout.write(f"requests:           {stats['requests']}")
+        self.stdout.write(f"errors:             {stats['errors']}")
+        self.stdout.write(f"requests/sec:       {stats['requests'] / options['duration']:.1f}")
+        self.stdout.write(f"db connections avg: {average:.1f}")
+        self.stdout.write(f"db connections max: {peak}")
+
+        limit = options["max_connections"]
+        if limit is not None and peak > limit:
+            raise CommandError(f"Connection count {peak} exceeded the bound of {limit}.")
+        self.stdout.write(self.style.SUCCESS("Connection count stayed bounded."))
+
+    def _sample_connections(self, samples, stop):
+        """Count backend connections to this database (excluding the sampler)."""
+        try:
+            with connection.cursor() as cursor:
+                while not stop.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND pid <> pg_backend_pid()"
+                    )
+                    samples.append(cursor.fetchone()[0])
+                    stop.wait(0.5)
+        finally:
+            connection.close()
+
+    async def _run_clients(self, base_url, paths, clients, duration):
+        stats = {"requests": 0, "errors": 0}
+        deadline = time.monotonic() + duration
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+            async def worker(offset):
+                index = offset
+                while time.monotonic() < deadline:
+                    try:
+                        response = await client.get(paths[index % len(paths)])
+                        if response.status_code >= 500:
+                            stats["errors"] += 1
+                    except httpx.HTTPError:
+                        stats["errors"] += 1
+                    stats["requests"] += 1
+                    index += 1
+
+            await asyncio.gather(*(worker(i) for i in range(clients)))
+
+        return stats
@@ -35,7 +35,7 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
 class TravelPageViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = TravelPage.objects.select_related(
         "country",
-        "city",
+        "city__country",
         "category",
     ).all()
     serializer_class = TravelPageSerializer
@@ -4,7 +4,7 @@ REM Create placeholder images for blog posts
 cd /d "C:\projects\travelacrosseu"
 
 echo Creating placeholder images for blog posts...
-.\.venv\Scripts\python.exe create_blog_placeholder_images.py
+.\.venv\Scripts\python.exe manage.py sync_content_images --only blog
 
 echo.
 echo Done! Blog placeholder images created in media\images\blog\travel-stories\
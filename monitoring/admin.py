@@ -0,0 +1,85 @@
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+
+from monitoring.models import EndpointStats, RequestProfile
+
+
+@admin.register(EndpointStats)
+class EndpointStatsAdmin(admin.ModelAdmin):
+    list_display = ("url_name", "requests", "errors", "average_ms", "max_ms", "average_queries", "cache_hit_rate_display", "updated_at")
+    search_fields = ("url_name",)
+    readonly_fields = [field.name for field in EndpointStats._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def average_ms(self, obj):
+        return f"{obj.avg_ms:.1f}"
+    average_ms.short_description = "Avg ms"
+
+    def average_queries(self, obj):
+        return f"{obj.avg_queries:.1f}"
+    average_queries.short_description = "Avg queries"
+
+    def cache_hit_rate_display(self, obj):
+        return f"{obj.cache_hit_rate:.0%}"
+    cache_hit_rate_display.short_description = "Cache hit rate"
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "method", "path", "url_name", "status_code", "duration_display", "samples", "trigger")
+    list_filter = ("trigger", "url_name")
+    search_fields = ("path", "url_name")
+    date_hierarchy = "created_at"
+    exclude = ("top_frames", "collapsed_stacks")
+    readonly_fields = [
+        field.name for field in RequestProfile._meta.fields if field.name not in ("top_frames", "collapsed_stacks")
+    ] + ["top_frames_table", "collapsed_stacks_download"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                "<int:pk>/collapsed/",
+                self.admin_site.admin_view(self.collapsed_stacks_view),
+                name="monitoring_requestprofile_collapsed",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def collapsed_stacks_view(self, request, pk):
+        """The collapsed stacks as a file for flamegraph.pl or speedscope"""
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(profile.collapsed_stacks, content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="profile-{profile.pk}.collapsed"'
+        return response
+
+    def duration_display(self, obj):
+        return f"{obj.duration_ms:.0f} ms"
+    duration_display.short_description = "Duration"
+
+    def top_frames_table(self, obj):
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td><td><code>{}</code></td></tr>",
+            ((frame["self"], frame["total"], frame["frame"]) for frame in obj.top_frames),
+        )
+        return format_html(
+            "<table><thead><tr><th>Self</th><th>Total</th><th>Frame</th></tr></thead><tbody>{}</tbody></table>",
+            rows,
+        )
+    top_frames_table.short_description = "Top frames (samples)"
+
+    def collapsed_stacks_download(self, obj):
+        url = reverse("admin:monitoring_requestprofile_collapsed", args=[obj.pk])
+        return format_html('<a href="{}">Download collapsed stacks</a> (flamegraph.pl / speedscope)', url)
+    collapsed_stacks_download.short_description = "Flamegraph"
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast, NullIf
+from django.shortcuts import redirect, render
+from django.views.decorators.http import require_http_methods
+
+from monitoring import slow_queries, stats
+from monitoring.models import EndpointStats
+
+
+def _per_request(field: str):
+    return F(field) / Cast(NullIf(F("requests"), 0), FloatField())
+
+
+# ?sort= value -> ordering expression (slowest first)
+SORTS = {
+    "avg": _per_request("total_ms"),
+    "total": F("total_ms"),
+    "max": F("max_ms"),
+    "db": _per_request("db_ms"),
+    "queries": _per_request("queries"),
+    "serializer": _per_request("serializer_ms"),
+    "requests": F("requests"),
+}
+
+
+@staff_member_required
+def endpoint_performance(request):
+    """
+    Slowest endpoints by URL name, from the aggregated request timings
+    """
+    # Include this process' requests that are not flushed yet
+    stats.flush()
+
+    sort = request.GET.get("sort", "avg")
+    if sort not in SORTS:
+        sort = "avg"
+
+    endpoints = EndpointStats.objects.order_by(SORTS[sort].desc(nulls_last=True), "url_name")
+    totals = EndpointStats.objects.aggregate(requests=Sum("requests"), total_ms=Sum("total_ms"))
+
+    context = {
+        "title": "Endpoint Performance",
+        "endpoints": endpoints,
+        "sort": sort,
+        "sorts": list(SORTS),
+        "totals": totals,
+    }
+    return render(request, "admin/performance.html", context)
+
+
+@staff_member_required
+@require_http_methods(["GET", "POST"])
+def slow_query_log(request):
+    """
+    Slowest recent queries of this worker process, with view, serializer
+    field and EXPLAIN output; POST clears the buffer
+    """
+    if request.method == "POST":
+        slow_queries.clear()
+        return redirect("admin-slow-queries")
+
+    entries = slow_queries.slowest()
+    context = {
+        "title": "Slow Queries",
+        "entries": entries,
+        "threshold_ms": settings.MONITORING_SLOW_QUERY_MS,
+        "buffer_size": settings.MONITORING_SLOW_QUERY_BUFFER,
+    }
+    return render(request, "admin/slow_queries.html", context)
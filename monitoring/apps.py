@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+    verbose_name = "Performance Monitoring"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from monitoring.slow_queries import install_slow_query_logger
+        from monitoring.timing import install_query_timer, instrument_serializers
+
+        # The first wrapper is the outermost: the slow-query log (and its EXPLAIN)
+        # must stay outside the request's query timing
+        connection_created.connect(install_slow_query_logger, dispatch_uid="monitoring.install_slow_query_logger")
+        connection_created.connect(install_query_timer, dispatch_uid="monitoring.install_query_timer")
+        instrument_serializers()
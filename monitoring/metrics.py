@@ -0,0 +1,267 @@
+"""
+Prometheus-style counters and histograms, served as text at ``/metrics``.
+
+Metrics are declared once at import time and updated in memory under a
+lock: an increment is a dict lookup and an addition. Label values are
+passed positionally in the order of the declared label names::
+
+    REQUESTS.inc("cms-page-detail", "GET", "200")
+    REQUEST_DURATION.observe(0.012, "cms-page-detail")
+
+With several worker processes (gunicorn), set ``MONITORING_METRICS_DIR``:
+each process writes its values to ``metrics-<pid>-<start>.json`` there
+every ``MONITORING_FLUSH_SECONDS`` and on every scrape, and ``/metrics`` adds
+up the files of all processes. The start time keeps a recycled pid from
+overwriting (and resetting) the file of an earlier worker. Files of exited
+workers are kept so counters never go backwards; clear the directory when
+the service restarts.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+AI_LATENCY_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_lock = threading.Lock()
+_registry = {}
+_writer = None
+_process_file = None
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        with _lock:
+            if name in _registry:
+                raise ValueError(f"Metric {name} is already registered")
+            _registry[name] = self
+
+    def _key(self, label_values: tuple) -> tuple:
+        if len(label_values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {label_values}")
+        return tuple(str(value) for value in label_values)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        super().__init__(name, documentation, labels)
+        self._values = defaultdict(float)
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        key = self._key(label_values)
+        with _lock:
+            self._values[key] += amount
+
+    def snapshot(self) -> dict:
+        return {key: value for key, value in self._values.items()}
+
+    @staticmethod
+    def merge(total, value):
+        return (total or 0) + value
+
+    def samples(self, values: dict):
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labels, key)), value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (not cumulative) ..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        key = self._key(label_values)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with _lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def snapshot(self) -> dict:
+        return {key: list(entry) for key, entry in self._values.items()}
+
+    @staticmethod
+    def merge(total, value):
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+    def samples(self, values: dict):
+        for key, entry in sorted(values.items()):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), entry[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_bound(bound)}, cumulative
+            yield f"{self.name}_count", labels, cumulative
+            yield f"{self.name}_sum", labels, entry[-1]
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_sample(name: str, labels: dict, value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{label}="{_escape(text)}"' for label, text in labels.items())
+        name = f"{name}{{{rendered}}}"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return f"{name} {value}"
+
+
+# -- Metrics ------------------------------------------------------------------
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by URL name, method and status.", ("route", "method", "status"))
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Time to build the response.", ("route",))
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries per request.", ("route",), buckets=QUERY_BUCKETS
+)
+REQUEST_DB_DURATION = Histogram("http_request_db_duration_seconds", "Database time per request.", ("route",))
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Fragment, snapshot and compression cache lookups.", ("route", "result"))
+
+AI_REQUESTS = Counter("ai_requests_total", "Calls to the AI content generator.", ("operation", "outcome"))
+AI_DURATION = Histogram(
+    "ai_request_duration_seconds", "Duration of AI content generator calls.", ("operation",), buckets=AI_LATENCY_BUCKETS
+)
+
+IMPORT_ITEMS = Counter("import_items_total", "Items processed by admin JSON imports.", ("model", "result"))
+IMPORT_DURATION = Histogram("import_duration_seconds", "Duration of admin JSON imports.", ("model",))
+
+
+def observe_request(route: str, method: str, status_code: int, timings) -> None:
+    """Record a finished request (called by ``RequestTimingMiddleware``)."""
+    REQUESTS.inc(route, method, status_code)
+    REQUEST_DURATION.observe(timings.total_time, route)
+    REQUEST_QUERIES.observe(timings.queries, route)
+    REQUEST_DB_DURATION.observe(timings.db_time, route)
+    if timings.cache_hits:
+        CACHE_LOOKUPS.inc(route, "hit", amount=timings.cache_hits)
+    if timings.cache_misses:
+        CACHE_LOOKUPS.inc(route, "miss", amount=timings.cache_misses)
+    _ensure_writer()
+
+
+# -- Multiprocess aggregation -------------------------------------------------
+
+def _snapshot() -> dict:
+    with _lock:
+        return {name: metric.snapshot() for name, metric in _registry.items()}
+
+
+def _metrics_dir() -> Optional[Path]:
+    directory = settings.MONITORING_METRICS_DIR
+    return Path(directory) if directory else None
+
+
+def _process_file_name() -> str:
+    """``metrics-<pid>-<start>.json``, fixed for the lifetime of this process."""
+    global _process_file
+    pid = os.getpid()
+    # A forked worker inherits the variable of its parent
+    if _process_file is None or _process_file[0] != pid:
+        _process_file = (pid, f"metrics-{pid}-{time.time_ns()}.json")
+    return _process_file[1]
+
+
+def write_snapshot() -> None:
+    """Write this process's values to ``MONITORING_METRICS_DIR`` (no-op without it)."""
+    directory = _metrics_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    data = {
+        name: [[list(key), value] for key, value in values.items()]
+        for name, values in _snapshot().items()
+    }
+    path = directory / _process_file_name()
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def _collect() -> dict:
+    """Values of all processes: metric name -> label values -> merged value."""
+    directory = _metrics_dir()
+    if directory is None:
+        return _snapshot()
+
+    write_snapshot()
+    merged = defaultdict(dict)
+    for path in directory.glob("metrics-*.json"):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for name, values in data.items():
+            metric = _registry.get(name)
+            if metric is None:
+                continue
+            for key, value in values:
+                key = tuple(key)
+                merged[name][key] = metric.merge(merged[name].get(key), value)
+    return merged
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    values = _collect()
+    lines = []
+    for name, metric in _registry.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        lines.extend(_format_sample(*sample) for sample in metric.samples(values.get(name, {})))
+    return "\n".join(lines) + "\n"
+
+
+def _write_forever(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            write_snapshot()
+        except OSError:
+            pass
+
+
+def _ensure_writer() -> None:
+    global _writer
+    interval = settings.MONITORING_FLUSH_SECONDS
+    # A forked worker inherits the variable but not the thread
+    if (_writer is not None and _writer[0] == os.getpid()) or not interval or _metrics_dir() is None:
+        return
+    with _lock:
+        if _writer is None or _writer[0] != os.getpid():
+            thread = threading.Thread(target=_write_forever, args=(interval,), name="monitoring-metrics", daemon=True)
+            thread.start()
+            _writer = (os.getpid(), thread)
@@ -0,0 +1,168 @@
+import hmac
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from monitoring import metrics, stats
+from monitoring.models import RequestProfile
+from monitoring.profiling import StackSampler
+from monitoring.timing import end_request, start_request
+
+
+logger = logging.getLogger("monitoring.requests")
+
+
+class RequestTimingMiddleware:
+    """
+    Time every request (see ``monitoring.timing``), then:
+
+    - add a ``Server-Timing`` header (``MONITORING_SERVER_TIMING``),
+    - log one JSON line to the ``monitoring.requests`` logger at DEBUG,
+    - add the request to the per-URL-name totals in ``monitoring.stats``,
+    - update the ``/metrics`` counters and histograms (``monitoring.metrics``).
+
+    Must be the first middleware so the total covers the whole stack. For
+    streaming responses only the time until the response is returned is
+    measured, not the streaming itself.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings = end_request(token)
+        return self._report(request, response, timings)
+
+    async def __acall__(self, request):
+        token = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timings = end_request(token)
+        return self._report(request, response, timings)
+
+    def _report(self, request, response, timings):
+        match = getattr(request, "resolver_match", None)
+        url_name = match.view_name if match else "unresolved"
+
+        if settings.MONITORING_SERVER_TIMING:
+            response["Server-Timing"] = timings.server_timing()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "url_name": url_name,
+                "status": response.status_code,
+                **timings.as_dict(),
+            }))
+        stats.record(url_name, response.status_code, timings)
+        metrics.observe_request(url_name, request.method, response.status_code, timings)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Stack-sample some requests and keep the slow ones as ``RequestProfile``
+    rows (browsable in the admin, with a collapsed-stacks download).
+
+    A request is sampled when:
+
+    - it is one of 1 in ``MONITORING_PROFILE_SAMPLE_RATE`` requests; it is
+      kept if it took at least ``MONITORING_PROFILE_THRESHOLD_MS``;
+    - or it sends ``X-Profile: <MONITORING_PROFILE_TOKEN>``; it is always
+      kept, and the response carries ``X-Profile-Id``.
+
+    Without a rate or a token the middleware removes itself. Under ASGI the
+    sampled thread is the event loop, so time spent in ``sync_to_async``
+    threads shows up as the awaiting frame.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.MONITORING_PROFILE_SAMPLE_RATE and not settings.MONITORING_PROFILE_TOKEN:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _trigger(self, request):
+        token = settings.MONITORING_PROFILE_TOKEN
+        header = request.headers.get("X-Profile")
+        if token and header and hmac.compare_digest(header.encode(), token.encode()):
+            return RequestProfile.TRIGGER_HEADER
+        rate = settings.MONITORING_PROFILE_SAMPLE_RATE
+        if rate and random.randrange(rate) == 0:
+            return RequestProfile.TRIGGER_SAMPLED
+        return None
+
+    def _start(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return None
+        sampler = StackSampler(interval=settings.MONITORING_PROFILE_INTERVAL_MS / 1000)
+        return trigger, sampler.start(), time.perf_counter()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        profile = self._start(request)
+        if profile is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profile[1].stop()
+        return self._keep(request, response, *profile)
+
+    async def __acall__(self, request):
+        profile = self._start(request)
+        if profile is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            profile[1].stop()
+        return await sync_to_async(self._keep)(request, response, *profile)
+
+    def _keep(self, request, response, trigger, sampler, started):
+        duration_ms = (time.perf_counter() - started) * 1000
+        if trigger == RequestProfile.TRIGGER_SAMPLED and duration_ms < settings.MONITORING_PROFILE_THRESHOLD_MS:
+            return response
+
+        match = getattr(request, "resolver_match", None)
+        profile = RequestProfile.objects.create(
+            method=request.method,
+            path=request.get_full_path()[:500],
+            url_name=match.view_name if match else "unresolved",
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            trigger=trigger,
+            samples=sampler.samples,
+            interval_ms=settings.MONITORING_PROFILE_INTERVAL_MS,
+            top_frames=sampler.top_frames(),
+            collapsed_stacks=sampler.collapsed(),
+        )
+        if trigger == RequestProfile.TRIGGER_HEADER:
+            response["X-Profile-Id"] = str(profile.pk)
+        return response
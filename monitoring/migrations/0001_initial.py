@@ -0,0 +1,36 @@
+# Generated by Django 5.1.14 on 2026-10-19 00:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EndpointStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=200, unique=True)),
+                ('requests', models.PositiveBigIntegerField(default=0)),
+                ('errors', models.PositiveBigIntegerField(default=0, help_text='Responses with status >= 500')),
+                ('total_ms', models.FloatField(default=0, help_text='Sum of request times')),
+                ('max_ms', models.FloatField(default=0)),
+                ('db_ms', models.FloatField(default=0)),
+                ('queries', models.PositiveBigIntegerField(default=0)),
+                ('serializer_ms', models.FloatField(default=0)),
+                ('cache_hits', models.PositiveBigIntegerField(default=0)),
+                ('cache_misses', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Endpoint Stats',
+                'verbose_name_plural': 'Endpoint Stats',
+                'ordering': ['url_name'],
+            },
+        ),
+    ]
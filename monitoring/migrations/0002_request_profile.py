@@ -0,0 +1,33 @@
+# Generated by Django 5.1.14 on 2026-10-19 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=500)),
+                ('url_name', models.CharField(db_index=True, max_length=200)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField()),
+                ('trigger', models.CharField(choices=[('sampled', '1-in-N sample'), ('header', 'Debug header')], max_length=10)),
+                ('samples', models.PositiveIntegerField()),
+                ('interval_ms', models.FloatField()),
+                ('top_frames', models.JSONField(default=list, help_text='[{"frame", "self", "total"}], in samples')),
+                ('collapsed_stacks', models.TextField(help_text='flamegraph.pl / speedscope input')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
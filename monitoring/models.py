@@ -0,0 +1,86 @@
+from django.db import models
+
+
+class EndpointStats(models.Model):
+    """
+    Request timings aggregated per URL name, across all processes.
+
+    Each process accumulates its requests in memory and adds them to these
+    rows every ``MONITORING_FLUSH_SECONDS`` (see ``monitoring.stats``).
+    """
+
+    url_name = models.CharField(max_length=200, unique=True)
+    requests = models.PositiveBigIntegerField(default=0)
+    errors = models.PositiveBigIntegerField(default=0, help_text="Responses with status >= 500")
+    total_ms = models.FloatField(default=0, help_text="Sum of request times")
+    max_ms = models.FloatField(default=0)
+    db_ms = models.FloatField(default=0)
+    queries = models.PositiveBigIntegerField(default=0)
+    serializer_ms = models.FloatField(default=0)
+    cache_hits = models.PositiveBigIntegerField(default=0)
+    cache_misses = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["url_name"]
+        verbose_name = "Endpoint Stats"
+        verbose_name_plural = "Endpoint Stats"
+
+    def __str__(self) -> str:
+        return self.url_name
+
+    def _average(self, total: float) -> float:
+        return total / self.requests if self.requests else 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self._average(self.total_ms)
+
+    @property
+    def avg_db_ms(self) -> float:
+        return self._average(self.db_ms)
+
+    @property
+    def avg_queries(self) -> float:
+        return self._average(self.queries)
+
+    @property
+    def avg_serializer_ms(self) -> float:
+        return self._average(self.serializer_ms)
+
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+
+class RequestProfile(models.Model):
+    """
+    A stack-sampled request that took longer than
+    ``MONITORING_PROFILE_THRESHOLD_MS`` (see ``ProfilingMiddleware``).
+    """
+
+    TRIGGER_SAMPLED = "sampled"
+    TRIGGER_HEADER = "header"
+    TRIGGER_CHOICES = [
+        (TRIGGER_SAMPLED, "1-in-N sample"),
+        (TRIGGER_HEADER, "Debug header"),
+    ]
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    url_name = models.CharField(max_length=200, db_index=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    samples = models.PositiveIntegerField()
+    interval_ms = models.FloatField()
+    top_frames = models.JSONField(default=list, help_text='[{"frame", "self", "total"}], in samples')
+    collapsed_stacks = models.TextField(help_text="flamegraph.pl / speedscope input")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
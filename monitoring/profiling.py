@@ -0,0 +1,88 @@
+"""
+Stack sampling for individual requests.
+
+``StackSampler`` runs a thread that reads the stack of one other thread every
+``interval`` seconds (``sys._current_frames``), so the profiled request runs
+at full speed apart from the GIL hand-offs, and it works in any thread,
+unlike ``SIGPROF``, which only reaches the main thread. The samples are
+summarised as:
+
+- the top frames, by self samples (the frame was running) and total samples
+  (the frame was on the stack);
+- collapsed stacks, one ``outer;inner;leaf count`` line per distinct stack,
+  the input format of ``flamegraph.pl`` and speedscope.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+
+TOP_FRAMES = 30
+
+
+def _label(code) -> str:
+    filename = code.co_filename
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1:]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="monitoring-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self) -> None:
+        labels = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _label(code)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, most frequent first."""
+        return "\n".join(
+            f"{';'.join(frame.replace(';', ':') for frame in stack)} {count}"
+            for stack, count in self.stacks.most_common()
+        )
+
+    def top_frames(self, limit: int = TOP_FRAMES) -> list:
+        """``[{"frame", "self", "total"}]`` ordered by self samples, then total samples."""
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                total[frame] += count
+        ranked = sorted(total, key=lambda frame: (own[frame], total[frame]), reverse=True)
+        return [{"frame": frame, "self": own[frame], "total": total[frame]} for frame in ranked[:limit]]
@@ -0,0 +1,176 @@
+"""
+Slow-query log.
+
+``slow_query_logger`` is an execute wrapper on every connection (installed by
+``install_slow_query_logger``). A query slower than
+``MONITORING_SLOW_QUERY_MS``:
+
+- is attributed from the stack: the resolved view (Django's request handler
+  frame), the serializer field being rendered, and the innermost line of
+  project code that ran it;
+- with ``MONITORING_SLOW_QUERY_EXPLAIN``, is explained with the backend's
+  ``EXPLAIN`` (SELECTs only; inside a transaction it runs in a savepoint, so
+  a failing EXPLAIN cannot break it, and it is left out of the request's
+  ``Server-Timing`` query count);
+- is logged as one JSON line on the ``monitoring.slow_queries`` logger and
+  kept in a per-process ring buffer of the last
+  ``MONITORING_SLOW_QUERY_BUFFER`` slow queries, shown slowest first at
+  ``/admin/slow-queries/``.
+
+Parameters are user input, so they are only recorded with
+``MONITORING_SLOW_QUERY_PARAMS``, and EXPLAIN (which runs with them) only with
+``MONITORING_SLOW_QUERY_EXPLAIN``; both default to ``DEBUG``.
+
+Fast queries only pay for two ``perf_counter`` calls.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from monitoring.timing import in_internal_queries, internal_queries
+
+
+logger = logging.getLogger("monitoring.slow_queries")
+
+PROJECT_DIR = str(Path(settings.BASE_DIR).resolve())
+# Frames of these packages are instrumentation, never the origin of a query
+IGNORED_PACKAGES = ("monitoring",)
+
+
+@dataclass
+class SlowQuery:
+    sql: str
+    params: str
+    alias: str
+    duration_ms: float
+    view: str
+    serializer_field: str
+    origin: str
+    explain: str
+    recorded_at: str = field(default_factory=lambda: timezone.now().isoformat())
+
+
+_lock = threading.Lock()
+_buffer: deque = deque()
+
+
+def _project_path(filename: str) -> Optional[str]:
+    """``filename`` relative to the project, or None for library and stdlib code."""
+    if not filename.startswith(PROJECT_DIR) or "site-packages" in filename:
+        return None
+    relative = filename[len(PROJECT_DIR) + 1:]
+    if relative.split("/", 1)[0] in IGNORED_PACKAGES:
+        return None
+    return relative
+
+
+def _attribute(frame) -> dict:
+    """Find the view, serializer field and project line behind the query being executed."""
+    from rest_framework.serializers import Serializer
+
+    view = serializer_field = origin = ""
+    outermost = ""
+    while frame is not None:
+        code = frame.f_code
+        local = frame.f_locals
+        if not serializer_field and code.co_name == "to_representation":
+            serializer, current = local.get("self"), local.get("field")
+            if isinstance(serializer, Serializer) and current is not None:
+                serializer_field = f"{type(serializer).__name__}.{current.field_name}"
+        if not view and code.co_name in ("_get_response", "_get_response_async"):
+            match = getattr(local.get("request"), "resolver_match", None)
+            if match is not None:
+                func = getattr(match.func, "view_class", match.func)
+                view = f"{match.view_name} ({func.__module__}.{func.__qualname__})"
+        path = _project_path(code.co_filename)
+        if path is not None:
+            line = f"{path}:{frame.f_lineno} in {code.co_name}"
+            origin = origin or line
+            outermost = line
+        frame = frame.f_back
+    # Outside a request (or in a sync_to_async thread) the outermost project frame is the best guess
+    return {"view": view or outermost, "serializer_field": serializer_field, "origin": origin}
+
+
+def _explain(connection, sql: str, params) -> str:
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return ""
+    try:
+        # Not instrumented again, nor counted in the request's timings;
+        # in autocommit mode a failure has nothing to roll back
+        with internal_queries():
+            with transaction.atomic(using=connection.alias) if connection.in_atomic_block else nullcontext():
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                    rows = cursor.fetchall()
+    except DatabaseError as error:
+        return f"EXPLAIN failed: {error}"
+    if connection.vendor == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(str(row[-1]) for row in rows)
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+def _record(sql, params, duration, context) -> None:
+    connection = context["connection"]
+    entry = SlowQuery(
+        sql=sql,
+        params=repr(params)[:1000] if settings.MONITORING_SLOW_QUERY_PARAMS else "",
+        alias=connection.alias,
+        duration_ms=round(duration * 1000, 2),
+        explain=_explain(connection, sql, params) if settings.MONITORING_SLOW_QUERY_EXPLAIN else "",
+        **_attribute(sys._getframe(2)),
+    )
+    with _lock:
+        _buffer.append(entry)
+        while len(_buffer) > settings.MONITORING_SLOW_QUERY_BUFFER:
+            _buffer.popleft()
+    logger.warning(json.dumps(asdict(entry)))
+
+
+def slow_query_logger(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` recording queries slower than ``MONITORING_SLOW_QUERY_MS``."""
+    threshold = settings.MONITORING_SLOW_QUERY_MS
+    if not threshold or in_internal_queries():
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - start
+    if duration * 1000 >= threshold and not many:
+        try:
+            _record(sql, params, duration, context)
+        except Exception:
+            # Never fail the query because of the instrumentation
+            logger.exception("Could not record a slow query")
+    return result
+
+
+def install_slow_query_logger(sender, connection, **kwargs):
+    """``connection_created`` receiver adding ``slow_query_logger`` to the connection once."""
+    if slow_query_logger not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_logger)
+
+
+def slowest() -> list:
+    """The buffered slow queries of this process, slowest first."""
+    with _lock:
+        entries = list(_buffer)
+    return sorted(entries, key=lambda entry: entry.duration_ms, reverse=True)
+
+
+def clear() -> None:
+    with _lock:
+        _buffer.clear()
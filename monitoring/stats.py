@@ -0,0 +1,97 @@
+"""
+In-process aggregation of request timings per URL name.
+
+``record`` is called once per request and only touches a dict under a lock.
+A daemon thread adds the accumulated totals to ``EndpointStats`` every
+``MONITORING_FLUSH_SECONDS`` (0 disables it), so several workers share the
+same rows without a database write per request.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from monitoring.models import EndpointStats
+from monitoring.timing import RequestTimings
+
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("requests", "errors", "total_ms", "db_ms", "queries", "serializer_ms", "cache_hits", "cache_misses")
+
+
+def _new_pending():
+    return defaultdict(lambda: dict.fromkeys(COUNTERS + ("max_ms",), 0))
+
+
+_lock = threading.Lock()
+_pending = _new_pending()
+_flusher = None
+
+
+def record(url_name: str, status_code: int, timings: RequestTimings) -> None:
+    total_ms = timings.total_time * 1000
+    with _lock:
+        entry = _pending[url_name]
+        entry["requests"] += 1
+        entry["errors"] += status_code >= 500
+        entry["total_ms"] += total_ms
+        entry["max_ms"] = max(entry["max_ms"], total_ms)
+        entry["db_ms"] += timings.db_time * 1000
+        entry["queries"] += timings.queries
+        entry["serializer_ms"] += timings.serializer_time * 1000
+        entry["cache_hits"] += timings.cache_hits
+        entry["cache_misses"] += timings.cache_misses
+    _ensure_flusher()
+
+
+def _take_pending() -> dict:
+    global _pending
+    with _lock:
+        pending = _pending
+        _pending = _new_pending()
+    return pending
+
+
+def flush() -> int:
+    """Add the pending totals to ``EndpointStats``; returns the number of URL names written."""
+    pending = _take_pending()
+    for url_name, entry in pending.items():
+        updates = {name: F(name) + entry[name] for name in COUNTERS}
+        with transaction.atomic():
+            EndpointStats.objects.get_or_create(url_name=url_name)
+            EndpointStats.objects.filter(url_name=url_name).update(
+                max_ms=Greatest(F("max_ms"), entry["max_ms"]), **updates
+            )
+    return len(pending)
+
+
+def _flush_forever(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except DatabaseError:
+            # e.g. the table is not migrated yet; the totals of this round are dropped
+            logger.exception("Could not write endpoint stats")
+        finally:
+            connection.close()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    interval = settings.MONITORING_FLUSH_SECONDS
+    if _flusher is not None or not interval:
+        return
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_flush_forever, args=(interval,), name="monitoring-flush", daemon=True
+            )
+            _flusher.start()
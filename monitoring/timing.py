@@ -0,0 +1,163 @@
+"""
+Per-request timings: database, serializers, caches and total time.
+
+``RequestTimingMiddleware`` activates a ``RequestTimings`` for the current
+request (a context variable, so it follows the request into
+``sync_to_async`` threads under ASGI). While one is active:
+
+- every query on every database alias is counted and timed by
+  ``query_timer``, installed as an execute wrapper on each new connection;
+- the outermost ``serializer.data`` call is timed, minus the queries run
+  while it evaluates querysets. Views build ``serializer.data`` themselves,
+  before anything reaches the renderer, so ``instrument_serializers``
+  replaces the ``data`` property of DRF's base serializer classes for the
+  whole process (once; every serializer inherits it);
+- cache lookups report hits and misses through ``record_cache``.
+
+Nothing is recorded outside a request (management commands, snapshot
+rebuilds), and the cost inside one is a context variable lookup per query.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class RequestTimings:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_time: float = 0.0
+    serializer_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    total_time: float = 0.0
+    serializing: bool = False
+
+    def finish(self) -> "RequestTimings":
+        self.total_time = time.perf_counter() - self.started
+        return self
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_time * 1000, 2),
+            "db_ms": round(self.db_time * 1000, 2),
+            "queries": self.queries,
+            "serializer_ms": round(self.serializer_time * 1000, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    def server_timing(self) -> str:
+        """The ``Server-Timing`` header value."""
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f"serializer;dur={self.serializer_time * 1000:.2f}",
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f"total;dur={self.total_time * 1000:.2f}",
+        ])
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("monitoring_request_timings", default=None)
+
+
+# Set while the monitoring code runs queries of its own (slow-query EXPLAINs),
+# which are neither timed nor counted as the request's
+_internal: ContextVar[bool] = ContextVar("monitoring_internal_queries", default=False)
+
+
+@contextmanager
+def internal_queries():
+    token = _internal.set(True)
+    try:
+        yield
+    finally:
+        _internal.reset(token)
+
+
+def in_internal_queries() -> bool:
+    return _internal.get()
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def start_request():
+    """Activate a fresh ``RequestTimings``; returns the token for ``end_request``."""
+    return _current.set(RequestTimings())
+
+
+def end_request(token) -> RequestTimings:
+    timings = _current.get()
+    _current.reset(token)
+    return timings.finish()
+
+
+def record_cache(hit: bool) -> None:
+    """Count a cache lookup of the current request."""
+    timings = _current.get()
+    if timings is None:
+        return
+    if hit:
+        timings.cache_hits += 1
+    else:
+        timings.cache_misses += 1
+
+
+def query_timer(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` that times queries of the current request."""
+    timings = _current.get()
+    if timings is None or _internal.get():
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_time += time.perf_counter() - start
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """``connection_created`` receiver adding ``query_timer`` to the connection once."""
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def _timed_data(data_property: property) -> property:
+    getter = data_property.fget
+
+    def data(self):
+        timings = _current.get()
+        # Nested and super() calls are part of the outermost one
+        if timings is None or timings.serializing:
+            return getter(self)
+
+        timings.serializing = True
+        db_time = timings.db_time
+        start = time.perf_counter()
+        try:
+            return getter(self)
+        finally:
+            elapsed = time.perf_counter() - start
+            timings.serializer_time += elapsed - (timings.db_time - db_time)
+            timings.serializing = False
+
+    data._monitoring_timed = True
+    return property(data, doc=data_property.__doc__)
+
+
+def instrument_serializers() -> None:
+    """
+    Time ``.data`` on DRF serializers (called from ``MonitoringConfig.ready``).
+    Idempotent: a property that is already timed is left alone.
+    """
+    from rest_framework import serializers
+
+    for cls in (serializers.BaseSerializer, serializers.Serializer, serializers.ListSerializer):
+        current = cls.__dict__["data"]
+        if not getattr(current.fget, "_monitoring_timed", False):
+            cls.data = _timed_data(current)
@@ -0,0 +1,25 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_safe
+
+from monitoring import metrics
+
+
+@require_safe
+def metrics_view(request):
+    """
+    All metrics in the Prometheus text format, summed over every worker
+    process when ``MONITORING_METRICS_DIR`` is set. Requires
+    ``Authorization: Bearer <MONITORING_METRICS_TOKEN>`` when a token is set;
+    without one, only staff users (or anyone in ``DEBUG``) may read it.
+    """
+    token = settings.MONITORING_METRICS_TOKEN
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG and not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")